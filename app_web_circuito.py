@@ -1,187 +1,39 @@
 import streamlit as st
 import cmath
+import io
 import math
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.patches import Arc
-from schemdraw import Drawing
-from schemdraw import elements as elm
-import pandas as pd
-
-# --- FUNÇÕES DE CÁLCULO E AUXILIARES ---
-
-def converter_valor(valor, unidade_origem, unidade_destino, tipo):
-    fatores = {'Resistor (R)': {'Ω': 1, 'kΩ': 1e3, 'MΩ': 1e6}, 'Indutor (L)': {'H': 1, 'mH': 1e-3, 'µH': 1e-6}, 'Capacitor (C)': {'F': 1, 'mF': 1e-3, 'µF': 1e-6, 'nF': 1e-9, 'pF': 1e-12}}
-    valor_base = valor * fatores[tipo][unidade_origem]
-    return valor_base / fatores[tipo][unidade_destino]
-
-def get_impedancia_componente(comp, frequencia):
-    if comp.get('valor', 0) == 0: return complex(0, 0)
-    
-    if comp['tipo'] == 'Resistor (R)': unidade_base = 'Ω'
-    elif comp['tipo'] == 'Indutor (L)': unidade_base = 'H'
-    else: unidade_base = 'F'
-    valor_base = converter_valor(comp['valor'], comp['unidade'], unidade_base, comp['tipo'])
-    
-    if comp['tipo'] == 'Resistor (R)': return complex(valor_base, 0)
-    elif comp['tipo'] == 'Indutor (L)':
-        if frequencia == 0: return complex(0, 0)
-        return complex(0, 2 * math.pi * frequencia * valor_base)
-    elif comp['tipo'] == 'Capacitor (C)':
-        if valor_base == 0 or frequencia == 0: return complex(0, float('inf'))
-        return complex(0, -1 / (2 * math.pi * frequencia * valor_base))
-    return complex(0, 0)
-
-def analisar_circuito_detalhadamente(componentes, frequencia, V_fonte):
-    if not componentes:
-        return complex(0, 0), complex(0, 0), []
-
-    # Passo 1: Calcular Z_total e I_total
-    blocos_impedancia = []
-    i = 0
-    while i < len(componentes):
-        comp_atual = componentes[i]
-        if comp_atual['conexao'] in ['SÉRIE', 'PRIMEIRO']:
-            blocos_impedancia.append({'tipo': 'serie', 'impedancia': get_impedancia_componente(comp_atual, frequencia), 'indices': [i]})
-            i += 1
-        elif comp_atual['conexao'] == 'PARALELO':
-            bloco_anterior = blocos_impedancia.pop()
-            impedancia_anterior = bloco_anterior['impedancia']
-            indices_grupo = bloco_anterior['indices']
-            admitancias_do_grupo = [1 / impedancia_anterior] if impedancia_anterior != 0 else []
-            
-            while i < len(componentes) and componentes[i]['conexao'] == 'PARALELO':
-                indices_grupo.append(i)
-                z_paralelo = get_impedancia_componente(componentes[i], frequencia)
-                if z_paralelo != 0:
-                    admitancias_do_grupo.append(1 / z_paralelo)
-                i += 1
-            
-            admitancia_total_grupo = sum(admitancias_do_grupo)
-            impedancia_equivalente = 1 / admitancia_total_grupo if admitancia_total_grupo != 0 else complex(float('inf'))
-            blocos_impedancia.append({'tipo': 'paralelo', 'impedancia': impedancia_equivalente, 'indices': indices_grupo})
-            
-    Z_total = sum(b['impedancia'] for b in blocos_impedancia)
-    I_total = V_fonte / Z_total if Z_total != 0 else complex(0,0)
-
-    # Passo 2: Calcular V e I para cada componente
-    componentes_analisados = [c.copy() for c in componentes] 
-    
-    for bloco in blocos_impedancia:
-        # A corrente que entra em cada bloco série é a corrente total
-        I_bloco = I_total
-        V_bloco = I_bloco * bloco['impedancia']
-        
-        if bloco['tipo'] == 'serie':
-            idx = bloco['indices'][0]
-            componentes_analisados[idx]['tensao'] = V_bloco
-            componentes_analisados[idx]['corrente'] = I_bloco
-        
-        elif bloco['tipo'] == 'paralelo':
-            # A tensão é a mesma para todos os componentes em paralelo
-            for idx in bloco['indices']:
-                Z_comp = get_impedancia_componente(componentes_analisados[idx], frequencia)
-                I_comp = V_bloco / Z_comp if Z_comp != 0 else complex(0,0)
-                componentes_analisados[idx]['tensao'] = V_bloco
-                componentes_analisados[idx]['corrente'] = I_comp
-
-    return Z_total, I_total, componentes_analisados
-
-def formatar_complexo(numero_complexo, unidade=''):
-    if abs(numero_complexo.real) < 1e-9 and abs(numero_complexo.imag) < 1e-9: retangular = f"0.00 {unidade}"
-    elif abs(numero_complexo.imag) < 1e-9: retangular = f"{numero_complexo.real:.2f} {unidade}"
-    elif abs(numero_complexo.real) < 1e-9: retangular = f"{'' if numero_complexo.imag >= 0 else '-'}j{abs(numero_complexo.imag):.2f} {unidade}"
-    else: retangular = f"{numero_complexo.real:.2f} {'+' if numero_complexo.imag >= 0 else '-'} j{abs(numero_complexo.imag):.2f} {unidade}"
-    
-    magnitude, fase_rad = cmath.polar(numero_complexo)
-    fase_graus = math.degrees(fase_rad)
-    polar = f"{magnitude:.2f} {unidade} ∠ {fase_graus:.2f}°"
-    return retangular, polar
-
-def calcular_potencias(V, I_complexa):
-    S_complexa = V * I_complexa.conjugate()
-    return S_complexa.real, S_complexa.imag, abs(S_complexa)
+import esquema
+import graficos
+import instrumentacao
+from motor_circuito import CACHE_GLOBAL, GRANDEZAS, LIMITE_JSON, AnaliseIncremental, CacheLRU, CircuitoCompilado, amostragem, amostrar_adaptativo, analisar_harmonicos, analisar_robusto, avaliar_grade, calcular_potencias, carregar_circuito, encontrar_ressonancias, exportar_csv, exportar_npy, faixa_de_valores, fasores_do_circuito, fator_de_potencia, formatar_complexo, formatar_complexos, formas_de_onda, impressao_digital, monte_carlo, otimizar_parametros, percentis, salvar_circuito, varrer_frequencias
 
 # --- Funções de Plotagem e Visualização ---
-
-def desenhar_circuito(componentes):
-    d = Drawing()
-    spacing = 3 
-    fonte_elemento = elm.SourceSin().label('V').up()
-    d += fonte_elemento
-    altura_fonte = fonte_elemento.end[1]
-    last_point = fonte_elemento.end
-    if not componentes:
-        d += elm.Line().right().length(spacing)
-        d += elm.Line().down().length(altura_fonte)
-        d += elm.Line().left().length(spacing)
-        return d
-    series_components, parallel_groups, current_parallel = [], [], []
-    for comp in componentes:
-        if comp['conexao'] == 'PARALELO':
-            current_parallel.append(comp)
-        else:
-            if current_parallel:
-                parallel_groups.append(current_parallel)
-                current_parallel = []
-            if comp['conexao'] in ['SÉRIE', 'PRIMEIRO']:
-                series_components.append(comp)
-    if current_parallel:
-        parallel_groups.append(current_parallel)
-    def add_component(drawing, comp):
-        nonlocal last_point
-        if comp['tipo'] == 'Resistor (R)': element = elm.Resistor().label(f'R{comp["id"]+1}\n{comp["valor"]:.1f}{comp["unidade"]}')
-        elif comp['tipo'] == 'Indutor (L)': element = elm.Inductor().label(f'L{comp["id"]+1}\n{comp["valor"]:.1f}{comp["unidade"]}')
-        else: element = elm.Capacitor().label(f'C{comp["id"]+1}\n{comp["valor"]:.1f}{comp["unidade"]}')
-        element.right().length(spacing)
-        drawing += element.at(last_point)
-        last_point = element.end
-    for comp in series_components:
-        d += elm.Line().right().length(spacing/2).at(last_point)
-        last_point = (last_point[0] + spacing/2, last_point[1])
-        add_component(d, comp)
-    for group in parallel_groups:
-        if not group: continue
-        start_x = last_point[0] + spacing/2
-        height_per_comp = 3
-        total_height = len(group) * height_per_comp
-        d += elm.Line().right().length(spacing/2).at(last_point)
-        start_point = (start_x, last_point[1])
-        d += elm.Line().up().length(total_height/2).at(start_point)
-        d += elm.Line().down().length(total_height/2).at(start_point)
-        for i, comp in enumerate(group):
-            y_offset = total_height/2 - i * height_per_comp - height_per_comp / 2
-            comp_start = (start_x, last_point[1] + y_offset)
-            if comp['tipo'] == 'Resistor (R)': element = elm.Resistor().label(f'R{comp["id"]+1}\n{comp["valor"]:.1f}{comp["unidade"]}')
-            elif comp['tipo'] == 'Indutor (L)': element = elm.Inductor().label(f'L{comp["id"]+1}\n{comp["valor"]:.1f}{comp["unidade"]}')
-            else: element = elm.Capacitor().label(f'C{comp["id"]+1}\n{comp["valor"]:.1f}{comp["unidade"]}')
-            d += element.right().length(spacing*2).at(comp_start)
-        last_point = (start_x + spacing*2, last_point[1])
-        end_point = last_point
-        d += elm.Line().up().length(total_height/2).at(end_point)
-        d += elm.Line().down().length(total_height/2).at(end_point)
-    d += elm.Line().right().length(spacing/2).at(last_point)
-    final_point = (last_point[0] + spacing/2, last_point[1])
-    d += elm.Line().down().length(altura_fonte).at(final_point)
-    d += elm.Line().left().length(final_point[0]).at((final_point[0], 0))
-    return d
-
-def plotar_resposta_em_frequencia(componentes, freq_min, freq_max, freq_atual):
-    freqs = np.logspace(np.log10(freq_min), np.log10(freq_max), 400)
-    Z_total_em_frequencia = [abs(analisar_circuito_detalhadamente(componentes, f, 1)[0]) for f in freqs]
+# matplotlib e pandas só são importados na primeira figura/tabela: o app vazio não paga por eles
+
+def plotar_resposta_em_frequencia(componentes, freq_min, freq_max, freq_atual, freqs=None, Z_varredura=None):
+    import matplotlib.pyplot as plt
+    # Amostragem adaptativa: poucos pontos nas regiões planas e refinamento perto das ressonâncias
+    if freqs is None:
+        freqs, Z_varredura = amostrar_adaptativo(componentes, freq_min, freq_max)
+    ressonancias = encontrar_ressonancias(componentes, freq_min, freq_max, freqs, Z_varredura)
+    Z_atual = varrer_frequencias(componentes, [freq_atual])[0][0]
     fig, ax = plt.subplots(figsize=(7, 3.5))
-    ax.semilogx(freqs, Z_total_em_frequencia)
+    ax.semilogx(freqs, np.abs(Z_varredura))
     ax.set_title('Resposta em Frequência do Circuito')
     ax.set_xlabel('Frequência (Hz)')
     ax.set_ylabel('Impedância |Z| (Ω)')
     ax.grid(True, which="both", ls="-")
-    Z_atual = analisar_circuito_detalhadamente(componentes, freq_atual, 1)[0]
+    for r in ressonancias:
+        ax.axvline(r['f0'], color='green' if r['tipo'] == 'ressonância' else 'purple', linestyle=':', alpha=0.8)
+        ax.plot(r['f0'], abs(r['Z']), 'o', color='green' if r['tipo'] == 'ressonância' else 'purple')
     ax.axvline(freq_atual, color='red', linestyle='--', alpha=0.8)
     ax.plot(freq_atual, abs(Z_atual), 'ro')
     ax.text(freq_atual * 1.1, abs(Z_atual), f' {freq_atual:.0f} Hz', verticalalignment='center')
-    return fig
+    return fig, ressonancias
 
 def plot_triangulo_potencias(P, Q, S):
+    import matplotlib.pyplot as plt
     # --- ALTERAÇÃO AQUI ---
     fig, ax = plt.subplots(figsize=(5, 4)) # Tamanho reduzido
     plt.style.use('seaborn-v0_8-whitegrid')
@@ -201,11 +53,15 @@ def plot_triangulo_potencias(P, Q, S):
     return fig
 
 def plot_fasores(Z_total, V_fonte, I_total_complexa):
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Arc
     R, X, Z_mag = Z_total.real, Z_total.imag, abs(Z_total)
     Z_fase_rad, Z_fase_graus = cmath.phase(Z_total), math.degrees(cmath.phase(Z_total))
     V_mag, I_mag = V_fonte, abs(I_total_complexa)
     I_fase_rad, I_fase_graus = cmath.phase(I_total_complexa), math.degrees(cmath.phase(I_total_complexa))
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))
+    fig = plt.figure(figsize=(10, 5))
+    ax1 = fig.add_subplot(121)
+    ax2 = fig.add_subplot(122, projection='polar')
     plt.style.use('seaborn-v0_8-whitegrid')
     ax1.set_title("Triângulo das Impedâncias", fontsize=12, weight='bold')
     ax1.quiver(0, 0, R, 0, angles='xy', scale_units='xy', scale=1, color='blue', label=f'R = {R:.2f} Ω')
@@ -224,7 +80,6 @@ def plot_fasores(Z_total, V_fonte, I_total_complexa):
     ax1.set_xlim(-0.1 if R < 0 else 0, limite)
     ax1.set_ylim(-limite if X < 0 else 0, limite if X > 0 else 0.1)
     ax1.set_aspect('equal', adjustable='box'); ax1.grid(True); ax1.legend()
-    ax2 = plt.subplot(122, projection='polar')
     ax2.set_title("Fasores de Tensão e Corrente", fontsize=12, weight='bold')
     ax2.annotate('', xy=(0, V_mag), xytext=(0,0), arrowprops=dict(facecolor='orange', edgecolor='orange', arrowstyle='->', lw=2))
     ax2.annotate('', xy=(I_fase_rad, V_mag), xytext=(0,0), arrowprops=dict(facecolor='purple', edgecolor='purple', arrowstyle='->', lw=2))
@@ -233,15 +88,96 @@ def plot_fasores(Z_total, V_fonte, I_total_complexa):
     ax2.set_rmax(V_mag * 1.2); ax2.set_yticklabels([])
     return fig
 
+def plot_histogramas_monte_carlo(resultado):
+    import matplotlib.pyplot as plt
+    fig, eixos = plt.subplots(2, 2, figsize=(10, 6))
+    series = [(np.abs(resultado['Z_total']), '|Z| (Ω)'), (np.abs(resultado['I_total']), '|I| (A)'), (resultado['P'], 'P (W)'), (resultado['FP'], 'Fator de Potência')]
+    for ax, (valores, titulo) in zip(eixos.flat, series):
+        ax.hist(valores, bins=60, color='steelblue', alpha=0.8)
+        for q in np.percentile(valores, [5, 95]):
+            ax.axvline(q, color='red', linestyle='--', alpha=0.8)
+        ax.set_title(titulo, fontsize=10)
+    fig.suptitle("Distribuição das Amostras (linhas: p5 e p95)", fontsize=12, weight='bold')
+    fig.tight_layout()
+    return fig
+
+def resumir_monte_carlo(resultado):
+    """Tabela de percentis e histogramas (PNG) de uma execução; só isso vai para o cache, não as amostras."""
+    import pandas as pd
+    grandezas = {'|Z| (Ω)': np.abs(resultado['Z_total']), '|I| (A)': np.abs(resultado['I_total']), 'P (W)': resultado['P'], 'Q (VAR)': resultado['Q'], 'S (VA)': resultado['S'], 'FP': resultado['FP']}
+    tabela = pd.DataFrame([{'Grandeza': nome, **percentis(valores)} for nome, valores in grandezas.items()])
+    return tabela, renderizar_figura(plot_histogramas_monte_carlo(resultado))
+
+# Linhas da tabela por componente formatadas de cada vez
+TAMANHO_PAGINA = 100
+# Amostras de forma de onda geradas para o gráfico
+LIMITE_AMOSTRAS_GRAFICO = 200_000
+# O download do app é montado em memória no servidor; capturas maiores que isso devem ser gravadas
+# direto em disco com exportar_npy / exportar_csv
+LIMITE_BYTES_EXPORTACAO = 200 * 1024 ** 2
+# Tamanho médio de um valor no CSV ('%.9g' mais o separador), para a estimativa antes de gerar
+BYTES_POR_VALOR_CSV = 16
+# Teto do cache de figuras e resultados de cada sessão (tamanho aproximado, ver CacheLRU)
+LIMITE_BYTES_CACHE_FIGURAS = 64 * 1024 ** 2
+
+def tabela_componentes(componentes, tensoes, correntes, inicio=0, fim=None, texto=True):
+    """Linhas [inicio, fim) da tabela por componente.
+
+    As colunas numéricas (módulo e fase) ficam cruas, para ordenar e exportar; com `texto`, as
+    colunas em forma polar são formatadas em lote só para as linhas pedidas.
+    """
+    import pandas as pd
+    fim = len(componentes) if fim is None else min(fim, len(componentes))
+    pagina, V, I = componentes[inicio:fim], np.asarray(tensoes[inicio:fim]), np.asarray(correntes[inicio:fim])
+    colunas = {"Componente": [f"{comp['tipo'][0]}{k}" for k, comp in enumerate(pagina, inicio + 1)],
+               "Valor": [f"{comp['valor']} {comp['unidade']}" for comp in pagina]}
+    if texto:
+        colunas["Tensão (V)"] = formatar_complexos(V, 'V')[1]
+        colunas["Corrente (A)"] = formatar_complexos(I, 'A')[1]
+    colunas.update({"|V| (V)": np.abs(V), "Fase V (°)": np.degrees(np.angle(V)),
+                    "|I| (A)": np.abs(I), "Fase I (°)": np.degrees(np.angle(I))})
+    return pd.DataFrame(colunas)
+
+def renderizar_figura(fig):
+    """Rasteriza a figura em PNG e a fecha, para que o resultado possa ir para o cache sem manter a figura viva."""
+    import matplotlib.pyplot as plt
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=200)
+    plt.close(fig)
+    return buffer.getvalue()
+
 def init_session_state():
     if 'componentes' not in st.session_state: st.session_state.componentes = []
     if 'editing_id' not in st.session_state: st.session_state.editing_id = None
     if 'fonte_voltagem' not in st.session_state: st.session_state.fonte_voltagem = 120.0
     if 'fonte_frequencia' not in st.session_state: st.session_state.fonte_frequencia = 60.0
+    # Escopo por sessão: figuras já renderizadas desta sessão
+    if 'cache_figuras' not in st.session_state: st.session_state.cache_figuras = CacheLRU(max_itens=24, max_bytes=LIMITE_BYTES_CACHE_FIGURAS)
+    if 'analise_incremental' not in st.session_state: st.session_state.analise_incremental = AnaliseIncremental(st.session_state.componentes, st.session_state.fonte_frequencia)
+
+def freq_max_resposta(frequencia):
+    """Fim da faixa de 'Resposta em Frequência': 5x a frequência da fonte, no mínimo 1 kHz."""
+    return max(1000, frequencia * 5)
+
+def chave_varredura_resposta(chave_circuito, frequencia):
+    """Chave no cache global da varredura adaptativa de |Z|(f) mostrada em 'Resposta em Frequência'."""
+    return ('varredura_resposta', chave_circuito, freq_max_resposta(frequencia))
+
+def importar_circuito(carregado):
+    """Troca o circuito da sessão pelo de um arquivo de uma vez, com a análise incremental refeita
+    uma única vez. Os resultados gravados no arquivo não entram no cache global, que é compartilhado
+    entre as sessões: a resposta em frequência é recalculada (ou reaproveitada, se já estiver lá)."""
+    st.session_state.componentes = carregado['componentes']
+    st.session_state.fonte_frequencia = carregado['frequencia']
+    st.session_state.fonte_voltagem = carregado['tensao']
+    st.session_state.editing_id = None
+    st.session_state.analise_incremental.reconstruir(st.session_state.componentes, st.session_state.fonte_frequencia)
+    CACHE_GLOBAL.obter(('circuito', carregado['hash']), lambda: CircuitoCompilado(st.session_state.componentes))
 
 # --- LÓGICA DA INTERFACE PRINCIPAL ---
 
 st.set_page_config(page_title="Simulador de Circuitos CA", layout="wide", page_icon="⚡")
+medidor = instrumentacao.Medidor(instrumentacao.perfil_ativo(st.query_params))
 
 if 'componentes' not in st.session_state:
     init_session_state()
@@ -250,13 +186,46 @@ st.title("⚡ Simulador de Circuitos de Corrente Alternada")
 st.markdown("Versão 2.3 - Layout Ajustado")
 
 with st.sidebar:
+    secao_fonte, secao_arquivo = st.container(), st.container()
+
+# O arquivo é lido antes dos controles da fonte (que ficam acima dele na barra lateral), para que
+# um circuito carregado entre inteiro, com a sua fonte, já neste rerun
+with secao_arquivo:
+    st.header("Arquivo do Circuito")
+    arquivo = st.file_uploader("Carregar circuito (.json ou .npz)", type=['json', 'npz'])
+    if arquivo is not None and arquivo.file_id != st.session_state.get('arquivo_carregado'):
+        st.session_state.arquivo_carregado = arquivo.file_id
+        try:
+            importar_circuito(carregar_circuito(arquivo.getvalue()))
+        except ValueError as e:
+            st.error(f"Não foi possível carregar o arquivo: {e}")
+
+with secao_fonte:
     st.header("Configurações da Fonte")
     st.session_state.fonte_voltagem = st.number_input("Tensão (Vrms):", 0.0, 1000.0, st.session_state.get('fonte_voltagem', 120.0), 1.0)
     st.session_state.fonte_frequencia = st.number_input("Frequência (Hz):", 1.0, 100000.0, st.session_state.get('fonte_frequencia', 60.0), 1.0, format="%f")
+    st.session_state.modo_robusto = st.checkbox("Análise robusta (alta precisão)", value=st.session_state.get('modo_robusto', False),
+                                                help="Trata curtos, aberturas e cancelamentos ressonantes explicitamente, com somas compensadas e estimativa de condicionamento.")
     if st.button("Reiniciar Circuito", use_container_width=True):
         init_session_state()
         st.success("Circuito reiniciado!"); st.rerun()
 
+with secao_arquivo:
+    if st.session_state.componentes:
+        # Vai junto a varredura da resposta em frequência, se já foi calculada para este circuito
+        chave_arquivo = (impressao_digital(st.session_state.componentes), st.session_state.fonte_frequencia, st.session_state.fonte_voltagem)
+        chave_resposta = chave_varredura_resposta(chave_arquivo[0], st.session_state.fonte_frequencia)
+        try:
+            dados_arquivo = st.session_state.cache_figuras.obter(('arquivo',) + chave_arquivo + (chave_resposta in CACHE_GLOBAL,), lambda: salvar_circuito(
+                st.session_state.componentes, st.session_state.fonte_frequencia, st.session_state.fonte_voltagem,
+                dict(zip(('resposta_freqs', 'resposta_Z'), CACHE_GLOBAL.buscar(chave_resposta)[1] or ()))))
+        except ValueError as e:
+            # Um circuito que não pode ser salvo não deve impedir o resto da página de carregar
+            st.error(f"Não foi possível preparar o arquivo do circuito: {e}")
+        else:
+            extensao = 'json' if len(st.session_state.componentes) <= LIMITE_JSON else 'npz'
+            st.download_button(f"Salvar circuito (.{extensao})", dados_arquivo, file_name=f"circuito.{extensao}", use_container_width=True)
+
 def get_component_by_id(comp_id):
     if comp_id is None: return None
     for comp in st.session_state.componentes:
@@ -269,10 +238,13 @@ def submit_form(tipo, valor, unidade, conexao):
         idx_to_edit = next((i for i, item in enumerate(st.session_state.componentes) if item["id"] == editing_id), None)
         if idx_to_edit is not None:
             st.session_state.componentes[idx_to_edit].update({'tipo': tipo, 'valor': valor, 'unidade': unidade, 'conexao': conexao})
+            st.session_state.analise_incremental.atualizar(editing_id)
         st.session_state.editing_id = None
     else:
         new_id = max([c['id'] for c in st.session_state.componentes] + [-1]) + 1
-        st.session_state.componentes.append({'id': new_id, 'tipo': tipo, 'valor': valor, 'unidade': unidade, 'conexao': conexao})
+        novo_comp = {'id': new_id, 'tipo': tipo, 'valor': valor, 'unidade': unidade, 'conexao': conexao}
+        st.session_state.componentes.append(novo_comp)
+        st.session_state.analise_incremental.adicionar(novo_comp)
     st.rerun()
 
 is_editing = st.session_state.get('editing_id') is not None
@@ -317,15 +289,40 @@ st.subheader("Circuito Montado e Análise Completa")
 if not st.session_state.componentes:
     st.info("Nenhum componente adicionado. Use o formulário acima para começar.")
 else:
-    Z_total, I_total, componentes_analisados = analisar_circuito_detalhadamente(st.session_state.componentes, st.session_state.fonte_frequencia, st.session_state.fonte_voltagem)
+    import pandas as pd
+    # Compilado uma vez e reutilizado pela análise, tabela, desenho e varredura; resultados
+    # numéricos ficam no cache global, indexados pela impressão digital do circuito
+    chave_circuito = impressao_digital(st.session_state.componentes)
+    chave_analise = (chave_circuito, st.session_state.fonte_frequencia, st.session_state.fonte_voltagem) + (('robusto',) if st.session_state.modo_robusto else ())
+    with medidor.etapa('compilação'):
+        circuito = CACHE_GLOBAL.obter(('circuito', chave_circuito), lambda: CircuitoCompilado(st.session_state.componentes))
+    # Em caso de falha no cache, a análise incremental da sessão já tem os blocos atualizados pelas
+    # edições; só é refeita do zero quando a frequência muda ou a lista foi trocada por fora
+    incremental = st.session_state.analise_incremental
+    with medidor.etapa('análise'):
+        if incremental.frequencia != st.session_state.fonte_frequencia or len(incremental) != len(st.session_state.componentes):
+            incremental.reconstruir(st.session_state.componentes, st.session_state.fonte_frequencia)
+        robusto = None
+        if st.session_state.modo_robusto:
+            robusto = CACHE_GLOBAL.obter(('analise_robusta',) + chave_analise, lambda: analisar_robusto(circuito, st.session_state.fonte_frequencia, st.session_state.fonte_voltagem))
+            Z_total, I_total = complex(robusto['Z_total'][0]), complex(robusto['I_total'][0])
+            tensoes, correntes = robusto['tensoes'][:, 0], robusto['correntes'][:, 0]
+        else:
+            Z_total, I_total, tensoes, correntes = CACHE_GLOBAL.obter(('analise',) + chave_analise, lambda: incremental.resultado(st.session_state.fonte_voltagem))
+    singular = robusto is not None and bool(robusto['curto'][0] or robusto['aberto'][0])
+    cache_figuras = st.session_state.cache_figuras
     P_total, Q_total, S_total = calcular_potencias(st.session_state.fonte_voltagem, I_total)
-    FP_total = P_total / S_total if S_total > 1e-9 else 1.0
+    FP_total = fator_de_potencia(P_total, S_total)
 
     col_circ, col_res = st.columns([1, 1])
     
-    with col_circ:
+    with col_circ, medidor.etapa('lista de componentes'):
         st.write("##### Componentes do Circuito")
-        for i, comp in enumerate(st.session_state.componentes):
+        # Circuitos importados podem ter milhares de componentes; só uma página de linhas é montada
+        n_paginas_lista = max(1, -(-len(st.session_state.componentes) // TAMANHO_PAGINA))
+        pagina_lista = st.number_input(f"Página (de {n_paginas_lista})", min_value=1, max_value=n_paginas_lista, value=1, key='pagina_componentes') if n_paginas_lista > 1 else 1
+        inicio_lista = (pagina_lista - 1) * TAMANHO_PAGINA
+        for i, comp in enumerate(st.session_state.componentes[inicio_lista:inicio_lista + TAMANHO_PAGINA], inicio_lista):
             comp_label = f"**{comp['tipo'][0]}{i+1}:** {comp['valor']} {comp['unidade']} `({comp['conexao']})`"
             c1, c2, c3 = st.columns([0.6, 0.2, 0.2])
             c1.markdown(comp_label)
@@ -334,24 +331,48 @@ else:
                 st.rerun()
             if c3.button("Remover", key=f"del_{comp['id']}", use_container_width=True):
                 st.session_state.componentes.pop(i)
+                st.session_state.analise_incremental.remover(comp['id'])
                 st.session_state.editing_id = None 
                 st.rerun()
         
+    with col_circ, medidor.etapa('diagrama'):
         st.write("##### Diagrama do Circuito")
-        try:
-            d = desenhar_circuito(st.session_state.componentes)
-            st.image(d.get_imagedata('svg').decode(), use_container_width=True)
-        except Exception as e:
-            st.error(f"Ocorreu um erro ao desenhar o circuito: {e}")
-
-    with col_res:
+        # Circuitos grandes só são desenhados quando pedido e, por padrão, na visão resumida
+        grande = len(st.session_state.componentes) > esquema.LIMITE_DESENHO_AUTOMATICO
+        resumido = st.checkbox("Visão resumida", value=grande, help="Agrupa trechos série longos e grupos paralelos largos numa única caixa.")
+        if not grande or st.checkbox(f"Desenhar diagrama ({len(st.session_state.componentes)} componentes)", value=False):
+            try:
+                ids = tuple(c['id'] for c in st.session_state.componentes)
+                def gerar_svg():
+                    with medidor.etapa('svg'):
+                        return esquema.esquema_svg(st.session_state.componentes, circuito, resumido)
+                svg = cache_figuras.obter(('esquema', chave_circuito, ids, resumido), gerar_svg)
+                st.image(svg, use_container_width=True)
+            except Exception as e:
+                st.error(f"Ocorreu um erro ao desenhar o circuito: {e}")
+
+    with col_res, medidor.etapa('resumo'):
         st.write("##### Análise Geral do Circuito")
         _, pol_Z = formatar_complexo(Z_total, "Ω")
         _, pol_I = formatar_complexo(I_total, "A")
         st.metric(label="Impedância Total (Z)", value=pol_Z)
         st.metric(label="Corrente Total (I)", value=pol_I)
+        if robusto is not None:
+            if robusto['curto'][0]:
+                st.error("**Curto-circuito na fonte:** a impedância total é nula e a corrente, ilimitada; as tensões fora dos trechos em curto ficam indeterminadas.")
+            elif robusto['aberto'][0]:
+                st.warning(f"**Circuito aberto:** {int(robusto['blocos_abertos'][:, 0].sum())} bloco(s) com impedância infinita (ramo aberto ou antirressonância); a corrente da fonte é nula.")
+            if robusto['blocos_curto'][:, 0].any() and not robusto['curto'][0]:
+                st.info(f"{int(robusto['blocos_curto'][:, 0].sum())} bloco(s) em curto-circuito (valor nulo ou indutor em f = 0).")
+            # Dígitos perdidos na soma comum ≈ log10(condição); a análise robusta recupera a maior parte
+            digitos = np.log10(robusto['condicao'][0]) if np.isfinite(robusto['condicao'][0]) else np.inf
+            if not singular and digitos >= 6:
+                st.warning(f"**Mal condicionado:** condição ≈ {robusto['condicao'][0]:.2e} (cerca de {digitos:.0f} dígitos perdidos numa soma comum); perto de uma ressonância os resultados são sensíveis aos valores dos componentes.")
+            else:
+                st.caption(f"Condição estimada: {robusto['condicao'][0]:.3g}")
         
-        if Q_total > 1e-6: st.info("**🔸 Característica Indutiva:** A corrente se atrasa em relação à tensão.", icon="💡")
+        if singular: pass
+        elif Q_total > 1e-6: st.info("**🔸 Característica Indutiva:** A corrente se atrasa em relação à tensão.", icon="💡")
         elif Q_total < -1e-6: st.info("**🔹 Característica Capacitiva:** A corrente se adianta em relação à tensão.", icon="💡")
         else: st.info("**✅ Característica Resistiva:** A corrente e a tensão estão em fase.", icon="💡")
         
@@ -359,20 +380,188 @@ else:
         c1.metric("Potência Ativa (P)", f"{P_total:.2f} W"); c2.metric("Potência Reativa (Q)", f"{Q_total:.2f} VAR")
         c1.metric("Potência Aparente (S)", f"{S_total:.2f} VA"); c2.metric("Fator de Potência (FP)", f"{FP_total:.4f}")
     
-    with st.expander("Análise Detalhada por Componente", expanded=False):
-        df_data = []
-        for i, comp in enumerate(componentes_analisados):
-            _, V_polar = formatar_complexo(comp.get('tensao', 0), 'V')
-            _, I_polar = formatar_complexo(comp.get('corrente', 0), 'A')
-            df_data.append({"Componente": f"{comp['tipo'][0]}{i+1}", "Valor": f"{comp['valor']} {comp['unidade']}", "Tensão (V)": V_polar, "Corrente (A)": I_polar})
-        st.dataframe(pd.DataFrame(df_data), use_container_width=True, hide_index=True)
-
-    with st.expander("Gráficos de Análise", expanded=True):
-        st.pyplot(plot_fasores(Z_total, st.session_state.fonte_voltagem, I_total))
-        st.pyplot(plot_triangulo_potencias(P_total, Q_total, S_total))
-
-    with st.expander("Ver Resposta em Frequência", expanded=False):
-        st.pyplot(plotar_resposta_em_frequencia(st.session_state.componentes, 1, max(1000, st.session_state.fonte_frequencia * 5), st.session_state.fonte_frequencia))
+    with st.expander("Análise Detalhada por Componente", expanded=False), medidor.etapa('tabela'):
+        # Só a página visível é formatada; a exportação leva as colunas numéricas de todas as linhas
+        n_componentes = len(st.session_state.componentes)
+        n_paginas = max(1, -(-n_componentes // TAMANHO_PAGINA))
+        pagina = st.number_input(f"Página (de {n_paginas})", min_value=1, max_value=n_paginas, value=1, key='pagina_tabela') if n_paginas > 1 else 1
+        inicio = (pagina - 1) * TAMANHO_PAGINA
+        st.dataframe(tabela_componentes(st.session_state.componentes, tensoes, correntes, inicio, inicio + TAMANHO_PAGINA),
+                     use_container_width=True, hide_index=True,
+                     column_config={nome: st.column_config.NumberColumn(format="%.4g") for nome in ("|V| (V)", "Fase V (°)", "|I| (A)", "Fase I (°)")})
+        csv = cache_figuras.obter(('tabela_csv',) + chave_analise, lambda: tabela_componentes(st.session_state.componentes, tensoes, correntes, texto=False).to_csv(index=False))
+        st.download_button("Exportar CSV", csv, file_name="componentes.csv", mime="text/csv")
+
+    with st.expander("Gráficos de Análise", expanded=True), medidor.etapa('gráficos'):
+        # Com plotly as figuras ficam no cache da sessão e são reenviadas idênticas enquanto a análise não muda;
+        # sem ele, as do matplotlib são rasterizadas uma vez e fechadas
+        if singular:
+            st.info("Diagrama fasorial e triângulo de potências indisponíveis com a fonte em curto ou o circuito aberto.")
+        elif graficos.PLOTLY_DISPONIVEL:
+            st.plotly_chart(cache_figuras.obter(('fasores_plotly',) + chave_analise, lambda: graficos.figura_fasores(Z_total, st.session_state.fonte_voltagem, I_total)), use_container_width=True)
+            st.plotly_chart(cache_figuras.obter(('potencias_plotly',) + chave_analise, lambda: graficos.figura_triangulo_potencias(P_total, Q_total, S_total)), use_container_width=True)
+        else:
+            st.image(cache_figuras.obter(('fasores',) + chave_analise, lambda: renderizar_figura(plot_fasores(Z_total, st.session_state.fonte_voltagem, I_total))), use_container_width=True)
+            st.image(cache_figuras.obter(('potencias',) + chave_analise, lambda: renderizar_figura(plot_triangulo_potencias(P_total, Q_total, S_total))), use_container_width=True)
+
+    with st.expander("Ver Resposta em Frequência", expanded=False), medidor.etapa('resposta em frequência'):
+        freq_max = freq_max_resposta(st.session_state.fonte_frequencia)
+        if graficos.PLOTLY_DISPONIVEL:
+            def calcular_resposta():
+                with medidor.etapa('varredura'):
+                    freqs, Z_varredura = CACHE_GLOBAL.obter(chave_varredura_resposta(chave_circuito, st.session_state.fonte_frequencia), lambda: amostrar_adaptativo(circuito, 1, freq_max))
+                    ressonancias = encontrar_ressonancias(circuito, 1, freq_max, freqs, Z_varredura)
+                with medidor.etapa('figura'):
+                    return graficos.figura_resposta_em_frequencia(freqs, Z_varredura, ressonancias), ressonancias
+            # A curva não depende da frequência da fonte: a figura é reaproveitada e só o ponto de operação muda
+            fig_resposta, ressonancias = cache_figuras.obter(('resposta_plotly', chave_circuito, freq_max), calcular_resposta)
+            st.plotly_chart(graficos.marcar_frequencia_atual(fig_resposta, st.session_state.fonte_frequencia, Z_total), use_container_width=True)
+        else:
+            def calcular_resposta():
+                freqs, Z_varredura = CACHE_GLOBAL.obter(chave_varredura_resposta(chave_circuito, st.session_state.fonte_frequencia), lambda: amostrar_adaptativo(circuito, 1, freq_max))
+                fig, ressonancias = plotar_resposta_em_frequencia(circuito, 1, freq_max, st.session_state.fonte_frequencia, freqs, Z_varredura)
+                return renderizar_figura(fig), ressonancias
+            png_resposta, ressonancias = cache_figuras.obter(('resposta', chave_circuito, freq_max, st.session_state.fonte_frequencia), calcular_resposta)
+            st.image(png_resposta, use_container_width=True)
+        if ressonancias:
+            st.dataframe(pd.DataFrame([{"Tipo": r['tipo'].capitalize(), "f0 (Hz)": r['f0'], "|Z| em f0 (Ω)": abs(r['Z']), "Largura de Banda (Hz)": r['largura_banda'], "Q": r['Q']} for r in ressonancias]), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Nenhuma ressonância no intervalo analisado.")
+
+    with st.expander("Análise Harmônica da Fonte", expanded=False), medidor.etapa('harmônicos'):
+        st.caption("A fundamental é a tensão e a frequência da fonte; as harmônicas são dadas em % da fundamental.")
+        harmonicas = st.data_editor(pd.DataFrame({"Ordem": [3, 5, 7], "Magnitude (%)": [5.0, 4.0, 3.0], "Fase (°)": [0.0, 0.0, 0.0]}),
+                                    num_rows='dynamic', hide_index=True, use_container_width=True, key='harmonicas').dropna()
+        # Todas as harmônicas são resolvidas juntas, numa varredura do circuito compilado
+        ordens = (1.0,) + tuple(harmonicas["Ordem"].astype(float))
+        magnitudes = tuple(st.session_state.fonte_voltagem * np.array((100.0,) + tuple(harmonicas["Magnitude (%)"].astype(float))) / 100)
+        fases = (0.0,) + tuple(harmonicas["Fase (°)"].astype(float))
+        harm = None
+        try:
+            harm = cache_figuras.obter(('harmonicos', chave_circuito, st.session_state.fonte_frequencia, ordens, magnitudes, fases),
+                                       lambda: analisar_harmonicos(circuito, st.session_state.fonte_frequencia, ordens, magnitudes, fases, por_componente=False))
+        except ValueError as e:
+            st.error(f"Espectro inválido: {e}")
+        else:
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Tensão RMS", f"{harm['V_rms']:.2f} V"); c2.metric("Corrente RMS", f"{harm['I_rms']:.4f} A")
+            # THD nan: a fundamental é nula (ex.: antirressonância na frequência da fonte)
+            thd = lambda valor: f"{valor:.2%}" if np.isfinite(valor) else "indefinida"
+            c3.metric("THD da Tensão", thd(harm['THD_V'])); c4.metric("THD da Corrente", thd(harm['THD_I']))
+            c1.metric("Potência Ativa (P)", f"{harm['P']:.2f} W"); c2.metric("Potência Reativa (Q)", f"{harm['Q']:.2f} VAR")
+            c3.metric("FP Verdadeiro", f"{harm['FP']:.4f}"); c4.metric("FP de Deslocamento", f"{harm['FP_deslocamento']:.4f}")
+            st.dataframe(pd.DataFrame({"Ordem": harm['ordens'], "f (Hz)": harm['freqs'], "|V| (V)": np.abs(harm['V']), "|Z| (Ω)": np.abs(harm['Z_total']),
+                                       "|I| (A)": np.abs(harm['I_total']), "P (W)": harm['P_h'], "Q (VAR)": harm['Q_h']}), use_container_width=True, hide_index=True)
+
+    with st.expander("Formas de Onda no Tempo", expanded=False), medidor.etapa('formas de onda'):
+        c1, c2, c3 = st.columns(3)
+        ciclos = c1.number_input("Ciclos da fundamental", 1, 10_000, 3)
+        amostras_por_ciclo = c2.number_input("Amostras por ciclo", 10, 10_000, 200, 10, help="Por ciclo da maior frequência do sinal.")
+        com_harmonicas = c3.checkbox("Incluir harmônicas da fonte", value=False, disabled=harm is None)
+        freqs_onda, V_onda = (harm['freqs'], harm['V']) if com_harmonicas and harm is not None else ([st.session_state.fonte_frequencia], [st.session_state.fonte_voltagem])
+        nomes_sinais, fasores_sinais = fasores_do_circuito(circuito, freqs_onda, V_onda)
+        taxa = amostras_por_ciclo * float(np.max(freqs_onda))
+        selecionados = st.multiselect("Sinais", nomes_sinais, default=nomes_sinais[:2])
+        if selecionados:
+            # O gráfico usa no máximo LIMITE_AMOSTRAS_GRAFICO amostras, geradas em blocos e só dos sinais escolhidos
+            linhas = [nomes_sinais.index(nome) for nome in selecionados]
+            tempos, blocos, n = [], [], 0
+            for t, bloco in formas_de_onda(fasores_sinais[linhas], freqs_onda, ciclos, taxa):
+                tempos.append(t); blocos.append(bloco); n += t.size
+                if n >= LIMITE_AMOSTRAS_GRAFICO:
+                    break
+            t, valores = np.concatenate(tempos)[:LIMITE_AMOSTRAS_GRAFICO], np.concatenate(blocos)[:LIMITE_AMOSTRAS_GRAFICO]
+            if n > LIMITE_AMOSTRAS_GRAFICO:
+                st.caption(f"Mostrando os primeiros {t[-1] * 1e3:.1f} ms; a exportação leva a captura inteira.")
+            if graficos.PLOTLY_DISPONIVEL:
+                st.plotly_chart(graficos.figura_formas_de_onda(t, dict(zip(selecionados, valores.T))), use_container_width=True)
+            else:
+                st.line_chart(pd.DataFrame(valores, index=t, columns=selecionados))
+        c1, c2 = st.columns(2)
+        formato = c1.radio("Formato de exportação", ("CSV", ".npy"), horizontal=True, help="O .npy pode ser aberto sem carregá-lo com np.load(arquivo, mmap_mode='r'); a coluna 0 é o tempo.")
+        _, n_amostras = amostragem(freqs_onda, ciclos, taxa)
+        tamanho = n_amostras * (1 + len(nomes_sinais)) * (BYTES_POR_VALOR_CSV if formato == "CSV" else 8)
+        c2.caption(f"{n_amostras} amostras × {len(nomes_sinais)} sinais: cerca de {tamanho / 1024 ** 2:.1f} MB")
+        if tamanho > LIMITE_BYTES_EXPORTACAO:
+            st.warning(f"A captura passa de {LIMITE_BYTES_EXPORTACAO // 1024 ** 2} MB, o limite do download pelo app. Reduza os ciclos ou as amostras "
+                       "por ciclo, ou grave direto em disco com `motor_circuito.exportar_npy` (bloco a bloco, sem manter a captura em memória).")
+        elif c2.checkbox("Preparar arquivo (todos os sinais)", value=False):
+            if formato == "CSV":
+                buffer = io.StringIO()
+                exportar_csv(buffer, nomes_sinais, formas_de_onda(fasores_sinais, freqs_onda, ciclos, taxa))
+                dados, nome_arquivo, mime = buffer.getvalue(), "formas_de_onda.csv", "text/csv"
+            else:
+                buffer = io.BytesIO()
+                exportar_npy(buffer, fasores_sinais, freqs_onda, ciclos, taxa)
+                dados, nome_arquivo, mime = buffer.getvalue(), "formas_de_onda.npy", "application/octet-stream"
+            st.download_button(f"Baixar {nome_arquivo}", dados, file_name=nome_arquivo, mime=mime)
+
+    with st.expander("Varredura de Parâmetros e Otimização", expanded=False), medidor.etapa('parâmetros'):
+        rotulos_comp = [f"{comp['tipo'][0]}{i+1} ({comp['valor']} {comp['unidade']})" for i, comp in enumerate(st.session_state.componentes)]
+        variados = st.multiselect("Componentes variados (até 2)", range(len(rotulos_comp)), format_func=rotulos_comp.__getitem__, max_selections=2)
+        if variados:
+            faixas = []
+            for coluna, i in zip(st.columns(len(variados)), variados):
+                comp = st.session_state.componentes[i]
+                minimo = coluna.number_input(f"Mínimo de {rotulos_comp[i].split()[0]} ({comp['unidade']})", min_value=0.0, value=comp['valor'] / 10, format="%.4g", key=f"min_param_{comp['id']}")
+                maximo = coluna.number_input(f"Máximo de {rotulos_comp[i].split()[0]} ({comp['unidade']})", min_value=0.0, value=comp['valor'] * 10, format="%.4g", key=f"max_param_{comp['id']}")
+                faixas.append((minimo, maximo))
+            nomes_eixos = [f"{rotulos_comp[i].split()[0]} ({st.session_state.componentes[i]['unidade']})" for i in variados]
+            c1, c2 = st.columns(2)
+            grandeza = c1.selectbox("Grandeza", list(GRANDEZAS), format_func=GRANDEZAS.get)
+            pontos = c2.number_input("Pontos por eixo", 10, 2000, 400 if len(variados) == 1 else 100, 10)
+            try:
+                eixos = [faixa_de_valores(a, b, pontos) for a, b in faixas]
+            except ValueError as e:
+                st.error(f"Faixa inválida: {e}")
+            else:
+                # A grade inteira é avaliada como um único lote vetorizado (em vários processos quando é grande);
+                # o cache guarda só a grandeza exibida, já reduzida ao que o gráfico mostra (a grade completa
+                # de 2000 x 2000 pontos passa de 300 MB)
+                def calcular_grade():
+                    grade = avaliar_grade(st.session_state.componentes, st.session_state.fonte_frequencia, st.session_state.fonte_voltagem, variados, eixos, circuito, processos=None)
+                    return graficos.reduzir_grade(eixos, grade[grandeza])
+                chave_grade = ('parametros',) + chave_analise + (tuple(variados), tuple(faixas), pontos, grandeza)
+                eixos_mapa, valores_mapa = cache_figuras.obter(chave_grade, calcular_grade)
+                if graficos.PLOTLY_DISPONIVEL:
+                    st.plotly_chart(graficos.figura_mapa_parametros(eixos_mapa, nomes_eixos, valores_mapa, GRANDEZAS[grandeza]), use_container_width=True)
+                elif len(variados) == 1:
+                    st.line_chart(pd.DataFrame({GRANDEZAS[grandeza]: valores_mapa}, index=pd.Index(eixos_mapa[0], name=nomes_eixos[0])))
+                else:
+                    st.dataframe(pd.DataFrame(valores_mapa, index=eixos_mapa[0], columns=eixos_mapa[1]), use_container_width=True)
+
+            c1, c2 = st.columns(2)
+            alvo = c1.number_input(f"Alvo para {GRANDEZAS[grandeza]}", value=1.0 if grandeza == 'FP' else 100.0, format="%.4g")
+            if c2.button("Otimizar", use_container_width=True):
+                try:
+                    otimo = otimizar_parametros(st.session_state.componentes, st.session_state.fonte_frequencia, st.session_state.fonte_voltagem, variados, faixas, grandeza, alvo, circuito=circuito)
+                except ValueError as e:
+                    st.error(f"Não foi possível otimizar: {e}")
+                else:
+                    valores_otimos = ", ".join(f"{nome} = {valor:.4g}" for nome, valor in zip(nomes_eixos, otimo['valores']))
+                    st.success(f"{valores_otimos} → {GRANDEZAS[grandeza]} = {otimo['resultado']:.6g} (erro {otimo['erro']:.2g}, {otimo['avaliacoes']} avaliações)")
+
+    with st.expander("Análise de Tolerâncias (Monte Carlo)", expanded=False), medidor.etapa('monte carlo'):
+        c1, c2, c3 = st.columns(3)
+        tolerancia = c1.number_input("Tolerância (±%)", 0.0, 50.0, 5.0, 0.5)
+        distribuicao = c2.selectbox("Distribuição", ('uniforme', 'normal'), help="Na normal, a tolerância equivale a 3 desvios-padrão.")
+        n_amostras = c3.number_input("Amostras", 1000, 1_000_000, 100_000, 10_000)
+        if st.checkbox("Executar análise de Monte Carlo", value=False):
+            tolerancias_comp = tuple((c.get('tolerancia'), c.get('distribuicao')) for c in st.session_state.componentes)
+            chave_mc = ('monte_carlo',) + chave_analise + (tolerancia, distribuicao, n_amostras, tolerancias_comp)
+            tabela_mc, png_mc = cache_figuras.obter(chave_mc, lambda: resumir_monte_carlo(monte_carlo(st.session_state.componentes, st.session_state.fonte_frequencia, st.session_state.fonte_voltagem, n_amostras, tolerancia, distribuicao, semente=0, circuito=circuito)))
+            st.dataframe(tabela_mc, use_container_width=True, hide_index=True)
+            st.image(png_mc, use_container_width=True)
 
 st.markdown("---")
-st.markdown("Desenvolvido com Python + Streamlit | Versão 2.3 - Layout Ajustado")
\ No newline at end of file
+st.markdown("Desenvolvido com Python + Streamlit | Versão 2.3 - Layout Ajustado")
+
+if medidor.ativo:
+    import pandas as pd
+    caches = {'global': CACHE_GLOBAL.estatisticas(), 'figuras': st.session_state.cache_figuras.estatisticas(), 'fragmentos': esquema.CACHE_FRAGMENTOS.estatisticas()}
+    with st.sidebar:
+        st.header("Perfil do Rerun")
+        st.caption(f"Total: {medidor.total() * 1e3:.1f} ms")
+        st.dataframe(pd.DataFrame(medidor.linhas()), use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame([{'Cache': nome, 'Itens': e['itens'], 'Acertos': e['acertos'], 'Falhas': e['falhas'], 'Taxa de acerto': f"{e['taxa_acerto']:.0%}"} for nome, e in caches.items()]), use_container_width=True, hide_index=True)
+    medidor.registrar(caches, componentes=len(st.session_state.componentes))
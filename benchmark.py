@@ -0,0 +1,287 @@
+"""Benchmarks dos caminhos críticos: análise, varredura, montagem da tabela e desenho do esquema.
+
+Uso:
+    python benchmark.py -o resultados.json
+    python benchmark.py --tamanhos 10 100 1000 --casos analise_compilada varredura
+    python benchmark.py -o depois.json --comparar antes.json
+    python benchmark.py --inicializacao
+
+Os circuitos são sintéticos e gerados com semente fixa (cadeia série, banco paralelo e mistura
+aleatória), então duas execuções no mesmo commit medem exatamente o mesmo trabalho. O JSON
+gravado traz o commit, as versões e o tempo mínimo e mediano de cada caso, para comparar entre commits.
+
+Com --inicializacao mede a partida a frio do app em processos novos e falha (código de saída 1) se
+o primeiro rerun com o circuito vazio passar de ORCAMENTO_INICIALIZACAO segundos ou carregar algum
+dos MODULOS_ADIADOS, que só devem ser importados quando usados.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from motor_circuito import CircuitoCompilado, analisar_circuito_detalhadamente, analisar_harmonicos, analisar_robusto, formatar_complexo, formatar_complexos, get_impedancia_componente, varrer_frequencias
+
+# --- GERADORES DE CIRCUITOS SINTÉTICOS ---
+
+TIPOS = [('Resistor (R)', ('Ω', 'kΩ')), ('Indutor (L)', ('mH', 'µH')), ('Capacitor (C)', ('µF', 'nF'))]
+
+def _componente(rng, k, conexao):
+    tipo, unidades = TIPOS[rng.randrange(len(TIPOS))]
+    return {'id': k, 'tipo': tipo, 'valor': round(rng.uniform(1, 1000), 3), 'unidade': rng.choice(unidades), 'conexao': 'PRIMEIRO' if k == 0 else conexao}
+
+def gerar_serie(n, semente=0):
+    rng = random.Random(semente)
+    return [_componente(rng, k, 'SÉRIE') for k in range(n)]
+
+def gerar_paralelo(n, semente=0):
+    """Um único banco paralelo de n ramos."""
+    rng = random.Random(semente)
+    return [_componente(rng, k, 'PARALELO') for k in range(n)]
+
+def gerar_misto(n, semente=0, prob_paralelo=0.4):
+    rng = random.Random(semente)
+    return [_componente(rng, k, 'PARALELO' if rng.random() < prob_paralelo else 'SÉRIE') for k in range(n)]
+
+GERADORES = {'serie': gerar_serie, 'paralelo': gerar_paralelo, 'misto': gerar_misto}
+
+# --- CASOS MEDIDOS ---
+# Cada caso recebe os componentes e devolve a função a cronometrar (a preparação fica fora da medida)
+
+FREQUENCIA, TENSAO = 60.0, 120.0
+N_FREQS_VARREDURA = 256
+N_HARMONICOS = 50
+
+def caso_impedancias(componentes):
+    return lambda: [get_impedancia_componente(c, FREQUENCIA) for c in componentes]
+
+def caso_analise_escalar(componentes):
+    return lambda: analisar_circuito_detalhadamente(componentes, FREQUENCIA, TENSAO)
+
+def caso_analise_compilada(componentes):
+    return lambda: CircuitoCompilado(componentes).analisar(FREQUENCIA, TENSAO)
+
+def caso_varredura(componentes):
+    circuito = CircuitoCompilado(componentes)
+    freqs = np.logspace(0, 5, N_FREQS_VARREDURA)
+    return lambda: varrer_frequencias(circuito, freqs, TENSAO)
+
+def caso_robusto(componentes):
+    """A mesma varredura pela análise robusta (somas compensadas e tratamento de singularidades)."""
+    circuito = CircuitoCompilado(componentes)
+    freqs = np.logspace(0, 5, N_FREQS_VARREDURA)
+    return lambda: analisar_robusto(circuito, freqs, TENSAO)
+
+def caso_harmonicos(componentes):
+    """Espectro com as N_HARMONICOS primeiras ordens ímpares, com magnitude 1/h."""
+    circuito = CircuitoCompilado(componentes)
+    ordens = np.arange(1, 2 * N_HARMONICOS, 2)
+    return lambda: analisar_harmonicos(circuito, FREQUENCIA, ordens, TENSAO / ordens)
+
+def caso_tabela(componentes):
+    """A tabela 'Análise Detalhada por Componente' do app, a partir de uma análise já feita."""
+    _, _, tensoes, correntes = CircuitoCompilado(componentes).analisar(FREQUENCIA, TENSAO)
+    def montar():
+        return [{"Componente": f"{c['tipo'][0]}{i+1}", "Valor": f"{c['valor']} {c['unidade']}", "Tensão (V)": formatar_complexo(complex(tensoes[i]), 'V')[1], "Corrente (A)": formatar_complexo(complex(correntes[i]), 'A')[1]}
+                for i, c in enumerate(componentes)]
+    return montar
+
+def caso_tabela_lote(componentes):
+    """As mesmas colunas com a formatação em lote (todas as linhas, como numa página única)."""
+    _, _, tensoes, correntes = CircuitoCompilado(componentes).analisar(FREQUENCIA, TENSAO)
+    def montar():
+        return {"Componente": [f"{c['tipo'][0]}{i}" for i, c in enumerate(componentes, 1)], "Valor": [f"{c['valor']} {c['unidade']}" for c in componentes],
+                "Tensão (V)": formatar_complexos(tensoes, 'V')[1], "Corrente (A)": formatar_complexos(correntes, 'A')[1],
+                "|V| (V)": np.abs(tensoes), "|I| (A)": np.abs(correntes)}
+    return montar
+
+def caso_desenho(componentes):
+    import esquema
+    return lambda: esquema.desenhar_circuito(componentes).get_imagedata('svg')
+
+def caso_desenho_fragmentos(componentes):
+    """Esquema montado por fragmentos com o cache vazio (primeira renderização)."""
+    import esquema
+    def desenhar():
+        esquema.CACHE_FRAGMENTOS.limpar()
+        return esquema.esquema_svg(componentes)
+    return desenhar
+
+CASOS = {
+    'impedancias': caso_impedancias,
+    'analise_escalar': caso_analise_escalar,
+    'analise_compilada': caso_analise_compilada,
+    'varredura': caso_varredura,
+    'robusto': caso_robusto,
+    'harmonicos': caso_harmonicos,
+    'tabela': caso_tabela,
+    'tabela_lote': caso_tabela_lote,
+    'desenho': caso_desenho,
+    'desenho_fragmentos': caso_desenho_fragmentos,
+}
+# O desenho é ordens de grandeza mais lento que o resto; acima disso ele é pulado
+CASOS_DESENHO = ('desenho', 'desenho_fragmentos')
+
+# --- INICIALIZAÇÃO A FRIO ---
+
+ORCAMENTO_INICIALIZACAO = 1.0
+MODULOS_ADIADOS = ('pandas', 'matplotlib', 'schemdraw', 'scipy', 'plotly')
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app_web_circuito.py')
+
+_SCRIPT_APP = """
+import json, sys, time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+meio = time.perf_counter()
+# Só conta o que o rerun do app carregou: algumas versões do streamlit importam o plotly por conta própria
+ja_carregados = set(sys.modules)
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+fim = time.perf_counter()
+print(json.dumps({'streamlit': meio - inicio, 'primeiro_rerun': fim - meio, 'erros': [str(e.value) for e in at.exception],
+                  'modulos_carregados': [m for m in sys.argv[2:] if m in sys.modules and m not in ja_carregados]}))
+"""
+_SCRIPT_MOTOR = """
+import json, sys, time
+inicio = time.perf_counter()
+import motor_circuito
+print(json.dumps({'motor': time.perf_counter() - inicio, 'modulos_carregados': [m for m in sys.argv[1:] if m in sys.modules]}))
+"""
+
+def _processo_novo(script, *args):
+    saida = subprocess.run([sys.executable, '-c', script, *args], capture_output=True, text=True, check=True, cwd=os.path.dirname(APP))
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+def medir_inicializacao(repeticoes=3):
+    """Partida a frio, cada medida num processo Python novo: import do streamlit, primeiro rerun do
+    app vazio e import do motor_circuito sozinho. Guarda o menor tempo de cada um."""
+    apps = [_processo_novo(_SCRIPT_APP, APP, *MODULOS_ADIADOS) for _ in range(repeticoes)]
+    motores = [_processo_novo(_SCRIPT_MOTOR, *MODULOS_ADIADOS) for _ in range(repeticoes)]
+    return {
+        'streamlit': min(a['streamlit'] for a in apps),
+        'primeiro_rerun': min(a['primeiro_rerun'] for a in apps),
+        'motor': min(m['motor'] for m in motores),
+        'erros': apps[0]['erros'],
+        'modulos_carregados_app': apps[0]['modulos_carregados'],
+        'modulos_carregados_motor': motores[0]['modulos_carregados'],
+        'orcamento': ORCAMENTO_INICIALIZACAO,
+    }
+
+def verificar_inicializacao(medida, orcamento=ORCAMENTO_INICIALIZACAO):
+    """Problemas encontrados na medida de inicialização (lista vazia se dentro do orçamento)."""
+    problemas = []
+    if medida['primeiro_rerun'] > orcamento:
+        problemas.append(f"primeiro rerun levou {medida['primeiro_rerun']:.3f} s (orçamento: {orcamento:.3f} s)")
+    if medida['modulos_carregados_app']:
+        problemas.append(f"app vazio carregou {', '.join(medida['modulos_carregados_app'])}")
+    if medida['modulos_carregados_motor']:
+        problemas.append(f"motor_circuito carregou {', '.join(medida['modulos_carregados_motor'])}")
+    if medida['erros']:
+        problemas.append(f"erros no app: {medida['erros']}")
+    return problemas
+
+# --- EXECUÇÃO ---
+
+def cronometrar(funcao, repeticoes=5, tempo_minimo=0.2):
+    """Tempos (s) de `repeticoes` medições; cada uma roda a função quantas vezes forem precisas
+    para durar ao menos `tempo_minimo` e guarda a média por chamada."""
+    funcao()  # aquecimento: imports e caches de primeira chamada ficam fora da medida
+    inicio = time.perf_counter(); funcao(); duracao = time.perf_counter() - inicio
+    chamadas = max(1, int(tempo_minimo / duracao)) if duracao > 0 else 1000
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / chamadas)
+    return tempos
+
+def executar(casos, geradores, tamanhos, repeticoes=5, max_desenho=1000, semente=0, saida_progresso=sys.stderr):
+    resultados = []
+    for nome_gerador in geradores:
+        for n in tamanhos:
+            componentes = GERADORES[nome_gerador](n, semente)
+            for nome_caso in casos:
+                if nome_caso in CASOS_DESENHO and n > max_desenho:
+                    continue
+                tempos = cronometrar(CASOS[nome_caso](componentes), repeticoes)
+                resultado = {'caso': nome_caso, 'gerador': nome_gerador, 'n': n, 'min': min(tempos), 'mediana': statistics.median(tempos), 'repeticoes': repeticoes}
+                resultados.append(resultado)
+                if saida_progresso:
+                    print(f"{nome_caso:>20} {nome_gerador:>9} n={n:<6} {resultado['min']*1e3:10.3f} ms", file=saida_progresso)
+    return resultados
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def metadados():
+    return {'commit': _commit(), 'data': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(), 'numpy': np.__version__, 'plataforma': platform.platform()}
+
+def comparar(base, atual, limiar=0.10):
+    """Linhas (caso, gerador, n, tempo_base, tempo_atual, razão) dos casos presentes nos dois resultados,
+    usando o tempo mínimo; razão > 1 + limiar é marcada como regressão."""
+    chave = lambda r: (r['caso'], r['gerador'], r['n'])
+    anteriores = {chave(r): r for r in base['resultados']}
+    linhas = []
+    for r in atual['resultados']:
+        if chave(r) in anteriores:
+            antes = anteriores[chave(r)]['min']
+            linhas.append(chave(r) + (antes, r['min'], r['min'] / antes if antes else float('inf')))
+    return linhas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python benchmark.py', description="Mede os caminhos críticos do simulador em circuitos sintéticos.")
+    parser.add_argument('-o', '--saida', help="arquivo JSON com os resultados")
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS), default=list(CASOS))
+    parser.add_argument('--geradores', nargs='+', choices=list(GERADORES), default=list(GERADORES))
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[10, 100, 1000, 10000])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--max-desenho', type=int, default=1000, help="maior circuito em que o desenho é medido")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--limiar', type=float, default=0.10, help="piora relativa considerada regressão (padrão 10%%)")
+    parser.add_argument('--inicializacao', action='store_true', help="mede só a partida a frio do app e verifica o orçamento")
+    parser.add_argument('--orcamento', type=float, default=ORCAMENTO_INICIALIZACAO, help="tempo máximo (s) do primeiro rerun do app vazio")
+    args = parser.parse_args(argv)
+
+    if args.inicializacao:
+        medida = medir_inicializacao(args.repeticoes)
+        medida['orcamento'] = args.orcamento
+        if args.saida:
+            with open(args.saida, 'w', encoding='utf-8') as arquivo:
+                json.dump({'meta': metadados(), 'inicializacao': medida}, arquivo, ensure_ascii=False, indent=1)
+        print(f"import streamlit: {medida['streamlit']:.3f} s | primeiro rerun do app: {medida['primeiro_rerun']:.3f} s | import motor_circuito: {medida['motor']:.3f} s")
+        problemas = verificar_inicializacao(medida, args.orcamento)
+        for problema in problemas:
+            print(f"FORA DO ORÇAMENTO: {problema}")
+        return 1 if problemas else 0
+
+    relatorio = {'meta': metadados(), 'resultados': executar(args.casos, args.geradores, args.tamanhos, args.repeticoes, args.max_desenho, args.semente)}
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=1)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        regressoes = 0
+        print(f"Comparação com {base['meta'].get('commit')} ({base['meta'].get('data')}):")
+        for caso, gerador, n, antes, depois, razao in comparar(base, relatorio, args.limiar):
+            marca = ' REGRESSÃO' if razao > 1 + args.limiar else ''
+            regressoes += bool(marca)
+            print(f"{caso:>20} {gerador:>9} n={n:<6} {antes*1e3:10.3f} -> {depois*1e3:10.3f} ms  x{razao:.2f}{marca}")
+        return 1 if regressoes else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,29 +2,32 @@
 import cmath
 import math
 
-# ... (função formatar_complexo - sem alterações)
-def formatar_complexo(numero_complexo):
-    """Converte um número complexo para string em formato retangular e polar."""
-    if abs(numero_complexo.real) < 1e-9 and abs(numero_complexo.imag) < 1e-9:
-        retangular = "0.0000"
-    elif abs(numero_complexo.imag) < 1e-9:
-        retangular = f"{numero_complexo.real:.4f}"
-    elif abs(numero_complexo.real) < 1e-9:
-        retangular = f"{'' if numero_complexo.imag >= 0 else '-'}j{abs(numero_complexo.imag):.4f}"
+from motor_circuito import EquivalenteAcumulado, calcular_potencias, fator_de_potencia, formatar_complexo, formatar_complexos, get_impedancia_componente
+
+# A calculadora usa o mesmo motor do app web (componentes como a mesma lista de dicts, impedâncias pelo
+# núcleo compilado), mas mantém a sua regra de conexão: cada componente entra em SÉRIE ou PARALELO com
+# a impedância equivalente de tudo o que já foi montado (EquivalenteAcumulado), e não só com o anterior
+CASAS_DECIMAIS = 4
+
+def formatar(numero_complexo):
+    return formatar_complexo(numero_complexo, casas=CASAS_DECIMAIS)
+
+def componente_de_reatancia(tipo_componente, valor, frequencia_hz, comp_id):
+    """Converte o valor digitado (R em Ohms, XL ou XC em Ohms) no componente equivalente do motor
+    (R em Ω, L em H, C em F), que na frequência da fonte tem exatamente essa impedância."""
+    omega = 2 * math.pi * frequencia_hz
+    if tipo_componente == 'R':
+        tipo, unidade, valor_base = 'Resistor (R)', 'Ω', valor
+    elif tipo_componente == 'L':
+        tipo, unidade, valor_base = 'Indutor (L)', 'H', valor / omega
     else:
-        retangular = f"{numero_complexo.real:.4f} {'+' if numero_complexo.imag >= 0 else '-'} j{abs(numero_complexo.imag):.4f}"
+        # XC = 0 é um curto; no motor, valor 0 significa impedância nula para qualquer tipo
+        tipo, unidade, valor_base = 'Capacitor (C)', 'F', 1 / (omega * valor) if valor else 0.0
+    return {'id': comp_id, 'tipo': tipo, 'valor': valor_base, 'unidade': unidade}
 
-    magnitude, fase_rad = cmath.polar(numero_complexo)
-    if abs(magnitude) < 1e-9: 
-        fase_graus = 0.0
-    else:
-        fase_graus = math.degrees(fase_rad)
-    polar = f"{magnitude:.4f} ∠ {fase_graus:.2f}°"
-    return retangular, polar
-
-# ... (função obter_impedancia_componente - sem alterações)
-def obter_impedancia_componente():
-    """Pergunta ao usuário o tipo e valor de um componente e retorna sua impedância complexa."""
+# ... (função obter_impedancia_componente - agora devolve o componente para o motor)
+def obter_componente(frequencia_hz, comp_id):
+    """Pergunta ao usuário o tipo e valor de um componente e retorna o componente correspondente."""
     while True:
         tipo_componente = input("Qual o tipo do componente? (R para Resistor, L para Indutor, C para Capacitor): ").upper()
         if tipo_componente in ['R', 'L', 'C']:
@@ -40,21 +43,19 @@ def obter_impedancia_componente():
                 if valor < 0:
                     print("A resistência não pode ser negativa. Tente novamente.")
                     continue
-                return complex(valor, 0)
             elif tipo_componente == 'L':
                 valor_str = input("Digite o valor da reatância indutiva (XL em Ohms, ex: 50 para j50 Ohms): ")
                 valor = float(valor_str)
                 if valor < 0:
                     print("A reatância indutiva (XL) não pode ser negativa. O 'j' é adicionado automaticamente. Tente novamente.")
                     continue
-                return complex(0, valor)
             elif tipo_componente == 'C':
                 valor_str = input("Digite o valor da reatância capacitiva (XC em Ohms, ex: 25 para -j25 Ohms): ")
                 valor = float(valor_str)
                 if valor < 0:
                     print("A reatância capacitiva (XC) deve ser um valor positivo. O '-j' é adicionado automaticamente. Tente novamente.")
                     continue
-                return complex(0, -valor)
+            return componente_de_reatancia(tipo_componente, valor, frequencia_hz, comp_id)
         except ValueError:
             print("Valor inválido. Por favor, digite um número.")
         except Exception as e:
@@ -64,7 +65,7 @@ def obter_impedancia_componente():
 if __name__ == "__main__":
     print("--- Calculadora de Impedância e Corrente de Circuito CA ---")
 
-    # Coleta da frequência da fonte (opcional para os cálculos atuais, mas bom para ter)
+    # Coleta da frequência da fonte (usada para converter as reatâncias em L e C)
     while True:
         try:
             frequencia_hz_str = input("Digite a frequência da fonte CA (em Hz, ex: 60): ")
@@ -75,13 +76,14 @@ if __name__ == "__main__":
             break
         except ValueError:
             print("Valor inválido para frequência. Por favor, digite um número.")
-    
+
     print(f"Frequência da fonte: {frequencia_hz:.2f} Hz")
 
 
     print("\n--- Adicionando o PRIMEIRO componente do circuito ---")
-    impedancia_total_equivalente = obter_impedancia_componente()
-    ret_eq, pol_eq = formatar_complexo(impedancia_total_equivalente)
+    componentes = [dict(obter_componente(frequencia_hz, 0), conexao='PRIMEIRO')]
+    analise = EquivalenteAcumulado(componentes, frequencia_hz)
+    ret_eq, pol_eq = formatar(analise.Z_total)
     print(f"Impedância equivalente atual: Retangular: {ret_eq} | Polar: {pol_eq}")
 
     contador_componentes = 1
@@ -92,8 +94,8 @@ if __name__ == "__main__":
             break
 
         print(f"\n--- Adicionando o {contador_componentes}º componente ---")
-        nova_impedancia = obter_impedancia_componente()
-        ret_nova, pol_nova = formatar_complexo(nova_impedancia)
+        novo_componente = obter_componente(frequencia_hz, len(componentes))
+        ret_nova, pol_nova = formatar(get_impedancia_componente(novo_componente, frequencia_hz))
         print(f"Impedância do novo componente: Retangular: {ret_nova} | Polar: {pol_nova}")
 
         while True:
@@ -103,25 +105,19 @@ if __name__ == "__main__":
             else:
                 print("Opção inválida. Digite S para série ou P para paralelo.")
 
-        if tipo_conexao == 'S':
-            impedancia_total_equivalente += nova_impedancia
-            print("Componente adicionado em SÉRIE.")
-        elif tipo_conexao == 'P':
-            soma_denominador = impedancia_total_equivalente + nova_impedancia
-            if abs(soma_denominador) < 1e-9: # Verifica se o denominador é próximo de zero
-                print("\nERRO: Divisão por zero ao calcular impedância em paralelo (Z_eq_ant + Z_novo ≈ 0).")
-                print("Não é possível conectar estas duas impedâncias em paralelo desta forma (ressonância).")
-                print("O último componente não foi adicionado. A impedância equivalente anterior foi mantida.")
-                contador_componentes -=1 
-            else:
-                impedancia_total_equivalente = (impedancia_total_equivalente * nova_impedancia) / soma_denominador
-                print("Componente adicionado em PARALELO.")
-        
-        ret_eq, pol_eq = formatar_complexo(impedancia_total_equivalente)
+        novo_componente['conexao'] = 'SÉRIE' if tipo_conexao == 'S' else 'PARALELO'
+        componentes.append(novo_componente)
+        analise.adicionar(novo_componente)
+        print("Componente adicionado em SÉRIE." if tipo_conexao == 'S' else "Componente adicionado em PARALELO.")
+        if cmath.isinf(analise.Z_total):
+            print("Atenção: as admitâncias em paralelo se anulam (ressonância); o circuito se comporta como aberto.")
+
+        ret_eq, pol_eq = formatar(analise.Z_total)
         print(f"Nova impedância equivalente: Retangular: {ret_eq} | Polar: {pol_eq}")
 
     print("\n--- Configuração do Circuito Finalizada ---")
-    ret_final, pol_final = formatar_complexo(impedancia_total_equivalente)
+    impedancia_total_equivalente = analise.Z_total
+    ret_final, pol_final = formatar(impedancia_total_equivalente)
     print(f"Impedância Total Equivalente do Circuito (Z_total):")
     print(f"  Forma Retangular: {ret_final} Ohms")
     print(f"  Forma Polar:      {pol_final} Ohms")
@@ -139,27 +135,36 @@ if __name__ == "__main__":
                 if v_magnitude < 0:
                     print("A magnitude da tensão não pode ser negativa. Tente novamente.")
                     continue
-                
+
                 v_fase_str = input("Digite a fase da tensão da fonte (em Graus, ex: 0): ")
                 v_fase_graus = float(v_fase_str)
                 break
             except ValueError:
                 print("Valor inválido para tensão ou fase. Por favor, digite um número.")
-        
+
         v_fase_rad = math.radians(v_fase_graus)
         tensao_fonte = cmath.rect(v_magnitude, v_fase_rad) # Converte (Mag, Fase_rad) para complexo
 
-        ret_v, pol_v = formatar_complexo(tensao_fonte)
+        ret_v, pol_v = formatar(tensao_fonte)
         print(f"\nTensão da Fonte (V_fonte):")
         print(f"  Forma Retangular: {ret_v} V")
         print(f"  Forma Polar:      {pol_v} V")
 
-        # Calcular Corrente Total I = V / Z
-        corrente_total = tensao_fonte / impedancia_total_equivalente
-        
-        ret_i, pol_i = formatar_complexo(corrente_total)
+        # Corrente total e por componente, pelo mesmo motor do app web
+        _, corrente_total, tensoes, correntes = analise.resultado(tensao_fonte)
+
+        ret_i, pol_i = formatar(corrente_total)
         print(f"\nCorrente Total do Circuito (I_total):")
         print(f"  Forma Retangular: {ret_i} A")
         print(f"  Forma Polar:      {pol_i} A")
 
-    print("\n--- Fim do Programa ---")
\ No newline at end of file
+        P, Q, S = calcular_potencias(tensao_fonte, corrente_total)
+        print(f"\nPotências: P = {P:.4f} W | Q = {Q:.4f} VAR | S = {S:.4f} VA | FP = {fator_de_potencia(P, S):.4f}")
+
+        _, tensoes_polar = formatar_complexos(tensoes, 'V', CASAS_DECIMAIS)
+        _, correntes_polar = formatar_complexos(correntes, 'A', CASAS_DECIMAIS)
+        print("\nTensão e corrente em cada componente:")
+        for k, comp in enumerate(componentes):
+            print(f"  {comp['tipo'][-2]}{k+1} ({comp['conexao']}): V = {tensoes_polar[k]} | I = {correntes_polar[k]}")
+
+    print("\n--- Fim do Programa ---")
@@ -0,0 +1,168 @@
+import re
+
+from motor_circuito import CacheLRU, CircuitoCompilado
+
+# --- Desenho do Esquema do Circuito ---
+
+ESPACAMENTO = 3
+ALTURA_POR_RAMO = 3
+# Escala do backend svg do schemdraw: 72 pt/pol x 0,5 pol por unidade de desenho
+PT_POR_UNIDADE = 36
+
+# Na visão resumida, trechos série mais longos e grupos paralelos mais largos que isso viram uma caixa
+MAX_SERIE_VISIVEL = 8
+MAX_RAMOS_VISIVEIS = 6
+# Acima disso o app só desenha o diagrama quando pedido, e por padrão na visão resumida
+LIMITE_DESENHO_AUTOMATICO = 60
+
+# Fragmentos SVG por bloco, indexados pelo conteúdo do bloco (tipos, valores e rótulos);
+# não dependem da sessão, então valem para todas
+CACHE_FRAGMENTOS = CacheLRU(max_itens=4096)
+
+_VIEWBOX = re.compile(r'viewBox="([^"]+)"')
+
+# O schemdraw (que carrega o matplotlib) só é importado quando algo é de fato desenhado;
+# depois da primeira vez os imports locais abaixo são só uma consulta a sys.modules
+
+def _rotulo(comp):
+    return (comp['tipo'], f'{comp["tipo"][-2]}{comp["id"]+1}\n{comp["valor"]:.1f}{comp["unidade"]}')
+
+def _resumo(componentes, indices, titulo):
+    contagem = {}
+    for i in indices:
+        contagem[componentes[i]['tipo'][-2]] = contagem.get(componentes[i]['tipo'][-2], 0) + 1
+    primeiro, ultimo = componentes[indices[0]], componentes[indices[-1]]
+    texto = f'{titulo}: {len(indices)} componentes ({primeiro["tipo"][-2]}{primeiro["id"]+1}…{ultimo["tipo"][-2]}{ultimo["id"]+1})\n' + ' '.join(f'{n}{letra}' for letra, n in contagem.items())
+    return ('resumo', texto)
+
+def descrever_blocos(componentes, circuito=None, resumido=False):
+    """Lista de descritores (tipo_bloco, rótulos) dos blocos a desenhar, na ordem da análise.
+
+    Com `resumido`, cada sequência de mais de MAX_SERIE_VISIVEL blocos série e cada grupo paralelo
+    com mais de MAX_RAMOS_VISIVEIS ramos vira uma única caixa com a contagem por tipo.
+    """
+    if circuito is None:
+        circuito = CircuitoCompilado(componentes)
+    descritores, serie = [], []
+    def fechar_serie():
+        if resumido and len(serie) > MAX_SERIE_VISIVEL:
+            descritores.append(('serie', (_resumo(componentes, serie, 'Série'),)))
+        else:
+            descritores.extend(('serie', (_rotulo(componentes[i]),)) for i in serie)
+        serie.clear()
+    for tipo_bloco, indices in circuito.blocos():
+        if tipo_bloco == 'serie':
+            serie.extend(indices)
+            continue
+        fechar_serie()
+        if resumido and len(indices) > MAX_RAMOS_VISIVEIS:
+            descritores.append(('serie', (_resumo(componentes, list(indices), 'Paralelo'),)))
+        else:
+            descritores.append(('paralelo', tuple(_rotulo(componentes[i]) for i in indices)))
+    fechar_serie()
+    return descritores
+
+def _elemento(tipo, texto):
+    from schemdraw import elements as elm
+    if tipo == 'Resistor (R)': element = elm.Resistor()
+    elif tipo == 'Indutor (L)': element = elm.Inductor()
+    elif tipo == 'Capacitor (C)': element = elm.Capacitor()
+    else: element = elm.RBox()
+    return element.label(texto)
+
+def _desenhar_bloco(d, ponto, descritor):
+    """Desenha um bloco a partir de `ponto` (no trilho superior) e devolve o ponto onde ele termina."""
+    from schemdraw import elements as elm
+    tipo_bloco, rotulos = descritor
+    x, y = ponto
+    d += elm.Line().right().length(ESPACAMENTO/2).at(ponto)
+    x += ESPACAMENTO/2
+    if tipo_bloco == 'serie':
+        element = _elemento(*rotulos[0]).right().length(ESPACAMENTO)
+        d += element.at((x, y))
+        return element.end
+    total_height = len(rotulos) * ALTURA_POR_RAMO
+    for x_barra in (x, x + ESPACAMENTO*2):
+        d += elm.Line().up().length(total_height/2).at((x_barra, y))
+        d += elm.Line().down().length(total_height/2).at((x_barra, y))
+    for i, rotulo in enumerate(rotulos):
+        y_offset = total_height/2 - i * ALTURA_POR_RAMO - ALTURA_POR_RAMO / 2
+        d += _elemento(*rotulo).right().length(ESPACAMENTO*2).at((x, y + y_offset))
+    return (x + ESPACAMENTO*2, y)
+
+def _desenhar_fonte(d):
+    from schemdraw import elements as elm
+    fonte_elemento = elm.SourceSin().label('V').up()
+    d += fonte_elemento
+    return fonte_elemento.end
+
+def _desenhar_fechamento(d, ponto):
+    """Fio de saída do último bloco, descida e retorno pelo trilho inferior até a fonte."""
+    from schemdraw import elements as elm
+    d += elm.Line().right().length(ESPACAMENTO/2).at(ponto)
+    final_point = (ponto[0] + ESPACAMENTO/2, ponto[1])
+    d += elm.Line().down().length(ponto[1]).at(final_point)
+    d += elm.Line().left().length(final_point[0]).at((final_point[0], 0))
+
+def desenhar_circuito(componentes, circuito=None, resumido=False):
+    """Monta o esquema inteiro num único Drawing (usado para exportar; o app usa `esquema_svg`)."""
+    from schemdraw import Drawing
+    from schemdraw import elements as elm
+    d = Drawing(canvas='svg', show=False)
+    ponto = _desenhar_fonte(d)
+    if componentes:
+        for descritor in descrever_blocos(componentes, circuito, resumido):
+            ponto = _desenhar_bloco(d, ponto, descritor)
+        _desenhar_fechamento(d, ponto)
+    else:
+        d += elm.Line().right().length(ESPACAMENTO)
+        d += elm.Line().down().length(ponto[1])
+        d += elm.Line().left().length(ESPACAMENTO)
+    return d
+
+def _renderizar_fragmento(chave):
+    """SVG de um pedaço do esquema desenhado a partir da origem: (conteúdo, ponto final, caixa em pt)."""
+    from schemdraw import Drawing
+    from schemdraw import elements as elm
+    d = Drawing(canvas='svg', show=False)
+    if chave[0] == 'fonte':
+        fim = _desenhar_fonte(d)
+    elif chave[0] == 'fechamento':
+        _, largura, altura = chave
+        # Desenhado a partir de x = 0; a volta pelo trilho inferior chega à fonte em x = -largura
+        d += elm.Line().right().length(ESPACAMENTO/2).at((0, altura))
+        d += elm.Line().down().length(altura).at((ESPACAMENTO/2, altura))
+        d += elm.Line().left().length(largura + ESPACAMENTO/2).at((ESPACAMENTO/2, 0))
+        fim = (ESPACAMENTO/2, altura)
+    else:
+        fim = _desenhar_bloco(d, (0, chave[1]), chave[0])
+    svg = d.get_imagedata('svg').decode()
+    caixa = tuple(float(v) for v in _VIEWBOX.search(svg).group(1).split())
+    conteudo = svg[svg.index('>', svg.index('<svg')) + 1:svg.rindex('</svg>')]
+    return conteudo, (float(fim[0]), float(fim[1])), caixa
+
+def esquema_svg(componentes, circuito=None, resumido=False):
+    """SVG do esquema montado a partir de fragmentos por bloco guardados em CACHE_FRAGMENTOS.
+
+    Cada bloco é desenhado uma vez na origem e reposicionado com um `translate`; ao editar, incluir
+    ou remover um componente só o bloco afetado (e o fio de retorno, que depende da largura total)
+    é redesenhado, e os demais são reaproveitados mesmo que mudem de posição.
+    """
+    conteudo_fonte, (_, altura), caixa_fonte = CACHE_FRAGMENTOS.obter(('fonte',), lambda: _renderizar_fragmento(('fonte',)))
+    partes, caixas, x = [conteudo_fonte], [caixa_fonte], 0.0
+    def posicionar(chave):
+        nonlocal x
+        conteudo, fim, (cx, cy, cw, ch) = CACHE_FRAGMENTOS.obter(chave, lambda: _renderizar_fragmento(chave))
+        partes.append(f'<g transform="translate({x * PT_POR_UNIDADE:.2f},0)">{conteudo}</g>')
+        caixas.append((cx + x * PT_POR_UNIDADE, cy, cw, ch))
+        x += fim[0]
+    if componentes:
+        for descritor in descrever_blocos(componentes, circuito, resumido):
+            posicionar((descritor, altura))
+    posicionar(('fechamento', x, altura))
+
+    x_min = min(c[0] for c in caixas); y_min = min(c[1] for c in caixas)
+    x_max = max(c[0] + c[2] for c in caixas); y_max = max(c[1] + c[3] for c in caixas)
+    largura, altura_pt = x_max - x_min, y_max - y_min
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="{largura:.2f}pt" height="{altura_pt:.2f}pt" viewBox="{x_min:.2f} {y_min:.2f} {largura:.2f} {altura_pt:.2f}">'
+            f'<rect x="{x_min:.2f}" y="{y_min:.2f}" width="{largura:.2f}" height="{altura_pt:.2f}" fill="white"/>' + ''.join(partes) + '</svg>')
@@ -0,0 +1,125 @@
+import cmath
+import importlib.util
+import math
+
+import numpy as np
+
+# O plotly só é importado quando a primeira figura é montada (ele pesa na partida a frio do app);
+# sem ele o app usa as figuras do matplotlib
+PLOTLY_DISPONIVEL = importlib.util.find_spec('plotly') is not None
+
+# Máximo de pontos de uma curva enviados ao navegador
+MAX_PONTOS_CURVA = 1000
+# Máximo de pontos por eixo de um mapa de calor (200 x 200 células)
+MAX_PONTOS_MAPA = 200
+
+# --- Funções de Plotagem Interativa (plotly) ---
+
+def reduzir_pontos(x, y, max_pontos=MAX_PONTOS_CURVA):
+    """Reduz uma curva a no máximo ~max_pontos, mantendo em cada faixa o menor e o maior valor de y,
+    para que picos estreitos (ressonâncias) não desapareçam do gráfico."""
+    x, y = np.asarray(x), np.asarray(y)
+    if x.size <= max_pontos:
+        return x, y
+    n_faixas = max_pontos // 2
+    tamanho = -(-x.size // n_faixas)
+    faixas = np.full(n_faixas * tamanho, np.nan)
+    faixas[:y.size] = y
+    faixas = faixas.reshape(n_faixas, tamanho)
+    inicio = np.arange(n_faixas) * tamanho
+    i_min = inicio + np.argmin(np.where(np.isnan(faixas), np.inf, faixas), axis=1)
+    i_max = inicio + np.argmax(np.where(np.isnan(faixas), -np.inf, faixas), axis=1)
+    indices = np.unique(np.concatenate([[0, x.size - 1], i_min, i_max]))
+    indices = indices[indices < x.size]
+    return x[indices], y[indices]
+
+def reduzir_grade(eixos, valores, max_pontos=MAX_PONTOS_MAPA):
+    """Reduz a grade de `avaliar_grade` ao que o gráfico mostra: (eixos, valores) com no máximo
+    max_pontos por eixo nos mapas (pontos igualmente espaçados da grade) e MAX_PONTOS_CURVA nas curvas."""
+    valores = np.asarray(valores)
+    if len(eixos) == 1:
+        x, y = reduzir_pontos(eixos[0], valores)
+        return [x], y
+    indices = [np.unique(np.linspace(0, len(eixo) - 1, min(len(eixo), max_pontos)).round().astype(np.intp)) for eixo in eixos]
+    return [np.asarray(eixo)[i] for eixo, i in zip(eixos, indices)], valores[np.ix_(*indices)]
+
+def figura_resposta_em_frequencia(freqs, Z, ressonancias=()):
+    """Curva |Z|(f) reduzida, marcadores das ressonâncias e um traço vazio para o ponto de operação,
+    preenchido por `marcar_frequencia_atual` (só ele muda quando a frequência da fonte muda)."""
+    import plotly.graph_objects as go
+    x, y = reduzir_pontos(freqs, np.abs(Z))
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name='|Z|', line=dict(color='steelblue')))
+    for r in ressonancias:
+        cor = 'green' if r['tipo'] == 'ressonância' else 'purple'
+        texto = f"{r['tipo'].capitalize()}<br>f0 = {r['f0']:.2f} Hz" + (f"<br>Q = {r['Q']:.2f}" if r['Q'] else "")
+        fig.add_trace(go.Scatter(x=[r['f0']], y=[abs(r['Z'])], mode='markers', name=r['tipo'].capitalize(), marker=dict(color=cor, size=9), hovertext=texto, hoverinfo='text'))
+    fig.add_trace(go.Scatter(x=[], y=[], mode='markers+text', name='Frequência atual', marker=dict(color='red', size=10), textposition='middle right'))
+    fig.update_layout(title='Resposta em Frequência do Circuito', xaxis_title='Frequência (Hz)', yaxis_title='Impedância |Z| (Ω)', height=380, margin=dict(l=10, r=10, t=50, b=10))
+    fig.update_xaxes(type='log')
+    return fig
+
+def marcar_frequencia_atual(fig, freq_atual, Z_atual):
+    """Atualiza só o traço do ponto de operação de uma figura de resposta já montada."""
+    fig.data[-1].update(x=[freq_atual], y=[abs(Z_atual)], text=[f' {freq_atual:.0f} Hz'])
+    fig.layout.shapes = ()
+    fig.add_vline(x=freq_atual, line=dict(color='red', dash='dash'), opacity=0.8)
+    return fig
+
+def figura_triangulo_potencias(P, Q, S):
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=[0, P], y=[0, 0], mode='lines+markers', name=f'P = {P:.2f} W', line=dict(color='blue', width=3)))
+    fig.add_trace(go.Scatter(x=[P, P], y=[0, Q], mode='lines+markers', name=f'Q = {Q:.2f} VAR', line=dict(color='green', width=3)))
+    fig.add_trace(go.Scatter(x=[0, P], y=[0, Q], mode='lines+markers', name=f'S = {S:.2f} VA', line=dict(color='red', width=3)))
+    fig.update_layout(title='Triângulo das Potências', xaxis_title='Potência Ativa (P) [W]', yaxis_title='Potência Reativa (Q) [VAR]', height=380, margin=dict(l=10, r=10, t=50, b=10))
+    fig.update_yaxes(scaleanchor='x', scaleratio=1)
+    return fig
+
+def figura_fasores(Z_total, V_fonte, I_total_complexa):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    R, X, Z_mag = Z_total.real, Z_total.imag, abs(Z_total)
+    Z_fase_graus = math.degrees(cmath.phase(Z_total))
+    I_mag, I_fase_graus = abs(I_total_complexa), math.degrees(cmath.phase(I_total_complexa))
+    fig = make_subplots(rows=1, cols=2, specs=[[{'type': 'xy'}, {'type': 'polar'}]], subplot_titles=('Triângulo das Impedâncias', 'Fasores de Tensão e Corrente'))
+    fig.add_trace(go.Scatter(x=[0, R], y=[0, 0], mode='lines+markers', name=f'R = {R:.2f} Ω', line=dict(color='blue', width=3)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=[R, R], y=[0, X], mode='lines+markers', name=f'X = {X:.2f} Ω', line=dict(color='green', width=3)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=[0, R], y=[0, X], mode='lines+markers', name=f'|Z| = {Z_mag:.2f} Ω ∠ {Z_fase_graus:.1f}°', line=dict(color='red', width=3)), row=1, col=1)
+    # No diagrama polar, V e I são desenhados com o mesmo comprimento; só o ângulo entre eles importa
+    fig.add_trace(go.Scatterpolar(r=[0, V_fonte], theta=[0, 0], mode='lines+markers', name=f'V = {V_fonte:.1f} V', line=dict(color='orange', width=3)), row=1, col=2)
+    fig.add_trace(go.Scatterpolar(r=[0, V_fonte], theta=[0, I_fase_graus], mode='lines+markers', name=f'I = {I_mag:.2f} A ∠ {I_fase_graus:.1f}°', line=dict(color='purple', width=3)), row=1, col=2)
+    fig.update_layout(height=420, margin=dict(l=10, r=10, t=60, b=10), polar=dict(radialaxis=dict(showticklabels=False, range=[0, V_fonte * 1.2 if V_fonte else 1])))
+    fig.update_xaxes(title_text='Resistência (R) [Ω]', row=1, col=1)
+    fig.update_yaxes(title_text='Reatância (X) [Ω]', scaleanchor='x', scaleratio=1, row=1, col=1)
+    return fig
+
+def figura_formas_de_onda(t, sinais):
+    """v(t) no eixo da esquerda e i(t) no da direita; `sinais` é {nome: valores}, com nomes 'v_...' ou 'i_...'."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    fig = make_subplots(specs=[[{'secondary_y': True}]])
+    for nome, valores in sinais.items():
+        x, y = reduzir_pontos(t, valores)
+        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=nome), secondary_y=nome.startswith('i_'))
+    fig.update_layout(title='Formas de Onda no Tempo', xaxis_title='Tempo (s)', height=380, margin=dict(l=10, r=10, t=50, b=10))
+    fig.update_yaxes(title_text='Tensão (V)', secondary_y=False)
+    fig.update_yaxes(title_text='Corrente (A)', secondary_y=True)
+    return fig
+
+def figura_mapa_parametros(eixos, nomes, valores, titulo):
+    """Curva (um parâmetro) ou mapa de calor (dois parâmetros) de uma grandeza sobre a grade de valores."""
+    import plotly.graph_objects as go
+    eixos, valores = reduzir_grade(eixos, valores)
+    fig = go.Figure()
+    if len(eixos) == 1:
+        fig.add_trace(go.Scatter(x=eixos[0], y=valores, mode='lines', name=titulo, line=dict(color='steelblue')))
+        fig.update_layout(xaxis_title=nomes[0], yaxis_title=titulo)
+    else:
+        # Linhas da grade = primeiro eixo; no mapa o primeiro parâmetro fica no eixo y
+        fig.add_trace(go.Heatmap(x=eixos[1], y=eixos[0], z=valores, colorscale='Viridis', colorbar=dict(title=titulo)))
+        fig.update_layout(xaxis_title=nomes[1], yaxis_title=nomes[0])
+        fig.update_yaxes(type='log')
+    fig.update_layout(title=f'{titulo} em Função dos Parâmetros', height=420, margin=dict(l=10, r=10, t=50, b=10))
+    fig.update_xaxes(type='log')
+    return fig
@@ -0,0 +1,82 @@
+"""Medição do tempo de cada etapa de um rerun do app.
+
+Ligada por `?perfil=1` na URL ou pela variável de ambiente CIRCUITO_PERFIL=1; desligada, cada
+etapa custa só uma chamada que devolve um contexto vazio. Com CIRCUITO_PERFIL_LOG (um caminho de
+arquivo, ou '-' para stderr) cada rerun medido também vira uma linha JSON no logger 'circuito.perfil'.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger('circuito.perfil')
+
+def perfil_ativo(query_params=None):
+    if os.environ.get('CIRCUITO_PERFIL', '').lower() in ('1', 'true', 'sim'):
+        return True
+    return query_params is not None and query_params.get('perfil', '') in ('1', 'true', 'sim')
+
+def _configurar_log():
+    destino = os.environ.get('CIRCUITO_PERFIL_LOG')
+    if not destino or logger.handlers:
+        return bool(destino)
+    handler = logging.StreamHandler(sys.stderr) if destino == '-' else logging.FileHandler(destino, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return True
+
+class Medidor:
+    """Acumula (nome, segundos, profundidade) das etapas medidas, na ordem em que terminam.
+
+    Etapas podem ser aninhadas; a profundidade só serve para a exibição. Uma etapa que roda
+    várias vezes no mesmo rerun (ex.: dentro de um laço) aparece uma vez por execução.
+    """
+    _NULO = nullcontext()
+
+    def __init__(self, ativo=False):
+        self.ativo = ativo
+        self.etapas = []
+        self._profundidade = 0
+        self._inicio = time.perf_counter()
+
+    def etapa(self, nome):
+        return self._medir(nome) if self.ativo else self._NULO
+
+    @contextmanager
+    def _medir(self, nome):
+        self._profundidade += 1
+        posicao = len(self.etapas)
+        self.etapas.append(None)  # reserva a posição para manter a ordem de início
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._profundidade -= 1
+            self.etapas[posicao] = (nome, time.perf_counter() - inicio, self._profundidade)
+
+    def _concluidas(self):
+        # Etapas ainda abertas só têm a posição reservada (None)
+        return [e for e in self.etapas if e is not None]
+
+    def total(self):
+        return time.perf_counter() - self._inicio
+
+    def linhas(self):
+        """Linhas da tabela do painel: etapa (recuada pela profundidade), tempo em ms e % do rerun."""
+        total = self.total()
+        return [{'Etapa': ' ' * profundidade + nome, 'ms': round(segundos * 1e3, 2), '%': round(100 * segundos / total, 1) if total else 0.0}
+                for nome, segundos, profundidade in self._concluidas()]
+
+    def registrar(self, caches=None, **extras):
+        """Grava o rerun como uma linha JSON, se CIRCUITO_PERFIL_LOG estiver configurada."""
+        if not self.ativo or not _configurar_log():
+            return
+        registro = {'evento': 'rerun', 'total_ms': round(self.total() * 1e3, 3),
+                    'etapas': [{'nome': nome, 'ms': round(segundos * 1e3, 3), 'nivel': profundidade} for nome, segundos, profundidade in self._concluidas()],
+                    'caches': caches or {}}
+        registro.update(extras)
+        logger.info(json.dumps(registro, ensure_ascii=False))
@@ -0,0 +1,22 @@
+from .analise import (
+    FATORES_UNIDADE,
+    analisar_circuito_detalhadamente,
+    calcular_potencias,
+    compilar_blocos,
+    converter_valor,
+    fator_de_potencia,
+    get_impedancia_componente,
+)
+from .adaptativo import amostrar_adaptativo, encontrar_ressonancias
+from .cache import CACHE_GLOBAL, CacheLRU, impressao_digital
+from .compilado import CircuitoCompilado
+from .formatacao import formatar_complexo, formatar_complexos
+from .formas_de_onda import amostragem, exportar_csv, exportar_npy, fasores_do_circuito, formas_de_onda
+from .harmonicos import analisar_harmonicos, espectro
+from .incremental import AnaliseIncremental, EquivalenteAcumulado
+from .montecarlo import monte_carlo, percentis
+from .nodal import SolverNodal, analisar_nodal, netlist_de_componentes
+from .parametros import GRANDEZAS, avaliar_grade, faixa_de_valores, otimizar_parametros
+from .persistencia import LIMITE_JSON, carregar_circuito, salvar_circuito
+from .robusto import analisar_robusto, somas_compensadas
+from .varredura import varrer_frequencias
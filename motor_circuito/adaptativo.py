@@ -0,0 +1,96 @@
+import numpy as np
+
+from .compilado import CircuitoCompilado
+
+# --- AMOSTRAGEM ADAPTATIVA E RESSONÂNCIAS ---
+
+def _compilar(componentes):
+    return componentes if isinstance(componentes, CircuitoCompilado) else CircuitoCompilado(componentes)
+
+def _Z(circuito, freqs):
+    return circuito.varrer(freqs, 1, por_componente=False)[0]
+
+def amostrar_adaptativo(componentes, freq_min, freq_max, n_inicial=64, max_pontos=2000, tol_decadas=0.05, tol_fase=5.0, max_iteracoes=30):
+    """Amostra Z(f) em [freq_min, freq_max] refinando só onde a curva muda rápido.
+
+    Parte de uma grade logarítmica de `n_inicial` pontos e, a cada iteração, insere o ponto médio
+    (geométrico) de todo intervalo em que |Z| varia mais que `tol_decadas` décadas ou a fase mais
+    que `tol_fase` graus. Cada iteração avalia todos os pontos novos numa única passada vetorizada.
+    Retorna (freqs, Z) ordenados por frequência.
+    """
+    circuito = _compilar(componentes)
+    freqs = np.logspace(np.log10(freq_min), np.log10(freq_max), n_inicial)
+    Z = _Z(circuito, freqs)
+    for _ in range(max_iteracoes):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_mag = np.log10(np.abs(Z))
+            fase = np.degrees(np.angle(Z))
+            salto_mag = np.abs(np.diff(log_mag))
+            salto_fase = np.abs(np.diff(fase))
+        # Saltos com inf/nan (polos, circuito aberto) também são refinados
+        refinar = ~(salto_mag <= tol_decadas) | ~(salto_fase <= tol_fase)
+        refinar &= freqs[1:] / freqs[:-1] > 1 + 1e-9
+        indices = np.flatnonzero(refinar)
+        if not indices.size:
+            break
+        indices = indices[:max(max_pontos - freqs.size, 0)]
+        if not indices.size:
+            break
+        novas = np.sqrt(freqs[indices] * freqs[indices + 1])
+        freqs = np.insert(freqs, indices + 1, novas)
+        Z = np.insert(Z, indices + 1, _Z(circuito, novas))
+    return freqs, Z
+
+def _bissecao(circuito, f_a, f_b, funcao, iteracoes=60):
+    """Bisseção em log f, para vários intervalos ao mesmo tempo, da raiz de funcao(Z(f)) (troca de sinal em cada [f_a, f_b])."""
+    log_a, log_b = np.log(f_a), np.log(f_b)
+    sinal_a = np.sign(funcao(_Z(circuito, f_a)))
+    for _ in range(iteracoes):
+        log_m = (log_a + log_b) / 2
+        sinal_m = np.sign(funcao(_Z(circuito, np.exp(log_m))))
+        mesmo_lado = sinal_m == sinal_a
+        log_a = np.where(mesmo_lado, log_m, log_a)
+        log_b = np.where(mesmo_lado, log_b, log_m)
+    return np.exp((log_a + log_b) / 2)
+
+def encontrar_ressonancias(componentes, freq_min, freq_max, freqs=None, Z=None):
+    """Localiza ressonâncias (Im Z cruza zero subindo: mínimo de |Z|, como no RLC série) e
+    antirressonâncias (Im Z cruza zero descendo ou passa por um polo: máximo de |Z|, como no
+    RLC paralelo) por bisseção, com largura de banda de meia potência e fator de qualidade.
+
+    Aproveita uma amostragem já feita (`freqs`, `Z`) para achar as trocas de sinal; sem ela usa
+    `amostrar_adaptativo`. Retorna uma lista de dicts com tipo, f0, Z, f1, f2, largura_banda e Q
+    (os três últimos ficam None quando a banda sai do intervalo analisado).
+    """
+    circuito = _compilar(componentes)
+    if freqs is None:
+        freqs, Z = amostrar_adaptativo(circuito, freq_min, freq_max)
+    X = Z.imag
+    finitos = np.isfinite(X)
+    trocas = np.flatnonzero(finitos[:-1] & finitos[1:] & (np.sign(X[:-1]) * np.sign(X[1:]) < 0))
+    if not trocas.size:
+        return []
+    f0 = _bissecao(circuito, freqs[trocas], freqs[trocas + 1], np.imag)
+    Z0 = _Z(circuito, f0)
+    subindo = X[trocas] < 0
+
+    ressonancias = []
+    for k, f in enumerate(f0):
+        # Meia potência: |Z| = √2·|Z0| na ressonância (corrente cai a 1/√2) e |Z0|/√2 na antirressonância
+        alvo = abs(Z0[k]) * (np.sqrt(2) if subindo[k] else 1 / np.sqrt(2))
+        limite_baixo = f0[k - 1] if k > 0 else freq_min
+        limite_alto = f0[k + 1] if k + 1 < len(f0) else freq_max
+        bordas = []
+        for extremo in (limite_baixo, limite_alto):
+            if not (np.abs(_Z(circuito, [extremo]))[0] - alvo) * (abs(Z0[k]) - alvo) < 0:
+                bordas.append(None)
+                continue
+            bordas.append(float(_bissecao(circuito, np.array([f]), np.array([extremo]), lambda z: np.abs(z) - alvo)[0]))
+        f1, f2 = bordas
+        largura = f2 - f1 if f1 is not None and f2 is not None else None
+        ressonancias.append({
+            'tipo': 'ressonância' if subindo[k] else 'antirressonância',
+            'f0': float(f), 'Z': complex(Z0[k]), 'f1': f1, 'f2': f2,
+            'largura_banda': largura, 'Q': float(f / largura) if largura else None,
+        })
+    return ressonancias
@@ -0,0 +1,63 @@
+import math
+
+# --- FUNÇÕES DE CÁLCULO E AUXILIARES ---
+
+FATORES_UNIDADE = {'Resistor (R)': {'Ω': 1, 'kΩ': 1e3, 'MΩ': 1e6}, 'Indutor (L)': {'H': 1, 'mH': 1e-3, 'µH': 1e-6}, 'Capacitor (C)': {'F': 1, 'mF': 1e-3, 'µF': 1e-6, 'nF': 1e-9, 'pF': 1e-12}}
+
+def converter_valor(valor, unidade_origem, unidade_destino, tipo):
+    valor_base = valor * FATORES_UNIDADE[tipo][unidade_origem]
+    return valor_base / FATORES_UNIDADE[tipo][unidade_destino]
+
+def get_impedancia_componente(comp, frequencia):
+    if comp.get('valor', 0) == 0: return complex(0, 0)
+    
+    if comp['tipo'] == 'Resistor (R)': unidade_base = 'Ω'
+    elif comp['tipo'] == 'Indutor (L)': unidade_base = 'H'
+    else: unidade_base = 'F'
+    valor_base = converter_valor(comp['valor'], comp['unidade'], unidade_base, comp['tipo'])
+    
+    if comp['tipo'] == 'Resistor (R)': return complex(valor_base, 0)
+    elif comp['tipo'] == 'Indutor (L)':
+        if frequencia == 0: return complex(0, 0)
+        return complex(0, 2 * math.pi * frequencia * valor_base)
+    elif comp['tipo'] == 'Capacitor (C)':
+        if valor_base == 0 or frequencia == 0: return complex(0, float('inf'))
+        return complex(0, -1 / (2 * math.pi * frequencia * valor_base))
+    return complex(0, 0)
+
+def compilar_blocos(componentes):
+    """Agrupa a lista de componentes em blocos série/paralelo: [('serie'|'paralelo', [indices]), ...]."""
+    blocos = []
+    i = 0
+    while i < len(componentes):
+        if componentes[i]['conexao'] in ['SÉRIE', 'PRIMEIRO']:
+            blocos.append(('serie', [i]))
+            i += 1
+        else:
+            # O grupo paralelo absorve o bloco série imediatamente anterior
+            indices_grupo = blocos.pop()[1] if blocos else []
+            while i < len(componentes) and componentes[i]['conexao'] == 'PARALELO':
+                indices_grupo.append(i)
+                i += 1
+            blocos.append(('paralelo', indices_grupo))
+    return blocos
+
+def analisar_circuito_detalhadamente(componentes, frequencia, V_fonte):
+    """Retorna (Z_total, I_total, componentes_analisados): cópias dos componentes com 'tensao' e 'corrente'.
+    O cálculo é o do núcleo compilado (CircuitoCompilado.analisar), o mesmo da varredura e do app."""
+    if not componentes:
+        return complex(0, 0), complex(0, 0), []
+
+    from .compilado import CircuitoCompilado  # compilado importa este módulo
+    Z_total, I_total, tensoes, correntes = CircuitoCompilado(componentes).analisar(frequencia, V_fonte)
+    componentes_analisados = [dict(c, tensao=V, corrente=I) for c, V, I in zip(componentes, tensoes.tolist(), correntes.tolist())]
+    return Z_total, I_total, componentes_analisados
+
+def calcular_potencias(V, I_complexa):
+    """Potências (P, Q, S) entregues por uma fonte V (real ou fasor complexo) com corrente I."""
+    S_complexa = V * I_complexa.conjugate()
+    return S_complexa.real, S_complexa.imag, abs(S_complexa)
+
+def fator_de_potencia(P, S):
+    """FP = P/S; sem potência aparente (circuito aberto ou fonte nula) o circuito é tratado como resistivo."""
+    return P / S if S > 1e-9 else 1.0
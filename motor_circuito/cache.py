@@ -0,0 +1,122 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# --- CACHE DE RESULTADOS ---
+
+def impressao_digital(componentes, *extras):
+    """Hash estável da lista de componentes (tipo, valor, unidade, conexão) mais parâmetros extras.
+
+    Dois circuitos com a mesma impressão digital produzem exatamente a mesma análise, então ela
+    serve como chave de cache. Os ids não entram: só afetam os rótulos, não os valores.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for comp in componentes:
+        h.update(f"{comp['tipo']}|{comp.get('valor', 0)!r}|{comp['unidade']}|{comp['conexao']};".encode())
+    for extra in extras:
+        h.update(f"#{extra!r}".encode())
+    return h.hexdigest()
+
+# Listas maiores que isso são estimadas pelos primeiros elementos (ex.: os pontos de uma varredura)
+ELEMENTOS_AMOSTRADOS = 16
+
+def tamanho_aproximado(valor):
+    """Bytes ocupados por um valor em cache: arrays NumPy, textos e bytes, e contêineres deles.
+    Listas longas são tratadas como homogêneas, para que medir não custe tanto quanto copiar."""
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (str, bytes, bytearray)):
+        return len(valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(k) + tamanho_aproximado(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        amostra = valor[:ELEMENTOS_AMOSTRADOS]
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(v) for v in amostra) * len(valor) // max(len(amostra), 1)
+    return sys.getsizeof(valor)
+
+class CacheLRU:
+    """Cache LRU limitado por número de itens e, com `max_bytes`, pelo tamanho aproximado dos valores
+    (`tamanho_aproximado`), com contadores de acertos/falhas. Um valor maior que `max_bytes` sozinho
+    é devolvido normalmente, mas não fica guardado.
+
+    `ao_remover` é chamado com cada valor descartado (ex.: para fechar figuras do matplotlib).
+    É seguro para uso entre as threads das sessões do Streamlit.
+    """
+
+    def __init__(self, max_itens=128, ao_remover=None, max_bytes=None):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self.ao_remover = ao_remover
+        self.acertos = 0
+        self.falhas = 0
+        self.bytes = 0
+        self._itens = OrderedDict()
+        self._tamanhos = {}
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def obter(self, chave, calcular):
+        """Retorna o valor em cache para `chave` ou calcula com `calcular()` e guarda."""
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.falhas += 1
+        valor = calcular()
+        self.guardar(chave, valor)
+        return valor
+
+    def buscar(self, chave):
+        """Como `obter`, mas sem calcular: (True, valor) num acerto e (False, None) numa falha.
+        Para quem calcula em outro lugar (ex.: num pool de processos) e depois chama `guardar`."""
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return True, self._itens[chave]
+            self.falhas += 1
+            return False, None
+
+    def guardar(self, chave, valor):
+        tamanho = tamanho_aproximado(valor) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and tamanho > self.max_bytes:
+            return
+        with self._trava:
+            self.bytes += tamanho - self._tamanhos.get(chave, 0)
+            self._itens[chave] = valor
+            self._tamanhos[chave] = tamanho
+            self._itens.move_to_end(chave)
+            removidos = []
+            while len(self._itens) > self.max_itens or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                antiga, removido = self._itens.popitem(last=False)
+                self.bytes -= self._tamanhos.pop(antiga)
+                removidos.append(removido)
+        if self.ao_remover:
+            for removido in removidos:
+                self.ao_remover(removido)
+
+    def limpar(self):
+        with self._trava:
+            removidos = list(self._itens.values())
+            self._itens.clear()
+            self._tamanhos.clear()
+            self.bytes = 0
+        if self.ao_remover:
+            for removido in removidos:
+                self.ao_remover(removido)
+
+    def estatisticas(self):
+        total = self.acertos + self.falhas
+        return {'itens': len(self._itens), 'max_itens': self.max_itens, 'bytes': self.bytes, 'max_bytes': self.max_bytes, 'acertos': self.acertos, 'falhas': self.falhas, 'taxa_acerto': self.acertos / total if total else 0.0}
+
+# Escopo global: compartilhado por todas as sessões do processo (só resultados numéricos, imutáveis)
+CACHE_GLOBAL = CacheLRU(max_itens=256)
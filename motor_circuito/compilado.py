@@ -0,0 +1,129 @@
+import numpy as np
+
+from .analise import FATORES_UNIDADE, compilar_blocos
+
+# --- CIRCUITO COMPILADO ---
+
+TIPO_R, TIPO_L, TIPO_C = 0, 1, 2
+CODIGOS_TIPO = {'Resistor (R)': TIPO_R, 'Indutor (L)': TIPO_L, 'Capacitor (C)': TIPO_C}
+
+class CircuitoCompilado:
+    """Forma compacta da lista de componentes: vetores NumPy paralelos com valores em unidades SI,
+    códigos de tipo e a estrutura de blocos série/paralelo. É montada uma vez e reutilizada
+    pela análise, pela varredura, pela tabela e pelo desenho."""
+
+    __slots__ = ('ids', 'tipos', 'valores_base', 'bloco_de', 'inicio_blocos', 'bloco_paralelo')
+
+    def __init__(self, componentes):
+        n = len(componentes)
+        self.ids = np.fromiter((c['id'] for c in componentes), dtype=np.int64, count=n)
+        self.tipos = np.fromiter((CODIGOS_TIPO[c['tipo']] for c in componentes), dtype=np.int8, count=n)
+        self.valores_base = np.fromiter((c.get('valor', 0) * FATORES_UNIDADE[c['tipo']][c['unidade']] for c in componentes), dtype=float, count=n)
+
+        # Os blocos são sempre faixas contíguas da lista, então basta guardar onde cada um começa
+        blocos = compilar_blocos(componentes)
+        self.inicio_blocos = np.array([indices[0] for _, indices in blocos], dtype=np.intp)
+        self.bloco_paralelo = np.array([tipo == 'paralelo' for tipo, _ in blocos], dtype=bool)
+        self.bloco_de = np.repeat(np.arange(len(blocos), dtype=np.intp), [len(indices) for _, indices in blocos])
+
+    def __len__(self):
+        return self.ids.size
+
+    @property
+    def n_blocos(self):
+        return self.inicio_blocos.size
+
+    def blocos(self):
+        """Gera ('serie'|'paralelo', indices) para cada bloco, na ordem do circuito."""
+        fins = np.append(self.inicio_blocos[1:], len(self))
+        for inicio, fim, paralelo in zip(self.inicio_blocos, fins, self.bloco_paralelo):
+            yield ('paralelo' if paralelo else 'serie'), range(inicio, fim)
+
+    def _valores_por_tipo(self, freqs, valores_base, linhas):
+        omega = 2 * np.pi * np.atleast_1d(np.asarray(freqs, dtype=float))
+        valores = self.valores_base[:, None] if valores_base is None else valores_base
+        tipos = self.tipos
+        if linhas is not None:
+            valores, tipos = valores[linhas], tipos[linhas]
+        forma = np.broadcast_shapes(valores.shape, (tipos.size, omega.size))
+        return omega, valores, tipos, forma
+
+    def impedancias(self, freqs, valores_base=None, linhas=None):
+        """Matriz (n_componentes x n_freqs) com a impedância de cada componente em cada frequência.
+
+        `valores_base` (n_componentes x k) substitui os valores compilados, ex. por amostras de
+        Monte Carlo; as k colunas são combinadas com as frequências por broadcasting. `linhas`
+        restringe o cálculo a um subconjunto dos componentes.
+        """
+        omega, valores, tipos, forma = self._valores_por_tipo(freqs, valores_base, linhas)
+        Z = np.zeros(forma, dtype=complex)
+        with np.errstate(divide='ignore'):
+            R, L, C = (tipos == TIPO_R), (tipos == TIPO_L), (tipos == TIPO_C)
+            Z.real[R] = np.broadcast_to(valores[R], Z[R].shape)
+            Z.imag[L] = omega * valores[L]
+            wC = omega * valores[C]
+            Z.imag[C] = np.where(wC == 0, np.inf, -1 / wC)
+        # Valor nulo é tratado como curto-circuito, como em get_impedancia_componente
+        Z[np.broadcast_to(valores == 0, forma)] = 0
+        return Z
+
+    def admitancias(self, freqs, valores_base=None, linhas=None):
+        """Como `impedancias`, mas devolve Y = 1/Z, com Y = 0 onde Z = 0 (a regra da soma em paralelo)."""
+        omega, valores, tipos, forma = self._valores_por_tipo(freqs, valores_base, linhas)
+        Y = np.zeros(forma, dtype=complex)
+        with np.errstate(divide='ignore'):
+            R, L, C = (tipos == TIPO_R), (tipos == TIPO_L), (tipos == TIPO_C)
+            G = valores[R]
+            Y.real[R] = np.broadcast_to(np.where(G != 0, 1 / G, 0), Y[R].shape)
+            wL = omega * valores[L]
+            Y.imag[L] = np.where(wL != 0, -1 / wL, 0)
+            # Capacitor de valor nulo é curto (ignorado) e em f = 0 é aberto: nos dois casos jωC = 0
+            Y.imag[C] = omega * valores[C]
+        return Y
+
+    def varrer(self, freqs, V_fonte=1, valores_base=None, por_componente=True):
+        """Calcula Z_total, I_total e V/I de cada componente para todo o vetor de frequências de uma vez.
+
+        Retorna (Z_total, I_total, tensoes, correntes); os dois primeiros têm forma (n_freqs,)
+        e os dois últimos (n_componentes, n_freqs). Com `valores_base` (ver `impedancias`) o eixo das
+        frequências vira o eixo das colunas de valores; com `por_componente=False` tensoes e
+        correntes não são calculadas (None), o que economiza memória em lotes grandes.
+        """
+        freqs = np.atleast_1d(np.asarray(freqs, dtype=float))
+        if not len(self):
+            vazio = np.zeros(freqs.size, dtype=complex)
+            return vazio, vazio.copy(), np.zeros((0, freqs.size), dtype=complex), np.zeros((0, freqs.size), dtype=complex)
+
+        paralelo_de = self.bloco_paralelo[self.bloco_de]
+        linhas_paralelo = np.flatnonzero(paralelo_de)
+        colunas = freqs.size if valores_base is None else np.broadcast_shapes(valores_base.shape[1:], (freqs.size,))[0]
+        Z_blocos = np.empty((self.n_blocos, colunas), dtype=complex)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Passo 1: impedância de cada bloco e Z_total. Blocos série usam a impedância do seu único
+            # componente; paralelos somam admitâncias, ignorando ramos com Z = 0 (regra da análise escalar)
+            Z_blocos[~self.bloco_paralelo] = self.impedancias(freqs, valores_base, self.inicio_blocos[~self.bloco_paralelo])
+            if linhas_paralelo.size:
+                Y = self.admitancias(freqs, valores_base, linhas_paralelo)
+                inicios = np.searchsorted(linhas_paralelo, self.inicio_blocos[self.bloco_paralelo])
+                Y_blocos = np.add.reduceat(Y, inicios, axis=0)
+                Z_blocos[self.bloco_paralelo] = np.where(Y_blocos != 0, 1 / np.where(Y_blocos != 0, Y_blocos, 1), complex(np.inf))
+            Z_total = Z_blocos.sum(axis=0)
+            I_total = np.where(Z_total != 0, V_fonte / np.where(Z_total != 0, Z_total, 1), 0)
+            if not por_componente:
+                return Z_total, I_total, None, None
+
+            # Passo 2: V e I de cada componente; no paralelo I = V·Y, com corrente nula nos curtos
+            # (Z = 0: valor nulo ou indutor em f = 0), que a análise escalar também descarta
+            tensoes = I_total * Z_blocos[self.bloco_de]
+            correntes = np.empty_like(tensoes)
+            correntes[~paralelo_de] = I_total
+            if linhas_paralelo.size:
+                valores = (self.valores_base[:, None] if valores_base is None else valores_base)[linhas_paralelo]
+                curto = (valores == 0) | ((self.tipos[linhas_paralelo] == TIPO_L)[:, None] & (freqs == 0))
+                correntes[linhas_paralelo] = np.where(curto, 0, tensoes[linhas_paralelo] * Y)
+        return Z_total, I_total, tensoes, correntes
+
+    def analisar(self, frequencia, V_fonte):
+        """Análise em uma única frequência; retorna (Z_total, I_total, tensoes, correntes) com vetores por componente."""
+        Z_total, I_total, tensoes, correntes = self.varrer([frequencia], V_fonte)
+        return complex(Z_total[0]), complex(I_total[0]), tensoes[:, 0], correntes[:, 0]
@@ -0,0 +1,82 @@
+import numpy as np
+
+from .compilado import CODIGOS_TIPO, CircuitoCompilado
+
+# --- FORMAS DE ONDA NO TEMPO ---
+
+# Amostras por ciclo da maior frequência, quando a taxa de amostragem não é dada
+AMOSTRAS_POR_CICLO = 200
+# Elementos (amostras x sinais) gerados por bloco; limita a memória independentemente da duração
+ELEMENTOS_POR_BLOCO = 1_000_000
+# Letra de cada tipo nos nomes dos sinais, a mesma da lista de componentes e da tabela do app (R, I, C)
+LETRAS_TIPO = {codigo: nome[0] for nome, codigo in CODIGOS_TIPO.items()}
+
+def fasores_do_circuito(componentes, freqs, V_fonte):
+    """Fasores (RMS) da fonte e de cada componente, prontos para `formas_de_onda`.
+
+    `V_fonte` é um fasor por frequência (ex.: o 'V' de analisar_harmonicos) ou um único valor.
+    Retorna (nomes, fasores) com fasores de forma (n_sinais x n_freqs), na ordem v_fonte,
+    i_fonte e então v e i de cada componente ('v_R1', 'i_R1', ...), numerados pela posição na
+    lista (não pelo id, que muda com remoções e pode vir de outro circuito com a mesma impressão digital).
+    """
+    circuito = componentes if isinstance(componentes, CircuitoCompilado) else CircuitoCompilado(componentes)
+    freqs = np.atleast_1d(np.asarray(freqs, dtype=float))
+    V = np.broadcast_to(np.asarray(V_fonte, dtype=complex), freqs.shape)
+    _, I_total, tensoes, correntes = circuito.varrer(freqs, V)
+    rotulos = [f"{LETRAS_TIPO[tipo]}{k}" for k, tipo in enumerate(circuito.tipos.tolist(), 1)]
+    nomes = ['v_fonte', 'i_fonte'] + [f'{grandeza}_{rotulo}' for rotulo in rotulos for grandeza in ('v', 'i')]
+    fasores = np.empty((2 + 2 * len(circuito), freqs.size), dtype=complex)
+    fasores[0], fasores[1] = V, I_total
+    fasores[2::2], fasores[3::2] = tensoes, correntes
+    return nomes, fasores
+
+def amostragem(freqs, ciclos=1, taxa=None):
+    """(taxa em amostras/s, número de amostras) para `ciclos` ciclos da menor frequência."""
+    freqs = np.atleast_1d(np.asarray(freqs, dtype=float))
+    if (freqs <= 0).any():
+        raise ValueError("as formas de onda exigem frequências positivas")
+    taxa = AMOSTRAS_POR_CICLO * float(freqs.max()) if taxa is None else float(taxa)
+    return taxa, int(np.ceil(ciclos / freqs.min() * taxa))
+
+def formas_de_onda(fasores, freqs, ciclos=1, taxa=None, amostras_por_bloco=None):
+    """Gera (t, bloco) com os valores instantâneos x(t) = √2 · Σ Re(X_h · e^(j2πf_h·t)), em blocos.
+
+    `fasores` tem forma (n_sinais x n_freqs) e `bloco`, (n_amostras_do_bloco x n_sinais). Cada
+    bloco é calculado de uma vez por broadcasting e produto de matrizes, e só um bloco existe em
+    memória por vez, então capturas longas podem ser gravadas direto em disco.
+    """
+    fasores = np.atleast_2d(np.asarray(fasores, dtype=complex))
+    freqs = np.atleast_1d(np.asarray(freqs, dtype=float))
+    taxa, n_amostras = amostragem(freqs, ciclos, taxa)
+    if amostras_por_bloco is None:
+        amostras_por_bloco = max(1, ELEMENTOS_POR_BLOCO // max(fasores.shape[0], freqs.size))
+    reais, imaginarios = np.sqrt(2) * fasores.real.T, np.sqrt(2) * fasores.imag.T
+    omega = 2 * np.pi * freqs[:, None]
+    for inicio in range(0, n_amostras, amostras_por_bloco):
+        t = np.arange(inicio, min(inicio + amostras_por_bloco, n_amostras)) / taxa
+        fase = omega * t
+        yield t, np.cos(fase).T @ reais - np.sin(fase).T @ imaginarios
+
+def exportar_csv(arquivo, nomes, blocos):
+    """Grava os blocos de `formas_de_onda` como CSV (coluna t e uma por sinal), bloco a bloco."""
+    arquivo.write(','.join(['t', *nomes]) + '\n')
+    for t, bloco in blocos:
+        np.savetxt(arquivo, np.column_stack([t, bloco]), delimiter=',', fmt='%.9g')
+
+def exportar_npy(arquivo, fasores, freqs, ciclos=1, taxa=None, amostras_por_bloco=None):
+    """Grava as formas de onda num .npy (n_amostras x (1 + n_sinais), coluna 0 = t) bloco a bloco.
+
+    O cabeçalho é escrito antes, com a forma final, e os dados a seguir; o arquivo pode então ser
+    aberto sem carregá-lo com np.load(caminho, mmap_mode='r'). `arquivo` é um caminho ou um
+    arquivo binário aberto.
+    """
+    fasores = np.atleast_2d(np.asarray(fasores, dtype=complex))
+    _, n_amostras = amostragem(freqs, ciclos, taxa)
+    destino = open(arquivo, 'wb') if isinstance(arquivo, str) else arquivo
+    try:
+        np.lib.format.write_array_header_1_0(destino, {'descr': np.lib.format.dtype_to_descr(np.dtype(float)), 'fortran_order': False, 'shape': (n_amostras, 1 + fasores.shape[0])})
+        for t, bloco in formas_de_onda(fasores, freqs, ciclos, taxa, amostras_por_bloco):
+            destino.write(np.column_stack([t, bloco]).tobytes())
+    finally:
+        if destino is not arquivo:
+            destino.close()
@@ -0,0 +1,46 @@
+import numpy as np
+
+# --- FORMATAÇÃO DE NÚMEROS COMPLEXOS ---
+
+# Partes (e módulos) abaixo disso são tratadas como zero
+LIMIAR_ZERO = 1e-9
+
+def _aplicar(modelos, argumentos):
+    """Formata todas as linhas com uma única operação %: os modelos são unidos por '\\n' e os
+    argumentos (uma linha por valor) achatados numa tupla; o resultado é separado de volta."""
+    return ('\n'.join(modelos) % tuple(argumentos.ravel().tolist())).split('\n')
+
+def formatar_complexos(valores, unidade='', casas=2):
+    """Formata vários complexos de uma vez nas formas retangular e polar.
+
+    Retorna duas listas de strings, na ordem de `valores`, no formato de formatar_complexo. Partes
+    com módulo abaixo de LIMIAR_ZERO são omitidas e a fase de um módulo nulo é mostrada como 0°.
+    A escolha do formato de cada valor é vetorizada; a conversão em texto é feita por um único %
+    sobre todos os valores, sem uma chamada Python por número.
+    """
+    z = np.asarray(valores, dtype=complex).ravel()
+    if not z.size:
+        return [], []
+    real, imag = z.real, z.imag
+    sufixo = (f" {unidade}" if unidade else "").replace('%', '%%')
+    numero = f"%.{casas}f"
+
+    # Todo modelo consome (real, sinal, |imag|); '%.0s' descarta o argumento que não aparece
+    real_nulo, imag_nulo = np.abs(real) < LIMIAR_ZERO, np.abs(imag) < LIMIAR_ZERO
+    modelos = np.array([modelo + sufixo for modelo in (numero + ' %s j' + numero, numero + '%.0s%.0s', '%.0s%sj' + numero, numero % 0 + '%.0s%.0s%.0s')])
+    forma = np.where(real_nulo & imag_nulo, 3, np.where(imag_nulo, 1, np.where(real_nulo, 2, 0)))
+    sinal = np.where(imag >= 0, np.where(real_nulo, '', '+'), '-')
+    argumentos = np.empty((z.size, 3), dtype=object)
+    argumentos[:, 0], argumentos[:, 1], argumentos[:, 2] = real.tolist(), sinal.tolist(), np.abs(imag).tolist()
+    retangular = _aplicar(modelos[forma].tolist(), argumentos)
+
+    magnitude = np.abs(z)
+    with np.errstate(invalid='ignore'):
+        fase = np.where(magnitude < LIMIAR_ZERO, 0.0, np.degrees(np.angle(z)))
+    polar = _aplicar([numero + sufixo + ' ∠ %.2f°'] * z.size, np.column_stack([magnitude, fase]))
+    return retangular, polar
+
+def formatar_complexo(numero_complexo, unidade='', casas=2):
+    """Converte um número complexo para string em formato retangular e polar (ex.: '3.00 + j4.00 Ω', '5.00 Ω ∠ 53.13°')."""
+    retangular, polar = formatar_complexos([numero_complexo], unidade, casas)
+    return retangular[0], polar[0]
@@ -0,0 +1,78 @@
+import numpy as np
+
+from .compilado import CircuitoCompilado
+
+# --- ANÁLISE HARMÔNICA ---
+
+def espectro(ordens, magnitudes, fases=None):
+    """Fasores (RMS) de uma fonte distorcida: ordens harmônicas, magnitudes em V e fases em graus.
+
+    Retorna (ordens, V) ordenados pela ordem. A fundamental (ordem 1) é obrigatória, porque as
+    distorções são medidas em relação a ela; ordens repetidas ou não positivas são recusadas.
+    """
+    ordens = np.asarray(ordens, dtype=float).ravel()
+    magnitudes = np.asarray(magnitudes, dtype=float).ravel()
+    fases = np.zeros_like(magnitudes) if fases is None else np.asarray(fases, dtype=float).ravel()
+    if not (ordens.size == magnitudes.size == fases.size):
+        raise ValueError("ordens, magnitudes e fases devem ter o mesmo tamanho")
+    if (ordens <= 0).any():
+        raise ValueError("as ordens harmônicas devem ser positivas")
+    if np.unique(ordens).size != ordens.size:
+        raise ValueError("ordens harmônicas repetidas")
+    if not (ordens == 1).any():
+        raise ValueError("o espectro precisa da fundamental (ordem 1)")
+    ordem = np.argsort(ordens)
+    return ordens[ordem], (magnitudes * np.exp(1j * np.radians(fases)))[ordem]
+
+def _thd(fasores, fundamental):
+    """Distorção harmônica total: RMS das harmônicas acima da fundamental sobre a fundamental.
+
+    Sem fundamental (ex.: antirressonância na frequência da fonte) a THD não é definida: nan, e não 0,
+    que passaria por um sinal sem distorção.
+    """
+    referencia = np.abs(fasores[..., fundamental])
+    distorcao = np.sqrt(np.maximum(np.sum(np.abs(fasores) ** 2, axis=-1) - referencia ** 2, 0))
+    return np.divide(distorcao, referencia, out=np.full_like(referencia, np.nan), where=referencia > 1e-12)
+
+def analisar_harmonicos(componentes, frequencia_fundamental, ordens, magnitudes, fases=None, por_componente=True):
+    """Resolve todas as harmônicas da fonte numa única varredura do circuito compilado.
+
+    `componentes` pode ser a lista de componentes ou um CircuitoCompilado; o espectro é o de
+    `espectro`. Cada harmônica é uma frequência da varredura com o seu próprio fasor de fonte, e
+    as grandezas totais são combinadas por superposição:
+
+      V_rms, I_rms   raiz da soma dos quadrados das harmônicas
+      THD_V, THD_I   distorção harmônica total (fração da fundamental; nan sem fundamental)
+      P, Q           somas das potências de cada harmônica (Q no sentido de Budeanu)
+      S              V_rms · I_rms, que inclui a potência de distorção
+      FP             fator de potência verdadeiro, P / S
+      FP_deslocamento  P1 / S1, o fator de potência só da fundamental
+
+    Retorna um dict com esses escalares e os vetores por harmônica ('ordens', 'freqs', 'V',
+    'Z_total', 'I_total', 'P_h', 'Q_h'); com `por_componente`, também 'tensoes' e 'correntes'
+    (n_componentes x n_harmônicas) e os valores RMS de cada componente.
+    """
+    circuito = componentes if isinstance(componentes, CircuitoCompilado) else CircuitoCompilado(componentes)
+    ordens, V = espectro(ordens, magnitudes, fases)
+    freqs = ordens * frequencia_fundamental
+    fundamental = int(np.flatnonzero(ordens == 1)[0])
+
+    Z_total, I_total, tensoes, correntes = circuito.varrer(freqs, V, por_componente=por_componente)
+    S_h = V * I_total.conj()
+    V_rms, I_rms = np.sqrt(np.sum(np.abs(V) ** 2)), np.sqrt(np.sum(np.abs(I_total) ** 2))
+    P, Q, S = float(S_h.real.sum()), float(S_h.imag.sum()), float(V_rms * I_rms)
+    S1 = abs(S_h[fundamental])
+    resultado = {
+        'ordens': ordens, 'freqs': freqs, 'V': V, 'Z_total': Z_total, 'I_total': I_total,
+        'P_h': S_h.real, 'Q_h': S_h.imag,
+        'V_rms': float(V_rms), 'I_rms': float(I_rms),
+        'THD_V': float(_thd(V, fundamental)), 'THD_I': float(_thd(I_total, fundamental)),
+        'P': P, 'Q': Q, 'S': S,
+        'FP': P / S if S > 1e-9 else 1.0,
+        'FP_deslocamento': float(S_h.real[fundamental] / S1) if S1 > 1e-9 else 1.0,
+    }
+    if por_componente:
+        resultado.update({'tensoes': tensoes, 'correntes': correntes,
+                          'tensoes_rms': np.sqrt(np.sum(np.abs(tensoes) ** 2, axis=1)),
+                          'correntes_rms': np.sqrt(np.sum(np.abs(correntes) ** 2, axis=1))})
+    return resultado
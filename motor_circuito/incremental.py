@@ -0,0 +1,227 @@
+import cmath
+
+import numpy as np
+
+from .analise import compilar_blocos
+from .compilado import CircuitoCompilado
+
+# --- ANÁLISE INCREMENTAL ---
+
+# A cada tantas edições Z_total é somado de novo a partir dos blocos, para não acumular erro de arredondamento
+EDICOES_ENTRE_RESSINCRONIZACOES = 1000
+
+def _impedancias(componentes, frequencia):
+    """Impedância de cada componente pelo núcleo compilado, com as mesmas regras de curto e aberto da varredura."""
+    return CircuitoCompilado(componentes).impedancias([frequencia])[:, 0].tolist()
+
+class _Bloco:
+    # Os blocos formam uma lista duplamente encadeada: achar e trocar os vizinhos de um bloco é O(1)
+    __slots__ = ('paralelo', 'ids', 'Z', 'anterior', 'proximo')
+
+    def __init__(self, paralelo, ids):
+        self.paralelo = paralelo
+        self.ids = ids
+        self.Z = complex(0, 0)
+        self.anterior = self.proximo = None
+
+class AnaliseIncremental:
+    """Mantém a impedância de cada bloco série/paralelo e a soma Z_total em uma frequência fixa,
+    como a calculadora de linha de comando faz com `impedancia_total_equivalente`.
+
+    Adicionar, editar ou remover um componente recalcula só o bloco dele (e o vizinho anterior,
+    quando a conexão muda o agrupamento) e corrige Z_total pela diferença; o custo é proporcional
+    ao tamanho desses blocos, não ao do circuito. Os componentes são os
+    próprios dicts da lista do chamador; edições feitas neles devem ser avisadas com `atualizar`.
+    """
+
+    def __init__(self, componentes=(), frequencia=60.0):
+        self.reconstruir(componentes, frequencia)
+
+    def __len__(self):
+        return len(self._componentes)
+
+    def reconstruir(self, componentes, frequencia):
+        """Recalcula tudo do zero (O(n)); necessário quando a frequência muda."""
+        self.frequencia = frequencia
+        self.Z_total = complex(0, 0)
+        self._componentes = {c['id']: c for c in componentes}
+        self._conexao = {c['id']: c['conexao'] for c in componentes}
+        self._z = dict(zip(self._componentes, _impedancias(componentes, frequencia)))
+        self._primeiro = self._ultimo = None
+        self._bloco_de = {}
+        self._edicoes = 0
+        self._substituir_blocos([], list(componentes))
+
+    def adicionar(self, comp):
+        """Acrescenta um componente ao fim do circuito."""
+        self._componentes[comp['id']] = comp
+        self._conexao[comp['id']] = comp['conexao']
+        self._z[comp['id']] = _impedancias([comp], self.frequencia)[0]
+        if comp['conexao'] == 'PARALELO' and self._ultimo is not None:
+            bloco = self._ultimo
+            bloco.paralelo = True
+            bloco.ids.append(comp['id'])
+            self._bloco_de[comp['id']] = bloco
+            self._ajustar_Z_total([self._recalcular_bloco(bloco)], [bloco.Z])
+        else:
+            self._substituir_blocos([], [comp])
+
+    def atualizar(self, comp_id):
+        """Reprocessa um componente cujo dict foi alterado (tipo, valor, unidade ou conexão)."""
+        comp = self._componentes[comp_id]
+        self._z[comp_id] = _impedancias([comp], self.frequencia)[0]
+        if comp['conexao'] == self._conexao[comp_id]:
+            bloco = self._bloco_de[comp_id]
+            self._ajustar_Z_total([self._recalcular_bloco(bloco)], [bloco.Z])
+        else:
+            self._conexao[comp_id] = comp['conexao']
+            self._reagrupar(comp_id)
+
+    def remover(self, comp_id):
+        """Retira um componente do circuito."""
+        self._reagrupar(comp_id, remover=True)
+        del self._componentes[comp_id], self._conexao[comp_id], self._z[comp_id], self._bloco_de[comp_id]
+
+    def resultado(self, V_fonte):
+        """Retorna (Z_total, I_total, tensoes, correntes) na ordem do circuito, como CircuitoCompilado.analisar."""
+        Z_total = self.Z_total
+        I_total = V_fonte / Z_total if Z_total != 0 else complex(0, 0)
+        tensoes = np.empty(len(self), dtype=complex)
+        correntes = np.empty(len(self), dtype=complex)
+        k = 0
+        for bloco in self._iterar_blocos():
+            V_bloco = I_total * bloco.Z
+            for comp_id in bloco.ids:
+                tensoes[k] = V_bloco
+                if not bloco.paralelo:
+                    correntes[k] = I_total
+                else:
+                    Z_comp = self._z[comp_id]
+                    correntes[k] = V_bloco / Z_comp if Z_comp != 0 else complex(0, 0)
+                k += 1
+        return Z_total, I_total, tensoes, correntes
+
+    def _iterar_blocos(self):
+        bloco = self._primeiro
+        while bloco is not None:
+            yield bloco
+            bloco = bloco.proximo
+
+    def _recalcular_bloco(self, bloco):
+        """Atualiza bloco.Z e devolve o valor anterior."""
+        Z_anterior = bloco.Z
+        if not bloco.paralelo:
+            bloco.Z = self._z[bloco.ids[0]]
+        else:
+            # Ramos com Z = 0 são ignorados na soma de admitâncias (mesma regra da análise completa)
+            admitancia = sum(1 / self._z[i] for i in bloco.ids if self._z[i] != 0)
+            bloco.Z = 1 / admitancia if admitancia != 0 else complex(float('inf'))
+        return Z_anterior
+
+    def _reagrupar(self, comp_id, remover=False):
+        # Mudar a conexão ou remover um componente só afeta o agrupamento do bloco dele e do anterior
+        bloco = self._bloco_de[comp_id]
+        antigos = [bloco] if bloco.anterior is None else [bloco.anterior, bloco]
+        trecho = [self._componentes[i] for b in antigos for i in b.ids if not (remover and i == comp_id)]
+        self._substituir_blocos(antigos, trecho)
+
+    def _substituir_blocos(self, antigos, trecho):
+        """Troca os blocos consecutivos `antigos` pelos blocos de `trecho` (sem `antigos`, acrescenta no fim)."""
+        antes = antigos[0].anterior if antigos else self._ultimo
+        depois = antigos[-1].proximo if antigos else None
+        novos = []
+        for tipo, indices in compilar_blocos(trecho):
+            bloco = _Bloco(tipo == 'paralelo', [trecho[i]['id'] for i in indices])
+            for comp_id in bloco.ids:
+                self._bloco_de[comp_id] = bloco
+            self._recalcular_bloco(bloco)
+            novos.append(bloco)
+        anterior = antes
+        for bloco in novos:
+            bloco.anterior = anterior
+            if anterior is None:
+                self._primeiro = bloco
+            else:
+                anterior.proximo = bloco
+            anterior = bloco
+        if anterior is None:
+            self._primeiro = depois
+        else:
+            anterior.proximo = depois
+        if depois is None:
+            self._ultimo = anterior
+        else:
+            depois.anterior = anterior
+        self._ajustar_Z_total([b.Z for b in antigos], [b.Z for b in novos])
+
+    def _ajustar_Z_total(self, Z_antigos, Z_novos):
+        self._edicoes += 1
+        valores = [self.Z_total, *Z_antigos, *Z_novos]
+        if self._edicoes < EDICOES_ENTRE_RESSINCRONIZACOES and all(cmath.isfinite(z) for z in valores):
+            self.Z_total += sum(Z_novos, complex(0, 0)) - sum(Z_antigos, complex(0, 0))
+        else:
+            # Blocos abertos (Z infinito) não podem ser descontados da soma: refaz a partir dos blocos
+            self._edicoes = 0
+            self.Z_total = sum((b.Z for b in self._iterar_blocos()), complex(0, 0))
+
+
+def _vezes(I, Z):
+    # Corrente nula em um trecho aberto (Z infinito) não produz tensão, em vez de nan
+    return I * Z if I != 0 else complex(0, 0)
+
+class EquivalenteAcumulado:
+    """Impedância equivalente montada como na calculadora de linha de comando: cada componente entra em
+    série ou em paralelo com tudo o que já foi montado, e não só com o componente anterior como em
+    AnaliseIncremental. Assim (R + L) || C é um circuito válido.
+
+    Adicionar um componente é O(1); `resultado` distribui tensões e correntes voltando pelas etapas.
+    """
+
+    def __init__(self, componentes=(), frequencia=60.0):
+        self.frequencia = frequencia
+        self.Z_total = complex(0, 0)
+        self._componentes, self._z, self._Z_etapas = [], [], []
+        for comp in componentes:
+            self.adicionar(comp)
+
+    def __len__(self):
+        return len(self._componentes)
+
+    def adicionar(self, comp):
+        """Acrescenta um componente em série ou em paralelo (comp['conexao']) com o equivalente atual."""
+        z = _impedancias([comp], self.frequencia)[0]
+        if not self._componentes:
+            Z = z
+        elif comp['conexao'] == 'PARALELO':
+            # Um curto em qualquer lado curto-circuita o par; admitâncias que se anulam (ressonância) abrem
+            admitancia = 1 / self.Z_total + 1 / z if self.Z_total != 0 and z != 0 else None
+            Z = complex(0, 0) if admitancia is None else 1 / admitancia if admitancia != 0 else complex(float('inf'))
+        else:
+            Z = self.Z_total + z
+        self._componentes.append(comp)
+        self._z.append(z)
+        self._Z_etapas.append(Z)
+        self.Z_total = Z
+
+    def resultado(self, V_fonte):
+        """Retorna (Z_total, I_total, tensoes, correntes) na ordem em que os componentes foram adicionados."""
+        Z_total = self.Z_total
+        I_total = V_fonte / Z_total if Z_total != 0 and not cmath.isinf(Z_total) else complex(0, 0)
+        tensoes = np.empty(len(self), dtype=complex)
+        correntes = np.empty(len(self), dtype=complex)
+        # V e I são a tensão e a corrente da etapa k (o equivalente dos componentes 0..k)
+        V, I = (V_fonte if Z_total != 0 else complex(0, 0)), I_total
+        for k in range(len(self) - 1, 0, -1):
+            z, Z_antes = self._z[k], self._Z_etapas[k - 1]
+            if self._componentes[k]['conexao'] == 'PARALELO':
+                tensoes[k] = V
+                # Um ramo em curto leva toda a corrente da etapa
+                correntes[k] = I if z == 0 else V / z if not cmath.isinf(z) else complex(0, 0)
+                I -= correntes[k]
+            else:
+                correntes[k] = I
+                tensoes[k] = V - _vezes(I, Z_antes) if cmath.isinf(z) else _vezes(I, z)
+                V -= tensoes[k]
+        if len(self):
+            tensoes[0], correntes[0] = V, I
+        return Z_total, I_total, tensoes, correntes
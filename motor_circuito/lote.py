@@ -0,0 +1,203 @@
+"""Análise em lote, sem interface: lê circuitos de JSON Lines ou CSV e grava os resultados no mesmo formato.
+
+Uso:
+    python -m motor_circuito.lote circuitos.jsonl -o resultados.jsonl
+    python -m motor_circuito.lote circuitos.csv -o resultados.csv --processos 8
+
+JSON Lines: uma linha por circuito, ex.
+    {"id": "c1", "frequencia": 60, "tensao": 120, "componentes": [{"tipo": "Resistor (R)", "valor": 100, "unidade": "Ω", "conexao": "PRIMEIRO"}, ...]}
+Um circuito pode pedir também uma varredura de frequência, com "varredura": {"freq_min": 1, "freq_max": 1e5,
+"pontos": 200, "escala": "log"} (ou "linear") ou com a lista explícita {"freqs": [...]}.
+
+Valores não finitos (ex.: Z infinito de um bloco aberto, tensões indeterminadas) saem no JSON como null,
+para que a saída seja JSON estrito.
+
+CSV: uma linha por componente, com as colunas circuito, frequencia, tensao, tipo, valor, unidade e conexao;
+as linhas consecutivas com o mesmo `circuito` formam um circuito.
+"""
+import argparse
+import cmath
+import csv
+import json
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+
+import numpy as np
+
+from .analise import calcular_potencias, fator_de_potencia
+from .compilado import CircuitoCompilado
+
+# --- ANÁLISE EM LOTE ---
+
+COLUNAS_CSV_SAIDA = ['id', 'Z_real', 'Z_imag', 'Z_mag', 'Z_fase', 'I_real', 'I_imag', 'I_mag', 'I_fase', 'P', 'Q', 'S', 'FP', 'erro']
+MAX_PONTOS_VARREDURA = 100_000
+
+def frequencias_varredura(varredura):
+    """Vetor de frequências de um pedido de varredura ({'freqs': [...]} ou freq_min/freq_max/pontos/escala)."""
+    if 'freqs' in varredura:
+        freqs = np.asarray(varredura['freqs'], dtype=float).ravel()
+    else:
+        freq_min, freq_max = float(varredura['freq_min']), float(varredura['freq_max'])
+        pontos = int(varredura.get('pontos', 200))
+        if pontos > MAX_PONTOS_VARREDURA:
+            raise ValueError(f"varredura com mais de {MAX_PONTOS_VARREDURA} pontos")
+        if varredura.get('escala', 'log') == 'log':
+            if freq_min <= 0:
+                raise ValueError("varredura logarítmica exige freq_min > 0")
+            freqs = np.logspace(np.log10(freq_min), np.log10(freq_max), pontos)
+        else:
+            freqs = np.linspace(freq_min, freq_max, pontos)
+    if freqs.size > MAX_PONTOS_VARREDURA:
+        raise ValueError(f"varredura com mais de {MAX_PONTOS_VARREDURA} pontos")
+    return freqs
+
+def _pares(z):
+    return np.column_stack([z.real, z.imag]).tolist()
+
+def analisar_registro(registro):
+    """Analisa um circuito {'id', 'componentes', 'frequencia', 'tensao'} e devolve um dict serializável.
+
+    `registro` também pode ser uma linha JSON ainda não lida (como vem de `ler_jsonl`). Um registro
+    malformado não interrompe o lote: vira {'id', 'erro'}.
+    """
+    if isinstance(registro, str):
+        try:
+            registro = json.loads(registro)
+        except ValueError as e:
+            return {'id': None, 'erro': f"{type(e).__name__}: {e}"}
+    if not isinstance(registro, dict):
+        return {'id': None, 'erro': "TypeError: cada circuito deve ser um objeto"}
+    try:
+        if not isinstance(registro['componentes'], list) or not all(isinstance(c, dict) for c in registro['componentes']):
+            raise TypeError("'componentes' deve ser uma lista de objetos")
+        # O valor é convertido aqui (no CSV ele chega como texto), dentro do tratamento de erros do registro
+        componentes = [dict(c, id=c.get('id', k), valor=float(c.get('valor', 0))) for k, c in enumerate(registro['componentes'])]
+        frequencia = float(registro.get('frequencia', 60.0))
+        V_fonte = float(registro.get('tensao', 120.0))
+        circuito = CircuitoCompilado(componentes)
+        Z_total, I_total, tensoes, correntes = circuito.analisar(frequencia, V_fonte)
+        if registro.get('varredura'):
+            freqs = frequencias_varredura(registro['varredura'])
+            Z_varredura, I_varredura, _, _ = circuito.varrer(freqs, V_fonte, por_componente=False)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        return {'id': registro.get('id'), 'erro': f"{type(e).__name__}: {e}"}
+    P, Q, S = calcular_potencias(V_fonte, I_total)
+    resultado = {
+        'id': registro.get('id'),
+        'Z_total': [Z_total.real, Z_total.imag],
+        'I_total': [I_total.real, I_total.imag],
+        'P': P, 'Q': Q, 'S': S,
+        'FP': fator_de_potencia(P, S),
+        'componentes': [{'tensao': [v.real, v.imag], 'corrente': [i.real, i.imag]} for v, i in zip(tensoes.tolist(), correntes.tolist())],
+    }
+    if registro.get('varredura'):
+        resultado['varredura'] = {'freqs': freqs.tolist(), 'Z_total': _pares(Z_varredura), 'I_total': _pares(I_varredura)}
+    return resultado
+
+def json_estrito(objeto):
+    """Cópia de um resultado com inf/nan trocados por None: json.dumps escreveria Infinity e NaN, que não são JSON."""
+    if isinstance(objeto, float):
+        return objeto if math.isfinite(objeto) else None
+    if isinstance(objeto, dict):
+        return {chave: json_estrito(valor) for chave, valor in objeto.items()}
+    if isinstance(objeto, (list, tuple)):
+        return [json_estrito(valor) for valor in objeto]
+    return objeto
+
+def _analisar_pedaco(registros):
+    return [analisar_registro(r) for r in registros]
+
+def analisar_lote(registros, processos=None, tamanho_pedaco=256, max_pendentes=None):
+    """Gera os resultados de `registros` (qualquer iterável, consumido aos poucos) na ordem de entrada.
+
+    O trabalho é dividido em pedaços de `tamanho_pedaco` circuitos distribuídos num pool de processos;
+    no máximo `max_pendentes` pedaços ficam em andamento, o que limita a memória usada mesmo com
+    entradas de centenas de milhares de circuitos. Com `processos=1` tudo roda no processo atual.
+    """
+    registros = iter(registros)
+    pedacos = iter(lambda: list(islice(registros, tamanho_pedaco)), [])
+    if processos == 1:
+        for pedaco in pedacos:
+            yield from _analisar_pedaco(pedaco)
+        return
+    processos = processos or os.cpu_count() or 1
+    max_pendentes = max_pendentes or 2 * processos
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        pendentes = deque()
+        for pedaco in pedacos:
+            pendentes.append(pool.submit(_analisar_pedaco, pedaco))
+            if len(pendentes) >= max_pendentes:
+                yield from pendentes.popleft().result()
+        while pendentes:
+            yield from pendentes.popleft().result()
+
+# --- LEITURA E ESCRITA ---
+
+def ler_jsonl(arquivo):
+    """Linhas não vazias, ainda como texto: a leitura do JSON fica com `analisar_registro`, para que
+    uma linha inválida vire um registro de erro em vez de interromper o lote."""
+    for linha in arquivo:
+        if linha.strip():
+            yield linha
+
+def ler_csv(arquivo):
+    for circuito, linhas in groupby(csv.DictReader(arquivo), key=lambda linha: linha['circuito']):
+        linhas = list(linhas)
+        yield {
+            'id': circuito,
+            'frequencia': linhas[0].get('frequencia') or 60.0,
+            'tensao': linhas[0].get('tensao') or 120.0,
+            # valor fica como texto; `analisar_registro` converte (e acusa o erro só deste circuito)
+            'componentes': [{'tipo': l['tipo'], 'valor': l['valor'], 'unidade': l['unidade'], 'conexao': l['conexao']} for l in linhas],
+        }
+
+def escrever_jsonl(resultados, arquivo):
+    for resultado in resultados:
+        arquivo.write(json.dumps(json_estrito(resultado), ensure_ascii=False, allow_nan=False) + '\n')
+
+def _graus(z):
+    return math.degrees(cmath.phase(z))
+
+def escrever_csv(resultados, arquivo):
+    escritor = csv.DictWriter(arquivo, fieldnames=COLUNAS_CSV_SAIDA)
+    escritor.writeheader()
+    for r in resultados:
+        if 'erro' in r:
+            escritor.writerow({'id': r['id'], 'erro': r['erro']})
+            continue
+        Z, I = complex(*r['Z_total']), complex(*r['I_total'])
+        escritor.writerow({'id': r['id'], 'Z_real': Z.real, 'Z_imag': Z.imag, 'Z_mag': abs(Z), 'Z_fase': _graus(Z), 'I_real': I.real, 'I_imag': I.imag, 'I_mag': abs(I), 'I_fase': _graus(I), 'P': r['P'], 'Q': r['Q'], 'S': r['S'], 'FP': r['FP']})
+
+def _formato(caminho, formato):
+    if formato:
+        return formato
+    return 'csv' if caminho and caminho.lower().endswith('.csv') else 'jsonl'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m motor_circuito.lote', description="Analisa circuitos CA em lote (JSON Lines ou CSV).")
+    parser.add_argument('entrada', help="arquivo de entrada ('-' para a entrada padrão)")
+    parser.add_argument('-o', '--saida', default='-', help="arquivo de saída ('-' para a saída padrão)")
+    parser.add_argument('--formato-entrada', choices=['jsonl', 'csv'])
+    parser.add_argument('--formato-saida', choices=['jsonl', 'csv'])
+    parser.add_argument('--processos', type=int, default=None, help="processos do pool (padrão: número de CPUs; 1 = sem pool)")
+    parser.add_argument('--tamanho-pedaco', type=int, default=256, help="circuitos por tarefa enviada ao pool")
+    args = parser.parse_args(argv)
+
+    formato_entrada = _formato(args.entrada, args.formato_entrada)
+    formato_saida = _formato(args.saida, args.formato_saida or (formato_entrada if args.saida == '-' else None))
+    entrada = sys.stdin if args.entrada == '-' else open(args.entrada, encoding='utf-8', newline='')
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8', newline='')
+    try:
+        registros = ler_csv(entrada) if formato_entrada == 'csv' else ler_jsonl(entrada)
+        resultados = analisar_lote(registros, processos=args.processos, tamanho_pedaco=args.tamanho_pedaco)
+        (escrever_csv if formato_saida == 'csv' else escrever_jsonl)(resultados, saida)
+    finally:
+        if entrada is not sys.stdin: entrada.close()
+        if saida is not sys.stdout: saida.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+
+from .compilado import CircuitoCompilado
+
+# --- ANÁLISE DE TOLERÂNCIAS (MONTE CARLO) ---
+
+# Elementos (amostras x componentes) avaliados por vez; limita a memória dos temporários complexos
+ELEMENTOS_POR_LOTE = 2_000_000
+
+DISTRIBUICOES = ('uniforme', 'normal')
+
+def sortear_valores(circuito, n_amostras, tolerancias, normais, rng):
+    """Sorteia (n_componentes x n_amostras) valores em unidades SI em torno dos nominais.
+
+    `tolerancias` é a fração ±t de cada componente. Na distribuição uniforme o valor cai em
+    [1 - t, 1 + t] x nominal; na normal, ±t corresponde a 3 desvios-padrão (99,7% das peças).
+    """
+    desvios = rng.uniform(-1.0, 1.0, size=(len(circuito), n_amostras))
+    if normais.any():
+        desvios[normais] = rng.standard_normal(size=(int(normais.sum()), n_amostras)) / 3
+    # Valores negativos não têm sentido físico; caudas extremas da normal são cortadas em zero
+    return np.maximum(circuito.valores_base[:, None] * (1 + tolerancias[:, None] * desvios), 0)
+
+def monte_carlo(componentes, frequencia, V_fonte, n_amostras=10_000, tolerancia_padrao=5.0, distribuicao_padrao='uniforme', semente=None, circuito=None):
+    """Avalia `n_amostras` variações do circuito com valores sorteados dentro das tolerâncias.
+
+    Cada componente pode trazer 'tolerancia' (em %) e 'distribuicao' ('uniforme' ou 'normal');
+    os que não trazem usam os valores padrão. As amostras são avaliadas em lotes vetorizados
+    (amostras x componentes) pelo circuito compilado, que pode ser passado já pronto em
+    `circuito`. Retorna um dict de vetores com Z_total, I_total, P, Q, S e FP, um por amostra.
+    """
+    if circuito is None:
+        circuito = CircuitoCompilado(componentes)
+    tolerancias = np.array([c.get('tolerancia', tolerancia_padrao) for c in componentes], dtype=float) / 100
+    normais = np.array([c.get('distribuicao', distribuicao_padrao) == 'normal' for c in componentes], dtype=bool)
+    rng = np.random.default_rng(semente)
+
+    Z_total = np.empty(n_amostras, dtype=complex)
+    I_total = np.empty(n_amostras, dtype=complex)
+    por_lote = max(1, ELEMENTOS_POR_LOTE // max(len(circuito), 1))
+    for inicio in range(0, n_amostras, por_lote):
+        fim = min(inicio + por_lote, n_amostras)
+        valores = sortear_valores(circuito, fim - inicio, tolerancias, normais, rng)
+        Z_total[inicio:fim], I_total[inicio:fim], _, _ = circuito.varrer(frequencia, V_fonte, valores_base=valores, por_componente=False)
+
+    S_complexa = V_fonte * I_total.conj()
+    P, Q, S = S_complexa.real, S_complexa.imag, np.abs(S_complexa)
+    FP = np.divide(P, S, out=np.ones_like(P), where=S > 1e-9)
+    return {'Z_total': Z_total, 'I_total': I_total, 'P': P, 'Q': Q, 'S': S, 'FP': FP}
+
+def percentis(amostras, qs=(1, 5, 50, 95, 99)):
+    """Resumo estatístico de um vetor de amostras: média, desvio-padrão, mínimo, máximo e percentis."""
+    amostras = np.asarray(amostras)
+    resumo = {'media': float(amostras.mean()), 'desvio': float(amostras.std()), 'min': float(amostras.min()), 'max': float(amostras.max())}
+    resumo.update({f'p{q}': float(v) for q, v in zip(qs, np.percentile(amostras, qs))})
+    return resumo
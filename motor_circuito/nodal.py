@@ -0,0 +1,218 @@
+import numpy as np
+
+from .analise import FATORES_UNIDADE, compilar_blocos
+
+sp = spla = None
+_scipy_verificado = False
+
+def _carregar_scipy():
+    """Importa o scipy na primeira montagem de um solver, para não pesar no import do pacote.
+    scipy é opcional: sem ele o sistema é resolvido de forma densa."""
+    global sp, spla, _scipy_verificado
+    if _scipy_verificado:
+        return
+    _scipy_verificado = True
+    try:
+        import scipy.sparse as sp
+        import scipy.sparse.linalg as spla
+    except ImportError:
+        sp = spla = None
+
+# --- ANÁLISE NODAL MODIFICADA (MNA) ---
+
+# Um netlist é uma lista de ramos (tipo, no_a, no_b, valor), com tipo 'R', 'L', 'C' ou 'V' (fonte de
+# tensão, de no_a (+) para no_b (-)). Valores em unidades SI; o nó 0 é a referência (terra).
+TIPOS_NETLIST = {'Resistor (R)': 'R', 'Indutor (L)': 'L', 'Capacitor (C)': 'C'}
+
+def netlist_de_componentes(componentes, V_fonte=1):
+    """Converte a lista SÉRIE/PARALELO em netlist: a fonte entre os nós 1 e 0 e cada bloco entre
+    dois nós consecutivos da cadeia, com o último bloco fechando no nó 0."""
+    netlist = [('V', 1, 0, V_fonte)]
+    blocos = compilar_blocos(componentes)
+    for b, (_, indices) in enumerate(blocos):
+        no_a, no_b = b + 1, (b + 2 if b + 1 < len(blocos) else 0)
+        for i in indices:
+            comp = componentes[i]
+            valor_base = comp.get('valor', 0) * FATORES_UNIDADE[comp['tipo']][comp['unidade']]
+            netlist.append((TIPOS_NETLIST[comp['tipo']], no_a, no_b, valor_base))
+    return netlist
+
+class SolverNodal:
+    """Monta a matriz MNA esparsa de um netlist uma única vez e a resolve em várias frequências.
+
+    R e C entram como admitâncias; L, fontes de tensão e ramos de valor nulo (curtos, como em
+    get_impedancia_componente) ganham uma variável de corrente própria, o que mantém o sistema
+    bem definido em f = 0 enquanto todo nó tiver caminho de condução até a terra. Em f = 0 um
+    capacitor é aberto, e os nós ligados ao resto só por capacitores (ex.: entre dois capacitores
+    em série) ficam flutuando: a matriz é singular, e esses nós saem do sistema, com tensão nan
+    (indeterminada) e corrente nula nos ramos que os ligam, o mesmo circuito aberto do núcleo
+    compilado. O padrão de esparsidade e a ordenação de colunas que reduz o preenchimento são
+    calculados na primeira fatoração e reaproveitados nas demais frequências.
+    """
+
+    def __init__(self, netlist):
+        _carregar_scipy()
+        self.netlist = list(netlist)
+        nos = sorted({no for _, a, b, _ in self.netlist for no in (a, b) if no != 0}, key=str)
+        self.indice_no = {no: k for k, no in enumerate(nos)}
+        n_nos = len(nos)
+
+        linhas, colunas, constante, coef_jw = [], [], [], []
+        def estampar(i, j, valor=0.0, jw=0.0):
+            if i is not None and j is not None:
+                linhas.append(i); colunas.append(j); constante.append(valor); coef_jw.append(jw)
+
+        self.ramos_corrente = []   # ramo -> índice da variável de corrente (ou -1 para ramos admitância)
+        self.admitancia = np.zeros(len(self.netlist))
+        self.capacitancia = np.zeros(len(self.netlist))
+        self.fontes = []
+        n = n_nos
+        for r, (tipo, a, b, valor) in enumerate(self.netlist):
+            ia, ib = self.indice_no.get(a), self.indice_no.get(b)
+            if tipo in ('R', 'C') and valor != 0:
+                G, C = (1 / valor, 0.0) if tipo == 'R' else (0.0, valor)
+                self.admitancia[r], self.capacitancia[r] = G, C
+                for i, j, s in ((ia, ia, 1), (ib, ib, 1), (ia, ib, -1), (ib, ia, -1)):
+                    estampar(i, j, s * G, s * C)
+                self.ramos_corrente.append(-1)
+            else:
+                # V_a - V_b - Z(jω)·I = V (só fontes têm V ≠ 0); Z = jωL para indutores, 0 para curtos
+                m = n; n += 1
+                for i, j in ((ia, m), (m, ia)):
+                    estampar(i, j, 1.0)
+                for i, j in ((ib, m), (m, ib)):
+                    estampar(i, j, -1.0)
+                estampar(m, m, 0.0, -valor if tipo == 'L' else 0.0)
+                if tipo == 'V':
+                    self.fontes.append((r, m, valor))
+                self.ramos_corrente.append(m)
+        self.n_nos, self.n = n_nos, n
+        self.ramos_corrente = np.array(self.ramos_corrente, dtype=np.intp)
+
+        # Entradas repetidas são somadas; np.unique devolve as posições já em ordem de linha (CSR)
+        linear = np.array(linhas, dtype=np.int64) * n + np.array(colunas, dtype=np.int64)
+        posicoes, self._destino = np.unique(linear, return_inverse=True)
+        self._indices = (posicoes % n).astype(np.int32)
+        self._indptr = np.searchsorted(posicoes // n, np.arange(n + 1)).astype(np.int32)
+        self._constante = np.array(constante)
+        self._coef_jw = np.array(coef_jw)
+        self._nnz = posicoes.size
+        self._ordem_colunas = None
+
+    def matriz(self, frequencia):
+        """Matriz MNA complexa na frequência dada (CSR do scipy, ou ndarray denso sem scipy)."""
+        valores = self._constante + 1j * (2 * np.pi * frequencia) * self._coef_jw
+        dados = np.bincount(self._destino, valores.real, self._nnz) + 1j * np.bincount(self._destino, valores.imag, self._nnz)
+        if sp is None:
+            densa = np.zeros((self.n, self.n), dtype=complex)
+            linhas = np.repeat(np.arange(self.n), np.diff(self._indptr))
+            densa[linhas, self._indices] = dados
+            return densa
+        return sp.csr_matrix((dados, self._indices, self._indptr), shape=(self.n, self.n))
+
+    def _resolver_uma(self, frequencia, rhs):
+        try:
+            return self._fatorar_e_resolver(self.matriz(frequencia), rhs)
+        except (RuntimeError, np.linalg.LinAlgError):  # splu: "Factor is exactly singular"
+            flutuantes = self._nos_flutuantes(frequencia)
+            if not flutuantes.any():
+                raise  # singular por outro motivo (ex.: curto sobre a fonte): não há o que remover
+            return self._resolver_com_nos_flutuantes(frequencia, rhs, flutuantes)
+
+    def _nos_flutuantes(self, frequencia):
+        """Máscara dos nós sem caminho de condução até a terra na frequência dada (union-find nos ramos
+        que conduzem: resistores, capacitores se f ≠ 0 e todos os ramos com variável de corrente)."""
+        terra = self.n_nos
+        pai = list(range(self.n_nos + 1))
+        def raiz(no):
+            while pai[no] != no:
+                pai[no] = pai[pai[no]]
+                no = pai[no]
+            return no
+        for r, (_, a, b, _) in enumerate(self.netlist):
+            conduz = self.ramos_corrente[r] >= 0 or self.admitancia[r] != 0 or (frequencia != 0 and self.capacitancia[r] != 0)
+            if conduz:
+                pai[raiz(self.indice_no.get(a, terra))] = raiz(self.indice_no.get(b, terra))
+        raiz_terra = raiz(terra)
+        return np.array([raiz(no) != raiz_terra for no in range(self.n_nos)], dtype=bool)
+
+    def _resolver_com_nos_flutuantes(self, frequencia, rhs, flutuantes):
+        """Resolve o sistema sem os nós flutuantes e sem as variáveis de corrente dos ramos entre eles.
+
+        Esses nós só se ligam ao resto por ramos de admitância nula nesta frequência, então as
+        equações que sobram não dependem deles e o sistema reduzido é exato."""
+        terra = self.n_nos
+        no = lambda x: self.indice_no.get(x, terra)
+        ramos_isolados = [m for (_, a, b, _), m in zip(self.netlist, self.ramos_corrente)
+                          if m >= 0 and (no(a) < terra and flutuantes[no(a)] or no(b) < terra and flutuantes[no(b)])]
+        manter = np.ones(self.n, dtype=bool)
+        manter[:self.n_nos] = ~flutuantes
+        manter[ramos_isolados] = False
+        A = self.matriz(frequencia)
+        A = A[np.ix_(manter, manter)] if sp is None else A.tocsr()[manter][:, manter]
+        x = np.zeros(self.n, dtype=complex)
+        x[:self.n_nos][flutuantes] = np.nan
+        x[manter] = np.linalg.solve(A, rhs[manter]) if sp is None else spla.splu(A.tocsc()).solve(rhs[manter])
+        return x
+
+    def _fatorar_e_resolver(self, A, rhs):
+        if sp is None:
+            return np.linalg.solve(A, rhs)
+        A = A.tocsc()
+        if self._ordem_colunas is None:
+            lu = spla.splu(A)
+            # perm_c leva a coluna original à posição nova; a ordem das colunas é a inversa dela
+            self._ordem_colunas = np.argsort(lu.perm_c)
+            return lu.solve(rhs)
+        # Reaproveita a ordenação de colunas da primeira fatoração: A[:, p] y = b  =>  x[p] = y
+        y = spla.splu(A[:, self._ordem_colunas], permc_spec='NATURAL').solve(rhs)
+        x = np.empty_like(y)
+        x[self._ordem_colunas] = y
+        return x
+
+    def resolver(self, freqs):
+        """Resolve o circuito em cada frequência.
+
+        Retorna (tensoes_nos, correntes_ramos), de formas (n_freqs, n_nos) e (n_freqs, n_ramos).
+        Os nós seguem `indice_no`; a corrente de um ramo flui de no_a para no_b por dentro do ramo.
+        """
+        freqs = np.atleast_1d(np.asarray(freqs, dtype=float))
+        rhs = np.zeros(self.n, dtype=complex)
+        for _, m, valor in self.fontes:
+            rhs[m] = valor
+        solucoes = np.array([self._resolver_uma(f, rhs) for f in freqs]).reshape(freqs.size, self.n)
+
+        tensoes_nos = solucoes[:, :self.n_nos]
+        V_ramos = self.tensoes_ramos(tensoes_nos)
+        Y_ramos = self.admitancia + 1j * (2 * np.pi * freqs[:, None]) * self.capacitancia
+        # Ramos de admitância nula (capacitor em f = 0) não conduzem, mesmo com a tensão indeterminada (nan)
+        with np.errstate(invalid='ignore'):
+            correntes = np.where(Y_ramos != 0, V_ramos * Y_ramos, 0)
+        com_variavel = self.ramos_corrente >= 0
+        correntes[:, com_variavel] = solucoes[:, self.ramos_corrente[com_variavel]]
+        return tensoes_nos, correntes
+
+    def tensoes_ramos(self, tensoes_nos):
+        com_terra = np.concatenate([tensoes_nos, np.zeros((tensoes_nos.shape[0], 1), dtype=complex)], axis=1)
+        terra = self.n_nos
+        ia = np.array([self.indice_no.get(a, terra) for _, a, _, _ in self.netlist], dtype=np.intp)
+        ib = np.array([self.indice_no.get(b, terra) for _, _, b, _ in self.netlist], dtype=np.intp)
+        return com_terra[:, ia] - com_terra[:, ib]
+
+def analisar_nodal(componentes, freqs, V_fonte=1):
+    """Resolve a lista SÉRIE/PARALELO pelo solver nodal.
+
+    Retorna (Z_total, I_total, tensoes, correntes) no mesmo formato de varrer_frequencias.
+    """
+    freqs = np.atleast_1d(np.asarray(freqs, dtype=float))
+    if not componentes:
+        vazio = np.zeros(freqs.size, dtype=complex)
+        return vazio, vazio.copy(), np.zeros((0, freqs.size), dtype=complex), np.zeros((0, freqs.size), dtype=complex)
+    solver = SolverNodal(netlist_de_componentes(componentes, V_fonte))
+    tensoes_nos, correntes = solver.resolver(freqs)
+    V_ramos = solver.tensoes_ramos(tensoes_nos)
+    # A corrente na fonte sai pelo terminal +, então a corrente entregue ao circuito é a oposta
+    I_total = -correntes[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Z_total = np.where(I_total != 0, V_fonte / np.where(I_total != 0, I_total, 1), complex(np.inf))
+    return Z_total, I_total, V_ramos[:, 1:].T, correntes[:, 1:].T
@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from .analise import FATORES_UNIDADE
+from .compilado import CircuitoCompilado
+
+# --- VARREDURA DE PARÂMETROS E OTIMIZAÇÃO ---
+
+# Elementos (pontos da grade x componentes) avaliados por vez, como no Monte Carlo
+ELEMENTOS_POR_LOTE = 2_000_000
+# Elementos (pontos x componentes) abaixo dos quais a grade é avaliada no processo atual: cerca de
+# 1 s de trabalho serial, o que compensa a partida do pool na primeira chamada
+MIN_ELEMENTOS_PARALELO = 20_000_000
+
+GRANDEZAS = {'FP': 'Fator de Potência', 'Z': '|Z| (Ω)', 'I': '|I| (A)'}
+
+_pool, _processos_pool = None, 0
+_trava_pool = threading.Lock()
+
+def _executor(processos):
+    """Pool de processos compartilhado entre as chamadas (o app pede uma grade a cada falha de cache e
+    cada partida de processos 'spawn' custa ~1 s); só é refeito se o número de processos mudar."""
+    global _pool, _processos_pool
+    with _trava_pool:
+        if _pool is None or _processos_pool != processos:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # 'spawn': o app chama isto de dentro de um servidor com várias threads, onde fork não é seguro
+            _pool, _processos_pool = ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn')), processos
+        return _pool
+
+def _descartar_executor(pool):
+    global _pool
+    with _trava_pool:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def faixa_de_valores(minimo, maximo, pontos, escala='log'):
+    """Valores de uma faixa de parâmetro; 'log' (o padrão, valores de componentes variam em décadas) exige minimo > 0."""
+    if escala == 'log':
+        if minimo <= 0:
+            raise ValueError("faixa logarítmica exige mínimo > 0")
+        return np.geomspace(minimo, maximo, int(pontos))
+    return np.linspace(minimo, maximo, int(pontos))
+
+def _avaliar_pedaco(circuito, frequencia, V_fonte, linhas, valores):
+    """Z_total e I_total para cada coluna de `valores` (n_linhas x k), que substitui as `linhas` do circuito."""
+    Z_total = np.empty(valores.shape[1], dtype=complex)
+    I_total = np.empty_like(Z_total)
+    por_lote = max(1, ELEMENTOS_POR_LOTE // max(len(circuito), 1))
+    for inicio in range(0, valores.shape[1], por_lote):
+        fim = min(inicio + por_lote, valores.shape[1])
+        base = np.repeat(circuito.valores_base[:, None], fim - inicio, axis=1)
+        base[linhas] = valores[:, inicio:fim]
+        Z_total[inicio:fim], I_total[inicio:fim], _, _ = circuito.varrer(frequencia, V_fonte, valores_base=base, por_componente=False)
+    return Z_total, I_total
+
+def _grandezas(V_fonte, Z_total, I_total):
+    S_complexa = V_fonte * I_total.conj()
+    P, Q, S = S_complexa.real, S_complexa.imag, np.abs(S_complexa)
+    FP = np.divide(P, S, out=np.ones_like(P), where=S > 1e-9)
+    return {'Z_total': Z_total, 'I_total': I_total, 'P': P, 'Q': Q, 'S': S, 'FP': FP, 'Z': np.abs(Z_total), 'I': np.abs(I_total)}
+
+def avaliar_grade(componentes, frequencia, V_fonte, indices, eixos, circuito=None, processos=1):
+    """Avalia o circuito em todas as combinações dos valores de `eixos` para os componentes `indices`.
+
+    `indices` são posições na lista de componentes e cada eixo traz valores na unidade do próprio
+    componente (a mesma do formulário). A grade inteira é uma matriz (componentes x pontos) avaliada
+    em lotes vetorizados pelo circuito compilado; com `processos` > 1 e grades grandes (pontos x
+    componentes ≥ MIN_ELEMENTOS_PARALELO), os lotes são divididos entre os processos de um pool
+    mantido entre as chamadas. Retorna um dict de grades com a forma (len(eixo_1), len(eixo_2), ...):
+    Z_total, I_total, P, Q, S, FP, e os módulos Z e I.
+    """
+    if circuito is None:
+        circuito = CircuitoCompilado(componentes)
+    eixos = [np.asarray(eixo, dtype=float).ravel() for eixo in eixos]
+    if len(indices) != len(eixos):
+        raise ValueError("um eixo de valores por componente variado")
+    linhas = np.asarray(indices, dtype=np.intp)
+    fatores = np.array([FATORES_UNIDADE[componentes[i]['tipo']][componentes[i]['unidade']] for i in indices], dtype=float)
+    grade = np.meshgrid(*eixos, indexing='ij')
+    forma = grade[0].shape
+    valores = np.stack([g.ravel() for g in grade]) * fatores[:, None]
+
+    n_pontos = valores.shape[1]
+    processos = processos or os.cpu_count() or 1
+    Z_total = None
+    if processos > 1 and n_pontos * len(circuito) >= MIN_ELEMENTOS_PARALELO:
+        pedacos = np.array_split(np.arange(n_pontos), processos)
+        pool = _executor(processos)
+        try:
+            partes = [tarefa.result() for tarefa in [pool.submit(_avaliar_pedaco, circuito, frequencia, V_fonte, linhas, valores[:, p]) for p in pedacos]]
+            Z_total = np.concatenate([Z for Z, _ in partes])
+            I_total = np.concatenate([I for _, I in partes])
+        except BrokenProcessPool:
+            # Um processo do pool morreu: o pool é descartado (o próximo é criado sob demanda) e a grade sai serial
+            _descartar_executor(pool)
+    if Z_total is None:
+        Z_total, I_total = _avaliar_pedaco(circuito, frequencia, V_fonte, linhas, valores)
+    return {nome: matriz.reshape(forma) for nome, matriz in _grandezas(V_fonte, Z_total, I_total).items()}
+
+def otimizar_parametros(componentes, frequencia, V_fonte, indices, faixas, grandeza='FP', alvo=1.0, pontos=None, refinamentos=8, circuito=None):
+    """Procura valores dos componentes `indices`, dentro de `faixas` [(mín, máx), ...], que levem
+    `grandeza` ('FP', 'Z' ou 'I') o mais perto possível de `alvo`.
+
+    Cada passo avalia uma grade (logarítmica) inteira de uma vez com `avaliar_grade` e a próxima
+    grade cobre só a vizinhança do melhor ponto, até `refinamentos` passos. Retorna um dict com os
+    'valores' encontrados (na unidade de cada componente), o 'resultado' obtido, o 'erro' em
+    relação ao alvo e o número de 'avaliacoes'.
+    """
+    if grandeza not in GRANDEZAS:
+        raise ValueError(f"grandeza desconhecida: {grandeza} (use {', '.join(GRANDEZAS)})")
+    if circuito is None:
+        circuito = CircuitoCompilado(componentes)
+    if pontos is None:
+        pontos = 257 if len(indices) == 1 else 33
+    limites = [(float(a), float(b)) for a, b in faixas]
+    if any(a <= 0 or b <= a for a, b in limites):
+        raise ValueError("cada faixa deve ter 0 < mínimo < máximo")
+    avaliacoes = 0
+    for _ in range(refinamentos):
+        eixos = [faixa_de_valores(a, b, pontos) for a, b in limites]
+        grade = avaliar_grade(componentes, frequencia, V_fonte, indices, eixos, circuito)
+        avaliacoes += grade[grandeza].size
+        erro = np.abs(grade[grandeza] - alvo)
+        melhor = np.unravel_index(np.nanargmin(np.where(np.isfinite(erro), erro, np.nan)), erro.shape)
+        # A próxima grade vai do vizinho anterior ao seguinte do melhor ponto, em cada eixo
+        limites = [(eixo[max(k - 1, 0)], eixo[min(k + 1, eixo.size - 1)]) for eixo, k in zip(eixos, melhor)]
+    return {'valores': [float(eixo[k]) for eixo, k in zip(eixos, melhor)],
+            'resultado': float(grade[grandeza][melhor]), 'erro': float(erro[melhor]), 'avaliacoes': avaliacoes}
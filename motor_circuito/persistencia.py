@@ -0,0 +1,185 @@
+"""Arquivos de circuito: JSON para projetos pequenos e NumPy .npz (colunar) para os grandes.
+
+Os dois formatos guardam a fonte, os componentes, resultados opcionais (ex.: uma varredura já
+calculada) e o hash de todo esse conteúdo. Ao carregar, o hash é conferido, então um arquivo
+alterado por fora (componentes, fonte ou resultados) é recusado. O 'hash' devolvido por
+`carregar_circuito` é a impressão digital só do circuito, a chave de cache do motor e do app.
+"""
+import hashlib
+import io
+import json
+import math
+import zipfile
+
+import numpy as np
+
+from .analise import FATORES_UNIDADE
+from .cache import impressao_digital
+from .compilado import CODIGOS_TIPO
+
+# --- PERSISTÊNCIA DE CIRCUITOS ---
+
+FORMATO = 'circuito-ca'
+# Versão 2: o hash cobre também a fonte e os resultados (na 1 eram só os componentes)
+VERSAO = 2
+# Acima disso `salvar_circuito` usa o formato binário
+LIMITE_JSON = 500
+# Faixas da fonte aceitas pelo app (os limites dos campos da barra lateral)
+FAIXA_FREQUENCIA = (1.0, 100000.0)
+FAIXA_TENSAO = (0.0, 1000.0)
+
+TIPOS = tuple(CODIGOS_TIPO)
+CONEXOES = ('PRIMEIRO', 'SÉRIE', 'PARALELO')
+DISTRIBUICOES = ('uniforme', 'normal')
+UNIDADES = {tipo: tuple(fatores) for tipo, fatores in FATORES_UNIDADE.items()}
+
+def _normalizar(componentes):
+    """Cópia só com os campos do circuito e valores float, para que o hash sobreviva à ida e volta."""
+    normalizados = []
+    for k, comp in enumerate(componentes):
+        try:
+            id_, valor = int(comp.get('id', k)), float(comp.get('valor', 0))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"componente {k}: id ou valor não numérico ({e})") from e
+        novo = {'id': id_, 'tipo': comp['tipo'], 'valor': valor, 'unidade': comp['unidade'], 'conexao': comp['conexao']}
+        for opcional in ('tolerancia', 'distribuicao'):
+            if opcional in comp:
+                novo[opcional] = comp[opcional]
+        normalizados.append(novo)
+    return normalizados
+
+def _validar(componentes):
+    ids = set()
+    for k, comp in enumerate(componentes):
+        if comp['tipo'] not in UNIDADES or comp['unidade'] not in UNIDADES[comp['tipo']]:
+            raise ValueError(f"componente {k}: tipo/unidade inválidos ({comp['tipo']!r}, {comp['unidade']!r})")
+        # Só 'PRIMEIRO' fora da posição 0 é recusado: depois de remover o primeiro componente, a lista
+        # pode começar em série ou em paralelo, o que compilar_blocos aceita
+        if comp['conexao'] not in CONEXOES or (comp['conexao'] == 'PRIMEIRO' and k > 0):
+            raise ValueError(f"componente {k}: conexão inválida ({comp['conexao']!r})")
+        if not (math.isfinite(comp['valor']) and comp['valor'] >= 0):
+            raise ValueError(f"componente {k}: valor inválido ({comp['valor']!r}); deve ser finito e não negativo")
+        # O id é a chave dos botões Editar/Remover e da análise incremental: repetido, os dois se confundem
+        if comp['id'] in ids:
+            raise ValueError(f"componente {k}: id repetido ({comp['id']})")
+        ids.add(comp['id'])
+        if 'tolerancia' in comp:
+            tolerancia = comp['tolerancia']
+            if isinstance(tolerancia, bool) or not isinstance(tolerancia, (int, float)) or not 0 <= tolerancia <= 100:
+                raise ValueError(f"componente {k}: tolerância inválida ({tolerancia!r}); deve ser um número de 0 a 100 (%)")
+        if 'distribuicao' in comp and comp['distribuicao'] not in DISTRIBUICOES:
+            raise ValueError(f"componente {k}: distribuição inválida ({comp['distribuicao']!r}); use {' ou '.join(DISTRIBUICOES)}")
+
+def _resultados_json(resultados):
+    return {nome: {'real': np.real(v).tolist(), 'imag': np.imag(v).tolist()} if np.iscomplexobj(v) else np.asarray(v).tolist()
+            for nome, v in resultados.items()}
+
+def _resultados_de_json(resultados):
+    return {nome: np.array(v['real']) + 1j * np.array(v['imag']) if isinstance(v, dict) else np.array(v)
+            for nome, v in resultados.items()}
+
+def _hash_conteudo(componentes, frequencia, tensao, resultados):
+    """Hash do arquivo inteiro: circuito, fonte e cada resultado (nome, tipo, forma e bytes)."""
+    h = hashlib.blake2b(impressao_digital(componentes, float(frequencia), float(tensao)).encode(), digest_size=16)
+    for nome in sorted(resultados):
+        valores = np.ascontiguousarray(resultados[nome])
+        h.update(f"#{nome}|{valores.dtype.str}|{valores.shape}".encode())
+        h.update(valores.tobytes())
+    return h.hexdigest()
+
+def _validar_resultados(resultados):
+    """A varredura da resposta em frequência, se presente, precisa ser um par de vetores coerente."""
+    if ('resposta_freqs' in resultados) != ('resposta_Z' in resultados):
+        raise ValueError("resultados incompletos: 'resposta_freqs' e 'resposta_Z' vêm juntos")
+    if 'resposta_freqs' in resultados:
+        freqs, Z = resultados['resposta_freqs'], resultados['resposta_Z']
+        if freqs.ndim != 1 or Z.shape != freqs.shape or freqs.dtype.kind != 'f' or Z.dtype.kind not in 'fc':
+            raise ValueError("resultados inválidos: 'resposta_freqs' e 'resposta_Z' devem ser vetores do mesmo tamanho")
+        if not (np.isfinite(freqs).all() and (freqs > 0).all() and (np.diff(freqs) > 0).all()):
+            raise ValueError("resultados inválidos: 'resposta_freqs' deve ser crescente, finita e positiva")
+
+def _colunas(componentes):
+    n = len(componentes)
+    return {
+        'id': np.fromiter((c['id'] for c in componentes), dtype=np.int64, count=n),
+        'tipo': np.fromiter((TIPOS.index(c['tipo']) for c in componentes), dtype=np.int8, count=n),
+        'valor': np.fromiter((c['valor'] for c in componentes), dtype=float, count=n),
+        'unidade': np.fromiter((UNIDADES[c['tipo']].index(c['unidade']) for c in componentes), dtype=np.int8, count=n),
+        'conexao': np.fromiter((CONEXOES.index(c['conexao']) for c in componentes), dtype=np.int8, count=n),
+        # Campos opcionais: nan / -1 quando o componente não os tem
+        'tolerancia': np.fromiter((c.get('tolerancia', np.nan) for c in componentes), dtype=float, count=n),
+        'distribuicao': np.fromiter((DISTRIBUICOES.index(c['distribuicao']) if 'distribuicao' in c else -1 for c in componentes), dtype=np.int8, count=n),
+    }
+
+def _componentes_de_colunas(colunas):
+    tipos = [TIPOS[t] for t in colunas['tipo'].tolist()]
+    componentes = [{'id': i, 'tipo': tipo, 'valor': v, 'unidade': UNIDADES[tipo][u], 'conexao': CONEXOES[c]}
+                   for i, tipo, v, u, c in zip(colunas['id'].tolist(), tipos, colunas['valor'].tolist(), colunas['unidade'].tolist(), colunas['conexao'].tolist())]
+    for k in np.flatnonzero(~np.isnan(colunas['tolerancia'])).tolist():
+        componentes[k]['tolerancia'] = float(colunas['tolerancia'][k])
+    for k in np.flatnonzero(colunas['distribuicao'] >= 0).tolist():
+        componentes[k]['distribuicao'] = DISTRIBUICOES[colunas['distribuicao'][k]]
+    return componentes
+
+def salvar_circuito(componentes, frequencia, tensao, resultados=None, formato=None):
+    """Serializa o circuito em bytes, em 'json' ou 'npz' (padrão: json até LIMITE_JSON componentes).
+
+    `resultados` é um dict opcional {nome: vetor NumPy} guardado junto, ex. uma varredura já feita.
+    """
+    componentes = _normalizar(componentes)
+    _validar(componentes)
+    formato = formato or ('json' if len(componentes) <= LIMITE_JSON else 'npz')
+    resultados = {nome: np.asarray(v) for nome, v in (resultados or {}).items()}
+    _validar_resultados(resultados)
+    meta = {'formato': FORMATO, 'versao': VERSAO, 'hash': _hash_conteudo(componentes, frequencia, tensao, resultados), 'frequencia': float(frequencia), 'tensao': float(tensao)}
+    if formato == 'json':
+        return json.dumps(dict(meta, componentes=componentes, resultados=_resultados_json(resultados)), ensure_ascii=False).encode('utf-8')
+    if formato != 'npz':
+        raise ValueError(f"formato desconhecido: {formato}")
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, meta=np.array(json.dumps(meta)), **_colunas(componentes),
+                        **{f'resultado_{nome}': v for nome, v in resultados.items()})
+    return buffer.getvalue()
+
+def carregar_circuito(dados):
+    """Lê bytes gravados por `salvar_circuito` (o formato é detectado pelo conteúdo).
+
+    Retorna {'componentes', 'frequencia', 'tensao', 'hash', 'resultados'}. Levanta ValueError se o
+    arquivo não é um circuito, é de uma versão mais nova, traz a fonte fora de FAIXA_FREQUENCIA /
+    FAIXA_TENSAO ou o hash não confere com o conteúdo.
+    """
+    try:
+        binario = zipfile.is_zipfile(io.BytesIO(dados))  # .npz é um arquivo zip
+        if binario:
+            with np.load(io.BytesIO(dados), allow_pickle=False) as arquivo:
+                colunas = {nome: arquivo[nome] for nome in arquivo.files}
+            meta = json.loads(colunas['meta'].item())
+        else:
+            meta = json.loads(dados)
+        if not isinstance(meta, dict) or meta.get('formato') != FORMATO:
+            raise ValueError("não é um arquivo de circuito")
+        if not isinstance(meta.get('versao'), int) or meta['versao'] > VERSAO:
+            raise ValueError(f"arquivo da versão {meta['versao']}; esta leitura vai até a {VERSAO}")
+        if binario:
+            componentes = _componentes_de_colunas(colunas)
+            resultados = {nome[len('resultado_'):]: valores for nome, valores in colunas.items() if nome.startswith('resultado_')}
+        else:
+            componentes = _normalizar(meta['componentes'])
+            resultados = _resultados_de_json(meta.get('resultados', {}))
+        _validar(componentes)
+        hash_gravado, frequencia, tensao = meta['hash'], float(meta['frequencia']), float(meta['tensao'])
+    except (KeyError, IndexError, TypeError, AttributeError, UnicodeDecodeError, json.JSONDecodeError, zipfile.BadZipFile, OSError) as e:
+        raise ValueError(f"arquivo de circuito inválido: {type(e).__name__}: {e}") from e
+    if not FAIXA_FREQUENCIA[0] <= frequencia <= FAIXA_FREQUENCIA[1]:
+        raise ValueError(f"frequência fora da faixa aceita ({FAIXA_FREQUENCIA[0]:g} a {FAIXA_FREQUENCIA[1]:g} Hz): {frequencia:g}")
+    if not FAIXA_TENSAO[0] <= tensao <= FAIXA_TENSAO[1]:
+        raise ValueError(f"tensão fora da faixa aceita ({FAIXA_TENSAO[0]:g} a {FAIXA_TENSAO[1]:g} V): {tensao:g}")
+    if meta['versao'] < 2:
+        # Na versão 1 o hash cobria só os componentes: os resultados não são verificáveis e ficam de fora
+        resultados, conferido = {}, impressao_digital(componentes)
+    else:
+        conferido = _hash_conteudo(componentes, frequencia, tensao, resultados)
+    if conferido != hash_gravado:
+        raise ValueError("o conteúdo do arquivo não confere com o hash gravado")
+    _validar_resultados(resultados)
+    return {'componentes': componentes, 'frequencia': frequencia, 'tensao': tensao, 'hash': impressao_digital(componentes), 'resultados': resultados}
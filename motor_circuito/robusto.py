@@ -0,0 +1,163 @@
+import numpy as np
+
+from .compilado import TIPO_C, TIPO_L, TIPO_R, CircuitoCompilado
+
+# --- ANÁLISE ROBUSTA (CURTOS, ABERTOS E CANCELAMENTO RESSONANTE) ---
+
+EPS = np.finfo(float).eps
+# Uma soma cujo módulo fica abaixo disso x a soma dos módulos das parcelas é tratada como cancelamento
+# exato: o resultado não tem nenhum dígito significativo, nem com a soma compensada
+LIMIAR_CANCELAMENTO = 64 * EPS
+# Blocos até esse tamanho são somados uma posição por vez, todos juntos; os maiores, um a um
+TAMANHO_SOMA_POR_POSICAO = 64
+# Elementos por fatia nos blocos grandes, para que os temporários da soma caibam no cache
+ELEMENTOS_POR_FATIA = 131_072
+
+def _two_sum(a, b):
+    """Soma sem erro (Knuth): a + b = s + e exatamente, com s = fl(a + b)."""
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+def somas_compensadas(valores, inicios, fins):
+    """Soma das linhas valores[inicio:fim] de cada bloco, com compensação do erro de arredondamento.
+
+    Cada parcela passa por uma soma sem erro (TwoSum) e os erros são acumulados à parte, como na
+    soma de Kahan-Babuska (algoritmo Sum2 de Ogita, Rump e Oishi): o resultado é tão preciso quanto
+    uma soma feita com o dobro de dígitos. Blocos pequenos são percorridos posição a posição, todos
+    ao mesmo tempo; nos grandes as somas parciais saem de um único np.add.accumulate, e os erros de
+    cada passo são recuperados de uma vez.
+    """
+    complexo = np.iscomplexobj(valores)
+    x = np.ascontiguousarray(valores, dtype=complex if complexo else float)
+    if complexo:
+        x = x.view(float)  # parte real e imaginária são somadas independentemente
+    tamanhos = fins - inicios
+    somas = np.zeros((inicios.size,) + x.shape[1:])
+    erros = np.zeros_like(somas)
+    pequenos = np.flatnonzero(tamanhos <= TAMANHO_SOMA_POR_POSICAO)
+    for k in range(int(tamanhos[pequenos].max(initial=0))):
+        ativos = pequenos[tamanhos[pequenos] > k]
+        somas[ativos], erro = _two_sum(somas[ativos], x[inicios[ativos] + k])
+        erros[ativos] += erro
+    linhas_por_fatia = max(1, ELEMENTOS_POR_FATIA // max(int(np.prod(x.shape[1:])), 1))
+    for b in np.flatnonzero(tamanhos > TAMANHO_SOMA_POR_POSICAO).tolist():
+        for inicio in range(inicios[b], fins[b], linhas_por_fatia):
+            # A soma até a fatia anterior entra como primeira parcela, então a cadeia de TwoSum é a mesma
+            parcelas = np.concatenate([somas[b][None], x[inicio:min(inicio + linhas_por_fatia, fins[b])]])
+            parciais = np.add.accumulate(parcelas, axis=0)
+            somas[b] = parciais[-1]
+            erros[b] += _two_sum(parciais[:-1], parcelas[1:])[1].sum(axis=0)
+    total = somas + erros
+    return total.view(complex) if complexo else total
+
+def analisar_robusto(componentes, freqs, V_fonte=1, valores_base=None):
+    """Análise em lote como `CircuitoCompilado.varrer`, mas com as singularidades tratadas explicitamente.
+
+    Diferenças em relação à análise padrão (que ignora ramos em curto nos grupos paralelos e zera
+    a corrente quando Z_total = 0):
+      - um ramo em curto (valor nulo ou indutor em f = 0) curto-circuita o grupo paralelo inteiro;
+        a corrente do grupo passa só pelos ramos em curto, dividida igualmente entre eles;
+      - um grupo cuja soma de admitâncias se cancela (antirressonância ideal ou todos os ramos
+        abertos) é um circuito aberto: I_total = 0 e a tensão da fonte fica sobre os blocos abertos,
+        com as correntes de circulação V·Y nos seus ramos;
+      - Z_total nulo (curto na fonte, ou ressonância série com cancelamento exato) dá I_total
+        infinita, e as tensões indeterminadas (nos blocos de Z não nulo) ficam nan;
+      - as somas de admitâncias e de impedâncias são compensadas (ver `somas_compensadas`).
+
+    Retorna um dict com Z_total, I_total, tensoes e correntes (mesmas formas de `varrer`) e:
+      condicao         número de condição estimado de Z_total: erro relativo da soma ingênua ≈ condicao·eps
+      condicao_blocos  Σ|Y| / |ΣY| de cada bloco paralelo (1 nos blocos série), (n_blocos x colunas)
+      curto, aberto    por coluna, se o circuito visto pela fonte é um curto ou está aberto
+      blocos_curto, blocos_abertos  os mesmos indicadores por bloco
+    """
+    circuito = componentes if isinstance(componentes, CircuitoCompilado) else CircuitoCompilado(componentes)
+    freqs = np.atleast_1d(np.asarray(freqs, dtype=float))
+    if not len(circuito):
+        vazio, sem_blocos = np.zeros(freqs.size, dtype=complex), np.zeros((0, freqs.size), dtype=bool)
+        return {'Z_total': vazio, 'I_total': vazio.copy(), 'tensoes': np.zeros((0, freqs.size), dtype=complex), 'correntes': np.zeros((0, freqs.size), dtype=complex),
+                'condicao': np.ones(freqs.size), 'condicao_blocos': np.ones((0, freqs.size)), 'curto': np.zeros(freqs.size, dtype=bool), 'aberto': np.zeros(freqs.size, dtype=bool),
+                'blocos_curto': sem_blocos, 'blocos_abertos': sem_blocos.copy()}
+    paralelo = circuito.bloco_paralelo
+    paralelo_de = paralelo[circuito.bloco_de]
+    linhas_paralelo = np.flatnonzero(paralelo_de)
+    valores = circuito.valores_base[:, None] if valores_base is None else valores_base
+    Z_serie = circuito.impedancias(freqs, valores_base, circuito.inicio_blocos[~paralelo])
+    colunas = np.broadcast_shapes(valores.shape[1:], (freqs.size,))[0]
+    V_fonte = np.broadcast_to(np.asarray(V_fonte, dtype=complex), (colunas,))
+
+    Z_blocos = np.empty((circuito.n_blocos, colunas), dtype=complex)
+    condicao_blocos = np.ones((circuito.n_blocos, colunas))
+    blocos_curto = np.zeros((circuito.n_blocos, colunas), dtype=bool)
+    blocos_abertos = np.zeros_like(blocos_curto)
+    Z_blocos[~paralelo] = Z_serie
+    blocos_curto[~paralelo] = Z_serie == 0
+    blocos_abertos[~paralelo] = np.isinf(Z_serie)
+    if linhas_paralelo.size:
+        Y = circuito.admitancias(freqs, valores_base, linhas_paralelo)
+        ini = np.searchsorted(linhas_paralelo, circuito.inicio_blocos[paralelo])
+        fim = np.append(ini[1:], linhas_paralelo.size)
+        Y_soma = somas_compensadas(Y, ini, fim)
+        # Σ|Y| sai direto dos valores, sem passar pela matriz Y: cada admitância é real ou imaginária
+        # pura, então Σ|Y| = Σ 1/R + ω·Σ C + Σ 1/L / ω (valores nulos, que são curtos, ficam de fora)
+        v, tipos_p = valores[linhas_paralelo], circuito.tipos[linhas_paralelo][:, None]
+        inversos = np.divide(1, v, out=np.zeros_like(v), where=v != 0)
+        omega = 2 * np.pi * freqs
+        with np.errstate(divide='ignore'):
+            Y_abs = (np.add.reduceat(np.where(tipos_p == TIPO_R, inversos, 0), ini, axis=0)
+                     + omega * np.add.reduceat(np.where(tipos_p == TIPO_C, v, 0), ini, axis=0)
+                     + np.where(omega > 0, np.add.reduceat(np.where(tipos_p == TIPO_L, inversos, 0), ini, axis=0) / np.where(omega > 0, omega, 1), 0))
+        # Curto num ramo paralelo: valor nulo ou indutor em f = 0 (onde a admitância compilada é 0)
+        tem_curto = np.broadcast_to(np.logical_or.reduceat(v == 0, ini, axis=0)
+                                    | (np.logical_or.reduceat(tipos_p == TIPO_L, ini, axis=0) & (freqs == 0)), Y_soma.shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            condicao_blocos[paralelo] = np.where(Y_soma != 0, Y_abs / np.abs(Y_soma), np.inf)
+            cancelado = ~tem_curto & (np.abs(Y_soma) <= LIMIAR_CANCELAMENTO * Y_abs)
+            Z_blocos[paralelo] = np.where(tem_curto, 0, np.where(cancelado, complex(np.inf), 1 / np.where(cancelado | tem_curto, 1, Y_soma)))
+        blocos_curto[paralelo] = tem_curto
+        blocos_abertos[paralelo] = cancelado
+
+    aberto = blocos_abertos.any(axis=0)
+    Z_finitos = np.where(blocos_abertos, 0, Z_blocos)
+    Z_total = somas_compensadas(Z_finitos, np.array([0]), np.array([circuito.n_blocos]))[0]
+    Z_abs = np.abs(Z_finitos)
+    # Propagação de primeira ordem: o erro relativo de cada bloco pesa |Z_b| / |Z_total| na soma série
+    with np.errstate(divide='ignore', invalid='ignore'):
+        condicao = np.where(Z_total != 0, (Z_abs * condicao_blocos).sum(axis=0) / np.abs(Z_total), np.inf)
+    curto = ~aberto & (np.abs(Z_total) <= LIMIAR_CANCELAMENTO * Z_abs.sum(axis=0))
+    Z_total = np.where(aberto, complex(np.inf), np.where(curto, 0, Z_total))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        I_total = np.where(aberto, 0, np.where(curto, complex(np.inf), V_fonte / np.where(curto | aberto, 1, Z_total)))
+
+    # Caso regular, como em `varrer`: V = I·Z_b, e I_total nos blocos série ou V·Y nos ramos paralelos
+    # (nas colunas singulares isso dá inf·0 = nan, refeito logo abaixo)
+    with np.errstate(invalid='ignore'):
+        tensoes = I_total * Z_blocos[circuito.bloco_de]
+        correntes = np.empty_like(tensoes)
+        correntes[~paralelo_de] = I_total
+        if linhas_paralelo.size:
+            correntes[linhas_paralelo] = tensoes[linhas_paralelo] * Y
+
+    # Só as colunas com alguma singularidade são refeitas com as regras especiais
+    especiais = np.flatnonzero(aberto | curto | blocos_curto[paralelo].any(axis=0))
+    if especiais.size:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            abertos, curtos = blocos_abertos[:, especiais], blocos_curto[:, especiais]
+            V, I = V_fonte[especiais], I_total[especiais]
+            # Aberto: a fonte fica dividida entre os blocos abertos; curto na fonte: tensão nula nos
+            # blocos em curto e indeterminada nos demais
+            V_blocos = np.where(aberto[especiais], np.where(abertos, V / np.maximum(abertos.sum(axis=0), 1), 0), I * Z_blocos[:, especiais])
+            V_blocos = np.where(curto[especiais], np.where(curtos, 0, np.nan), V_blocos)
+            tensoes[:, especiais] = V_blocos[circuito.bloco_de]
+            correntes[np.ix_(np.flatnonzero(~paralelo_de), especiais)] = I
+            if linhas_paralelo.size:
+                # Num grupo em curto a corrente do grupo passa só pelos ramos em curto, dividida igualmente
+                curto_e = np.broadcast_to((v == 0) | ((tipos_p == TIPO_L) & (freqs == 0)), Y.shape)[:, especiais]
+                n_curtos = np.add.reduceat(curto_e.astype(np.intp), ini, axis=0)
+                bloco_ramo = np.repeat(np.arange(ini.size), fim - ini)
+                grupo_curto = tem_curto[:, especiais][bloco_ramo]
+                por_ramo = np.where(curto_e, I / np.maximum(n_curtos[bloco_ramo], 1), 0)
+                correntes[np.ix_(linhas_paralelo, especiais)] = np.where(grupo_curto, por_ramo, tensoes[np.ix_(linhas_paralelo, especiais)] * Y[:, especiais])
+    return {'Z_total': Z_total, 'I_total': I_total, 'tensoes': tensoes, 'correntes': correntes,
+            'condicao': condicao, 'condicao_blocos': condicao_blocos, 'curto': curto, 'aberto': aberto,
+            'blocos_curto': blocos_curto, 'blocos_abertos': blocos_abertos}
@@ -0,0 +1,242 @@
+"""Serviço HTTP/JSON local para análise de circuitos, sem dependências além do motor.
+
+Uso:
+    python -m motor_circuito.servico --porta 8000 --processos 4
+
+Rotas:
+    POST /analisar   um circuito no formato de motor_circuito.lote (com "varredura" opcional)
+    POST /lote       {"circuitos": [...]} -> {"resultados": [...]}, na mesma ordem
+    GET  /saude      {"status": "ok"}
+    GET  /estatisticas   contadores do cache de respostas
+
+As respostas são JSON estrito: valores não finitos saem como null.
+
+O servidor é assíncrono (asyncio) e só faz E/S no laço de eventos; as análises rodam num pool de
+processos. Respostas ficam num cache LRU indexado pela impressão digital do circuito, da fonte e
+da varredura, limitado também pelo tamanho aproximado das respostas, e pedidos idênticos que chegam
+ao mesmo tempo esperam uma única análise. Se um processo do pool morrer, o pool é refeito e o pedido
+repetido uma vez.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .cache import CacheLRU, impressao_digital
+from .lote import _analisar_pedaco, analisar_registro, json_estrito
+
+# --- SERVIÇO HTTP ---
+
+MAX_CORPO = 16 * 1024 * 1024
+TEMPO_OCIOSO = 30.0
+CIRCUITOS_POR_TAREFA = 64
+# Teto do cache de respostas; uma varredura de 100 mil pontos ocupa ~27 MB como objetos Python
+MAX_BYTES_CACHE = 256 * 1024 ** 2
+
+MENSAGENS_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large', 422: 'Unprocessable Entity', 500: 'Internal Server Error'}
+
+class ErroHTTP(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+def chave_registro(registro):
+    """Chave de cache de um pedido: tudo o que muda o resultado, menos o id do pedido."""
+    componentes = registro.get('componentes')
+    if not isinstance(componentes, list) or not all(isinstance(c, dict) for c in componentes):
+        return None
+    try:
+        return impressao_digital(componentes, registro.get('frequencia', 60.0), registro.get('tensao', 120.0),
+                                 json.dumps(registro.get('varredura'), sort_keys=True))
+    except KeyError:
+        return None
+
+class ServicoAnalise:
+    """Despacha análises para um pool de processos, com cache de respostas e agrupamento de pedidos iguais.
+
+    Com `processos=0` as análises rodam na thread padrão do laço (útil para testes e máquinas pequenas).
+    """
+
+    def __init__(self, processos=None, max_itens_cache=4096, max_bytes_cache=MAX_BYTES_CACHE):
+        self.processos = (os.cpu_count() or 1) if processos is None else processos
+        self.pool = self._novo_pool()
+        self.cache = CacheLRU(max_itens=max_itens_cache, max_bytes=max_bytes_cache)
+        self._em_andamento = {}
+
+    def _novo_pool(self):
+        # 'spawn': processos criados por fork herdariam o socket do servidor e o manteriam aberto
+        return ProcessPoolExecutor(max_workers=self.processos, mp_context=multiprocessing.get_context('spawn')) if self.processos else None
+
+    def fechar(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _executar(self, funcao, *args):
+        laco = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            return await laco.run_in_executor(pool, funcao, *args)
+        except BrokenProcessPool:
+            # Um processo morreu (ex.: falta de memória) e o pool não aceita mais tarefas: o primeiro
+            # pedido a perceber troca o pool, e cada pedido afetado é repetido uma vez no novo
+            if self.pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._novo_pool()
+            return await laco.run_in_executor(self.pool, funcao, *args)
+
+    async def analisar(self, registro):
+        chave = chave_registro(registro)
+        if chave is None:
+            return await self._executar(analisar_registro, registro)
+        acerto, resultado = self.cache.buscar(chave)
+        if not acerto:
+            if chave not in self._em_andamento:
+                self._em_andamento[chave] = asyncio.ensure_future(self._executar(analisar_registro, dict(registro, id=None)))
+            tarefa = self._em_andamento[chave]
+            try:
+                resultado = await asyncio.shield(tarefa)
+            finally:
+                self._em_andamento.pop(chave, None)
+            if 'erro' not in resultado:
+                self.cache.guardar(chave, resultado)
+        return dict(resultado, id=registro.get('id'))
+
+    async def analisar_lote(self, registros):
+        """Resultados na ordem de `registros`; os que não estão no cache vão ao pool em pedaços."""
+        resultados = [None] * len(registros)
+        pendentes = []
+        for k, registro in enumerate(registros):
+            chave = chave_registro(registro) if isinstance(registro, dict) else None
+            acerto, resultado = self.cache.buscar(chave) if chave else (False, None)
+            if acerto:
+                resultados[k] = dict(resultado, id=registro.get('id'))
+            elif isinstance(registro, dict):
+                pendentes.append((k, chave, registro))
+            else:
+                resultados[k] = {'id': None, 'erro': "TypeError: cada circuito deve ser um objeto"}
+        pedacos = [pendentes[i:i + CIRCUITOS_POR_TAREFA] for i in range(0, len(pendentes), CIRCUITOS_POR_TAREFA)]
+        respostas = await asyncio.gather(*(self._executar(_analisar_pedaco, [r for _, _, r in pedaco]) for pedaco in pedacos))
+        for pedaco, resposta in zip(pedacos, respostas):
+            for (k, chave, _), resultado in zip(pedaco, resposta):
+                resultados[k] = resultado
+                if chave and 'erro' not in resultado:
+                    self.cache.guardar(chave, dict(resultado, id=None))
+        return resultados
+
+    async def responder(self, metodo, caminho, corpo):
+        """(status, objeto JSON) para um pedido já lido."""
+        if caminho == '/saude':
+            return 200, {'status': 'ok', 'processos': self.processos}
+        if caminho == '/estatisticas':
+            return 200, {'cache': self.cache.estatisticas(), 'em_andamento': len(self._em_andamento)}
+        if caminho not in ('/analisar', '/lote'):
+            raise ErroHTTP(404, f"rota desconhecida: {caminho}")
+        if metodo != 'POST':
+            raise ErroHTTP(405, "use POST")
+        try:
+            pedido = json.loads(corpo or b'null')
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ErroHTTP(400, f"JSON inválido: {e}")
+        if caminho == '/analisar':
+            if not isinstance(pedido, dict):
+                raise ErroHTTP(400, "o corpo deve ser um objeto com 'componentes'")
+            resultado = await self.analisar(pedido)
+            return (422 if 'erro' in resultado else 200), resultado
+        if not isinstance(pedido, dict) or not isinstance(pedido.get('circuitos'), list):
+            raise ErroHTTP(400, "o corpo deve ser {\"circuitos\": [...]}")
+        return 200, {'resultados': await self.analisar_lote(pedido['circuitos'])}
+
+# --- PROTOCOLO HTTP/1.1 (mínimo: Content-Length, keep-alive) ---
+
+async def _ler_pedido(leitor):
+    linha = await asyncio.wait_for(leitor.readline(), TEMPO_OCIOSO)
+    if not linha:
+        return None
+    try:
+        metodo, alvo, versao = linha.decode('latin-1').split()
+    except ValueError:
+        raise ErroHTTP(400, "linha de pedido inválida")
+    cabecalhos = {}
+    while True:
+        linha = await asyncio.wait_for(leitor.readline(), TEMPO_OCIOSO)
+        if linha in (b'\r\n', b'\n', b''):
+            break
+        nome, _, valor = linha.decode('latin-1').partition(':')
+        cabecalhos[nome.strip().lower()] = valor.strip()
+    try:
+        tamanho = int(cabecalhos.get('content-length', 0) or 0)
+    except ValueError:
+        raise ErroHTTP(400, "Content-Length inválido")
+    if tamanho > MAX_CORPO:
+        raise ErroHTTP(413, f"corpo maior que {MAX_CORPO} bytes")
+    corpo = await asyncio.wait_for(leitor.readexactly(tamanho), TEMPO_OCIOSO) if tamanho else b''
+    manter = cabecalhos.get('connection', '').lower() != 'close' and versao != 'HTTP/1.0'
+    return metodo.upper(), alvo.split('?', 1)[0], corpo, manter
+
+def _resposta(status, objeto, manter):
+    # inf/nan (ex.: Z de um bloco aberto) viram null, como na saída JSON Lines do lote
+    corpo = json.dumps(json_estrito(objeto), ensure_ascii=False, allow_nan=False).encode('utf-8')
+    cabecalho = (f"HTTP/1.1 {status} {MENSAGENS_STATUS.get(status, '')}\r\n"
+                 f"Content-Type: application/json; charset=utf-8\r\nContent-Length: {len(corpo)}\r\n"
+                 f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n")
+    return cabecalho.encode('latin-1') + corpo
+
+async def atender(servico, leitor, escritor):
+    try:
+        while True:
+            manter = False
+            try:
+                pedido = await _ler_pedido(leitor)
+                if pedido is None:
+                    break
+                metodo, caminho, corpo, manter = pedido
+                status, objeto = await servico.responder(metodo, caminho, corpo)
+            except ErroHTTP as e:
+                status, objeto = e.status, {'erro': str(e)}
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:
+                status, objeto = 500, {'erro': f"{type(e).__name__}: {e}"}
+            escritor.write(_resposta(status, objeto, manter))
+            await escritor.drain()
+            if not manter:
+                break
+    except asyncio.CancelledError:  # servidor sendo encerrado com a conexão ociosa
+        pass
+    finally:
+        escritor.close()
+
+async def servir(host='127.0.0.1', porta=8000, processos=None):
+    servico = ServicoAnalise(processos)
+    servidor = await asyncio.start_server(lambda l, e: atender(servico, l, e), host, porta)
+    print(f"Serviço de análise em http://{host}:{porta} ({servico.processos or 'sem'} processos)", flush=True)
+    tarefa = asyncio.current_task()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, tarefa.cancel)
+    except (NotImplementedError, AttributeError):  # Windows
+        pass
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        servico.fechar()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m motor_circuito.servico', description="Serviço HTTP/JSON local para análise de circuitos CA.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    parser.add_argument('--processos', type=int, default=None, help="processos do pool (padrão: número de CPUs; 0 = sem pool)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.porta, args.processos))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+from .compilado import CircuitoCompilado
+
+# --- VARREDURA VETORIZADA EM FREQUÊNCIA ---
+
+def varrer_frequencias(componentes, freqs, V_fonte=1):
+    """Varredura vetorizada em frequência; aceita a lista de componentes ou um CircuitoCompilado.
+
+    Retorna (Z_total, I_total, tensoes, correntes); os dois primeiros têm forma (n_freqs,)
+    e os dois últimos (n_componentes, n_freqs).
+    """
+    circuito = componentes if isinstance(componentes, CircuitoCompilado) else CircuitoCompilado(componentes)
+    return circuito.varrer(freqs, V_fonte)
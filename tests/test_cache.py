@@ -0,0 +1,19 @@
+import numpy as np
+
+from motor_circuito import CacheLRU
+
+
+def test_cache_limitado_por_bytes_descarta_os_mais_antigos():
+    cache = CacheLRU(max_itens=100, max_bytes=3000)
+    for k in range(5):
+        cache.guardar(k, np.zeros(100))  # 800 bytes cada
+    assert list(cache._itens) == [2, 3, 4] and cache.bytes == 2400
+
+    # Um valor maior que o limite sozinho é devolvido, mas não entra nem expulsa os outros
+    assert cache.obter('grande', lambda: np.zeros(1000)).size == 1000
+    assert 'grande' not in cache and len(cache) == 3
+
+    cache.guardar(4, np.zeros(10))  # substituir uma chave atualiza o total
+    assert cache.bytes == 1680
+    cache.limpar()
+    assert cache.bytes == 0
@@ -0,0 +1,86 @@
+import random
+import time
+
+import numpy as np
+
+from motor_circuito import AnaliseIncremental, CircuitoCompilado, EquivalenteAcumulado
+
+
+def circuito_aleatorio(n, semente=0):
+    gerador = random.Random(semente)
+    tipos = [('Resistor (R)', 'Ω'), ('Indutor (L)', 'mH'), ('Capacitor (C)', 'µF')]
+    componentes = []
+    for k in range(n):
+        tipo, unidade = gerador.choice(tipos)
+        conexao = 'PRIMEIRO' if k == 0 else gerador.choice(['SÉRIE', 'PARALELO'])
+        componentes.append({'id': k, 'tipo': tipo, 'valor': gerador.uniform(1, 100), 'unidade': unidade, 'conexao': conexao})
+    return componentes
+
+
+def test_edicoes_batem_com_o_nucleo_compilado():
+    componentes = circuito_aleatorio(200)
+    analise = AnaliseIncremental(componentes, 60.0)
+    gerador = random.Random(1)
+    for _ in range(300):
+        comp = gerador.choice(componentes[1:])
+        if gerador.random() < 0.2 and len(componentes) > 2:
+            analise.remover(comp['id'])
+            componentes.remove(comp)
+        else:
+            comp['conexao'] = 'PARALELO' if comp['conexao'] == 'SÉRIE' else 'SÉRIE'
+            analise.atualizar(comp['id'])
+    Z_total, I_total, tensoes, correntes = analise.resultado(120)
+    Z_ref, I_ref, tensoes_ref, correntes_ref = CircuitoCompilado(componentes).analisar(60.0, 120)
+    np.testing.assert_allclose(Z_total, Z_ref)
+    np.testing.assert_allclose(tensoes, tensoes_ref)
+    np.testing.assert_allclose(correntes, correntes_ref)
+
+
+def tempo_por_reagrupamento(n, repeticoes=2000):
+    componentes = circuito_aleatorio(n)
+    analise = AnaliseIncremental(componentes, 60.0)
+    comp = componentes[n // 2]  # no meio do circuito: uma busca linear percorreria metade dos blocos
+    melhor = float('inf')
+    for _ in range(5):
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            comp['conexao'] = 'PARALELO' if comp['conexao'] == 'SÉRIE' else 'SÉRIE'
+            analise.atualizar(comp['id'])
+        melhor = min(melhor, (time.perf_counter() - inicio) / repeticoes)
+    return melhor
+
+
+def test_mudar_conexao_nao_escala_com_o_tamanho_do_circuito():
+    # 100x mais componentes: com a busca linear o tempo por edição crescia na mesma proporção
+    pequeno, grande = tempo_por_reagrupamento(1000), tempo_por_reagrupamento(100000)
+    assert grande < 10 * pequeno
+
+
+def test_equivalente_acumulado_monta_r_mais_l_em_paralelo_com_c():
+    # Regra da calculadora: PARALELO é com o equivalente atual, então (R + L) || C
+    componentes = [{'id': 0, 'tipo': 'Resistor (R)', 'valor': 10, 'unidade': 'Ω', 'conexao': 'PRIMEIRO'},
+                   {'id': 1, 'tipo': 'Indutor (L)', 'valor': 1, 'unidade': 'H', 'conexao': 'SÉRIE'},
+                   {'id': 2, 'tipo': 'Capacitor (C)', 'valor': 10, 'unidade': 'µF', 'conexao': 'PARALELO'},
+                   {'id': 3, 'tipo': 'Resistor (R)', 'valor': 5, 'unidade': 'Ω', 'conexao': 'SÉRIE'}]
+    omega = 2 * np.pi * 60
+    z_rl, z_c = 10 + 1j * omega, -1j / (omega * 10e-6)
+    Z_esperado = z_rl * z_c / (z_rl + z_c) + 5
+    analise = EquivalenteAcumulado(componentes, 60.0)
+    Z_total, I_total, tensoes, correntes = analise.resultado(120)
+    np.testing.assert_allclose(Z_total, Z_esperado)
+
+    # R e L levam a mesma corrente, C fica com a tensão do par, e a potência fecha (Tellegen)
+    np.testing.assert_allclose(correntes[0], correntes[1])
+    np.testing.assert_allclose(tensoes[0] + tensoes[1], tensoes[2])
+    np.testing.assert_allclose(correntes[1] + correntes[2], I_total)
+    np.testing.assert_allclose(np.sum(tensoes * correntes.conj()), 120 * np.conj(I_total))
+
+
+def test_equivalente_acumulado_em_ressonancia_paralela_fica_aberto():
+    # Em ω = 1 rad/s, L = 1 H e C = 1 F dão j1 e -j1: as admitâncias se anulam exatamente
+    componentes = [{'id': 0, 'tipo': 'Indutor (L)', 'valor': 1, 'unidade': 'H', 'conexao': 'PRIMEIRO'},
+                   {'id': 1, 'tipo': 'Capacitor (C)', 'valor': 1, 'unidade': 'F', 'conexao': 'PARALELO'}]
+    Z_total, I_total, tensoes, correntes = EquivalenteAcumulado(componentes, 1 / (2 * np.pi)).resultado(120)
+    assert np.isinf(abs(Z_total)) and I_total == 0
+    np.testing.assert_allclose(tensoes, [120, 120])
+    np.testing.assert_allclose(correntes[0], -correntes[1])  # corrente de circulação
@@ -0,0 +1,23 @@
+import json
+import logging
+
+import instrumentacao
+from instrumentacao import Medidor
+
+
+def test_linhas_e_registro_com_uma_etapa_aberta(monkeypatch, tmp_path):
+    # O painel e o log são montados dentro de uma etapa ainda aberta; ela fica de fora até terminar
+    arquivo = tmp_path / 'perfil.jsonl'
+    monkeypatch.setenv('CIRCUITO_PERFIL_LOG', str(arquivo))
+    monkeypatch.setattr(instrumentacao, 'logger', logging.getLogger('circuito.perfil.teste'))
+    medidor = Medidor(ativo=True)
+    with medidor.etapa('externa'):
+        with medidor.etapa('interna'):
+            pass
+        assert [linha['Etapa'] for linha in medidor.linhas()] == ['\u2003interna']
+        medidor.registrar()
+    assert [linha['Etapa'] for linha in medidor.linhas()] == ['externa', '\u2003interna']
+    for handler in instrumentacao.logger.handlers:
+        handler.close()
+    registro = json.loads(arquivo.read_text(encoding='utf-8'))
+    assert [e['nome'] for e in registro['etapas']] == ['interna']
@@ -0,0 +1,24 @@
+import numpy as np
+
+from motor_circuito import CircuitoCompilado, analisar_nodal
+
+
+def componente(id_, tipo, valor, unidade, conexao):
+    return {'id': id_, 'tipo': tipo, 'valor': valor, 'unidade': unidade, 'conexao': conexao}
+
+
+def test_capacitores_em_serie_em_f_zero_sao_circuito_aberto():
+    # O nó entre os dois capacitores flutua em f = 0: antes a fatoração falhava ("exactly singular")
+    componentes = [componente(0, 'Resistor (R)', 10, 'Ω', 'PRIMEIRO'), componente(1, 'Capacitor (C)', 10, 'µF', 'SÉRIE'),
+                   componente(2, 'Capacitor (C)', 10, 'µF', 'SÉRIE'), componente(3, 'Resistor (R)', 5, 'Ω', 'SÉRIE')]
+    Z_total, I_total, tensoes, correntes = analisar_nodal(componentes, [0.0, 60.0], 120)
+    assert np.isinf(Z_total[0]) and I_total[0] == 0
+    assert np.all(correntes[:, 0] == 0)
+    assert np.isnan(tensoes[1, 0]) and np.isnan(tensoes[2, 0])  # tensões nos capacitores indeterminadas
+    assert tensoes[0, 0] == 0 and tensoes[3, 0] == 0
+
+    # Nas outras frequências nada muda: mesmo resultado do núcleo compilado
+    Z_comp, I_comp, tensoes_comp, correntes_comp = CircuitoCompilado(componentes).varrer([60.0], 120)
+    np.testing.assert_allclose(Z_total[1:], Z_comp)
+    np.testing.assert_allclose(tensoes[:, 1:], tensoes_comp)
+    np.testing.assert_allclose(correntes[:, 1:], correntes_comp)
@@ -0,0 +1,29 @@
+import asyncio
+
+from motor_circuito.servico import ServicoAnalise
+
+CIRCUITO = {'frequencia': 60, 'tensao': 120, 'componentes': [{'tipo': 'Resistor (R)', 'valor': 3, 'unidade': 'Ω', 'conexao': 'PRIMEIRO'},
+                                                           {'tipo': 'Indutor (L)', 'valor': 10.61, 'unidade': 'mH', 'conexao': 'SÉRIE'}]}
+
+
+def test_varredura_maior_que_o_limite_do_cache_nao_fica_guardada():
+    servico = ServicoAnalise(processos=0, max_bytes_cache=64 * 1024)
+    pequeno = asyncio.run(servico.analisar(CIRCUITO))
+    grande = asyncio.run(servico.analisar(dict(CIRCUITO, varredura={'freq_min': 1, 'freq_max': 1e4, 'pontos': 10000})))
+    assert 'erro' not in pequeno and len(grande['varredura']['freqs']) == 10000
+    assert len(servico.cache) == 1 and servico.cache.bytes <= 64 * 1024
+
+
+def test_pool_quebrado_e_refeito_e_o_pedido_repetido():
+    servico = ServicoAnalise(processos=1)
+    try:
+        assert 'erro' not in asyncio.run(servico.analisar(CIRCUITO))
+        pool = servico.pool
+        for processo in list(pool._processes.values()):
+            processo.kill()
+            processo.join()
+        resultado = asyncio.run(servico.analisar(dict(CIRCUITO, frequencia=50)))
+        assert 'erro' not in resultado and 'Z_total' in resultado
+        assert servico.pool is not pool
+    finally:
+        servico.fechar()